@@ -396,12 +396,7 @@ async def list_ollama_models():
 async def get_plugins():
     active = []
     for name, plugin in _plugins.plugins.items():
-        health = {"status": "ok"}
-        if hasattr(plugin, "health_check"):
-            try:
-                health = await plugin.health_check()
-            except Exception as e:
-                health = {"status": "error", "message": str(e)}
+        health = await _plugins.check_health(name)
 
         active.append(
             {
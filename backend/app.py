@@ -102,6 +102,8 @@ class AppState:
     embedding_service: Any = None
     rag_pipeline: Any = None
     knowledge_graph: Any = None
+    sub_agent_cache: Any = None
+    plan_template_cache: Any = None
     allowed_origins: list = field(default_factory=list)
     base_dir: str = ""
 
@@ -162,6 +164,7 @@ async def _on_model_settings_changed(key, old_value, new_value, state: AppState)
             cli_path=state.cfg.get("CLAUDE_CODE_CLI_PATH", "/opt/homebrew/bin/claude"),
             model=state.cfg.get("CLAUDE_CODE_MODEL", "sonnet"),
             mcp_config_path=mcp_config_path,
+            pool_size=state.cfg.get_int("SUB_AGENT_CLAUDE_CODE_CONCURRENT", 2),
         )
 
     state.model_router = ModelRouter(ollama, claude, claude_code, state.cfg.complexity_threshold)
@@ -248,6 +251,7 @@ async def lifespan(app: FastAPI):
     state.db = Database(session_factory)
     await state.db.ensure_summary_table()
     await state.db.ensure_work_items_table()
+    await state.db.ensure_message_indexes()
     logger.info("Database connected")
 
     # Work Registry (unified work item tracking)
@@ -283,6 +287,7 @@ async def lifespan(app: FastAPI):
             model=claude_code_model,
             mcp_config_path=mcp_config_path,
             timeout=300,
+            pool_size=state.cfg.get_int("SUB_AGENT_CLAUDE_CODE_CONCURRENT", 2),
         )
         logger.info(f"Claude Code client configured (cli={claude_code_cli}, model={claude_code_model})")
 
@@ -524,6 +529,28 @@ async def lifespan(app: FastAPI):
         state.embedding_service = None
         logger.warning(f"Embedding service failed to initialize: {e}")
 
+    # Sub-agent response cache — replays outputs for repeated sub-agent inputs
+    cache_ttl = state.cfg.get_int("SUB_AGENT_CACHE_TTL", 3600)
+    if cache_ttl > 0:
+        try:
+            from core.sub_agent_cache import PlanTemplateCache, SqliteBackend, SubAgentCache
+
+            # Near-duplicate prompt matching is opt-in: it can confuse
+            # prompts that differ only in a number or a negation
+            semantic = state.cfg.get_bool("SUB_AGENT_SEMANTIC_CACHE", False)
+            state.sub_agent_cache = SubAgentCache(
+                ttl=cache_ttl,
+                backend=SqliteBackend(os.path.join(state.cfg.data_dir, "sub_agent_cache.db")),
+                embed=state.embedding_service.embed if semantic and state.embedding_service else None,
+            )
+            await state.sub_agent_cache.start()
+            state.plan_template_cache = PlanTemplateCache(ttl=cache_ttl)
+            logger.info(f"Sub-agent response cache enabled (TTL {cache_ttl}s)")
+        except Exception as e:
+            state.sub_agent_cache = None
+            state.plan_template_cache = None
+            logger.warning(f"Sub-agent response cache failed to initialize: {e}")
+
     # RAG Pipeline — retrieval-augmented generation
     rag_enabled = state.cfg.get_bool("RAG_ENABLED", True)
     if rag_enabled and state.embedding_service and getattr(state, "cluster_manager", None) and state.cluster_manager.is_active:
@@ -608,10 +635,18 @@ async def lifespan(app: FastAPI):
         state.reminder_manager.stop()
     if getattr(state, "task_queue", None):
         state.task_queue.stop_scheduler()
+    if state.model_router and state.model_router.claude_code:
+        await state.model_router.claude_code.close()
     if state.plugin_manager:
         await state.plugin_manager.shutdown_all()
     if state.telegram_channel:
         await state.telegram_channel.stop()
+    # Write out queued work-item updates before the DB engine goes away
+    from core.work_registry import work_registry
+    try:
+        await asyncio.wait_for(work_registry.flush(), timeout=5.0)
+    except Exception as e:
+        logger.warning(f"Work registry flush on shutdown failed: {e}")
     await dispose_engine()
 
 
@@ -198,6 +198,48 @@ SETTINGS_SCHEMA: list[dict] = [
         "min": 30,
         "max": 600,
     },
+    {
+        "key": "SUB_AGENT_CACHE_TTL",
+        "default": "3600",
+        "encrypted": False,
+        "category": "Sub-Agents",
+        "label": "Sub-Agent Response Cache TTL (seconds)",
+        "type": "number",
+        "description": "Reuse a sub-agent's earlier output for identical inputs within this window (0 = off)",
+        "min": 0,
+        "max": 604800,
+    },
+    {
+        "key": "SUB_AGENT_SEMANTIC_CACHE",
+        "default": "false",
+        "encrypted": False,
+        "category": "Sub-Agents",
+        "label": "Semantic Response Cache",
+        "type": "select",
+        "description": "Also replay outputs for near-identical prompts (embedding match). Prompts differing only in a number or negation can match; never used for verifiers",
+        "options": ["false", "true"],
+    },
+    {
+        "key": "SUB_AGENT_SPECULATIVE_REVIEW",
+        "default": "false",
+        "encrypted": False,
+        "category": "Sub-Agents",
+        "label": "Speculative Review",
+        "type": "select",
+        "description": "In build/review, start the reviewer on the builder's partial output; kept only if the builder adds little more, otherwise re-run (experimental)",
+        "options": ["false", "true"],
+    },
+    {
+        "key": "SUB_AGENT_BATCH_TIMEOUT",
+        "default": "3600",
+        "encrypted": False,
+        "category": "Sub-Agents",
+        "label": "Batch Research Timeout (seconds)",
+        "type": "number",
+        "description": "How long /multi batch research waits for the Message Batches API before running the researchers directly",
+        "min": 300,
+        "max": 86400,
+    },
     # Files
     {
         "key": "DOCS_DIR",
@@ -34,7 +34,7 @@ class AgentAttempt:
         runner: AgentRunner,
         model_name: str,
         messages: list[dict],
-        system: str,
+        system: str | list[dict],
         tools_for_api: list[dict] | None,
         ws_id: str,
     ) -> None:
@@ -8,8 +8,9 @@ Provides semantic search over memories using HNSW vector index:
 
 Memory storage format:
     nexus:mem:{memory_id} → Hash {
-        id, text, embedding (BLOB), type, source_agent, source_conv,
-        content_hash, created_at, access_count, last_accessed
+        id, text, embedding (BLOB), embedding_q8 (int8 BLOB), type,
+        source_agent, source_conv, content_hash, created_at, access_count,
+        last_accessed
     }
 
 Index:
@@ -21,6 +22,7 @@ Gracefully degrades to hash-only storage if RediSearch is unavailable.
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import logging
@@ -31,6 +33,12 @@ from typing import Any, Optional
 
 import numpy as np
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger("nexus.cluster.memory_index")
 
 # Defaults
@@ -39,6 +47,13 @@ SIMILARITY_THRESHOLD = 0.12  # Cosine distance below this = duplicate
 MAX_SEARCH_RESULTS = 20
 MEMORY_PREFIX = "mem"
 INDEX_NAME_SUFFIX = "mem_idx"
+# Fields read per memory during scan search (embedding is fetched only when
+# the int8 copy is missing)
+_SCAN_FIELDS = (
+    "id", "text", "memory_type", "source_agent", "source_conv",
+    "access_count", "embedding_q8",
+)
+NUMBA_MIN_CANDIDATES = 1024  # Below this the NumPy path is as fast as the JIT kernel
 
 
 def _float_vector_to_bytes(vector: list[float]) -> bytes:
@@ -52,6 +67,94 @@ def _bytes_to_float_vector(data: bytes) -> list[float]:
     return list(struct.unpack(f"{n}f", data))
 
 
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _cosine_distances_jit(matrix, query_vec):
+        """Fused dot product + norm per row; zero-norm rows score +inf."""
+        n, d = matrix.shape
+        q_norm = 0.0
+        for j in range(d):
+            q_norm += query_vec[j] * query_vec[j]
+        q_norm = np.sqrt(q_norm)
+
+        out = np.empty(n, dtype=np.float32)
+        for i in prange(n):
+            dot = 0.0
+            norm = 0.0
+            for j in range(d):
+                v = matrix[i, j]
+                dot += v * query_vec[j]
+                norm += v * v
+            if norm > 0.0:
+                out[i] = 1.0 - dot / (np.sqrt(norm) * q_norm)
+            else:
+                out[i] = np.inf
+        return out
+
+
+def _cosine_distances(matrix: np.ndarray, query_vec: np.ndarray) -> np.ndarray:
+    """Cosine distance of every row to the query; zero-norm rows score +inf."""
+    if NUMBA_AVAILABLE and len(matrix) >= NUMBA_MIN_CANDIDATES:
+        return _cosine_distances_jit(matrix, query_vec)
+
+    norms = np.linalg.norm(matrix, axis=1)
+    valid = norms > 0
+    distances = np.full(len(matrix), np.inf, dtype=np.float32)
+    distances[valid] = 1.0 - (matrix[valid] @ query_vec) / (
+        norms[valid] * np.linalg.norm(query_vec)
+    )
+    return distances
+
+
+def _cosine_top_k(
+    vectors: list[np.ndarray], query_vec: np.ndarray, limit: int,
+) -> list[tuple[int, float]]:
+    """Return ``(index, cosine distance)`` for the ``limit`` closest vectors.
+
+    Scores every candidate in one pass (a Numba kernel for large scans when
+    available, otherwise a single matrix-vector product) and selects the
+    top-k with argpartition. Zero-norm vectors are never returned.
+    """
+    distances = _cosine_distances(np.stack(vectors), query_vec)
+
+    k = min(limit, int(np.isfinite(distances).sum()))
+    if k <= 0:
+        return []
+    if k < len(distances):
+        top = np.argpartition(distances, k - 1)[:k]
+    else:
+        top = np.arange(len(distances))
+    top = top[np.argsort(distances[top], kind="stable")]
+    return [(int(i), float(distances[i])) for i in top]
+
+
+def _warm_scoring_kernel() -> None:
+    """Compile (or load from the on-disk cache) the Numba kernel ahead of use."""
+    if NUMBA_AVAILABLE:
+        _cosine_distances_jit(
+            np.ones((2, 4), dtype=np.float32), np.ones(4, dtype=np.float32),
+        )
+
+
+def _quantize_int8(vector: list[float]) -> bytes:
+    """Quantize a vector to symmetric int8: a float32 scale followed by int8 values.
+
+    Stored alongside the float32 embedding (which RediSearch indexes) so the
+    scan-search fallback can read a quarter of the bytes per memory.
+    """
+    vec = np.asarray(vector, dtype=np.float32)
+    peak = float(np.max(np.abs(vec))) if vec.size else 0.0
+    scale = peak / 127.0 if peak > 0 else 1.0
+    quantized = np.round(vec / scale).astype(np.int8)
+    return np.float32(scale).tobytes() + quantized.tobytes()
+
+
+def _dequantize_int8(data: bytes) -> np.ndarray:
+    """Inverse of :func:`_quantize_int8`."""
+    scale = np.frombuffer(data, dtype=np.float32, count=1)[0]
+    return np.frombuffer(data, dtype=np.int8, offset=4).astype(np.float32) * scale
+
+
 def _content_hash(text: str) -> str:
     """Generate a content hash for deduplication."""
     return hashlib.sha256(text.strip().lower().encode()).hexdigest()[:32]
@@ -118,6 +221,13 @@ class MemoryIndex:
 
     async def start(self) -> None:
         """Create the RediSearch index if it doesn't exist."""
+        if NUMBA_AVAILABLE:
+            # Keep JIT compile latency off the first scan search
+            try:
+                await asyncio.to_thread(_warm_scoring_kernel)
+            except Exception as e:
+                logger.debug(f"Numba scoring kernel warm-up failed: {e}")
+
         try:
             await self._create_index()
             self._index_available = True
@@ -251,6 +361,7 @@ class MemoryIndex:
             "id": memory_id,
             "text": text,
             "embedding": _float_vector_to_bytes(embedding),
+            "embedding_q8": _quantize_int8(embedding),
             "memory_type": memory_type,
             "source_agent": self.agent_id,
             "source_conv": source_conv,
@@ -407,57 +518,67 @@ class MemoryIndex:
         if query_norm == 0:
             return []
 
-        results = []
+        def _decode(val):
+            return val.decode("utf-8") if isinstance(val, bytes) else val
+
+        # Collect candidates first, then score them all in one matrix-vector
+        # product instead of one np.dot per key.
+        candidates: list[dict[str, Any]] = []
+        vectors: list[np.ndarray] = []
         pattern = self._mem_pattern()
 
         async for key in self._redis.scan_iter(match=pattern, count=100):
             try:
-                data = await self._redis.hgetall(key)
-                if not data:
+                values = await self._redis.hmget(key, *_SCAN_FIELDS)
+                if not values or not values[0]:
                     continue
+                data = dict(zip(_SCAN_FIELDS, values))
+
+                # Prefer the int8 copy (4x fewer bytes); older memories only
+                # have the float32 embedding
+                emb_q8 = data["embedding_q8"]
+                if emb_q8:
+                    if isinstance(emb_q8, str):
+                        emb_q8 = emb_q8.encode("latin-1")
+                    stored_vec = _dequantize_int8(emb_q8)
+                else:
+                    emb_data = await self._redis.hget(key, "embedding")
+                    if not emb_data:
+                        continue
+                    if isinstance(emb_data, str):
+                        emb_data = emb_data.encode("latin-1")
+                    stored_vec = np.frombuffer(emb_data, dtype=np.float32)
 
-                # Get embedding
-                emb_data = data.get(b"embedding") or data.get("embedding")
-                if not emb_data:
-                    continue
-
-                if isinstance(emb_data, str):
-                    emb_data = emb_data.encode("latin-1")
-
-                stored_vec = np.array(
-                    _bytes_to_float_vector(emb_data), dtype=np.float32
-                )
-                stored_norm = np.linalg.norm(stored_vec)
-                if stored_norm == 0:
+                if stored_vec.shape != query_vec.shape:
                     continue
 
-                # Cosine distance
-                similarity = float(np.dot(query_vec, stored_vec) / (query_norm * stored_norm))
-                distance = 1.0 - similarity
-
-                # Decode fields
-                def _decode(val):
-                    return val.decode("utf-8") if isinstance(val, bytes) else val
-
-                results.append({
-                    "id": _decode(data.get(b"id", data.get("id", ""))),
-                    "text": _decode(data.get(b"text", data.get("text", ""))),
-                    "score": distance,
-                    "memory_type": _decode(data.get(b"memory_type", data.get("memory_type", ""))),
-                    "source_agent": _decode(data.get(b"source_agent", data.get("source_agent", ""))),
-                    "source_conv": _decode(data.get(b"source_conv", data.get("source_conv", ""))),
-                    "access_count": _decode(data.get(b"access_count", data.get("access_count", "0"))),
+                vectors.append(stored_vec)
+                candidates.append({
+                    "id": _decode(data["id"]),
+                    "text": _decode(data["text"] or ""),
+                    "memory_type": _decode(data["memory_type"] or ""),
+                    "source_agent": _decode(data["source_agent"] or ""),
+                    "source_conv": _decode(data["source_conv"] or ""),
+                    "access_count": _decode(data["access_count"] or "0"),
                 })
 
             except Exception as e:
                 logger.warning(f"Scan search error on key {key}: {e}")
                 continue
 
-        # Sort by distance (lowest = most similar) and limit
-        results.sort(key=lambda r: r["score"])
         self._searched += 1
+        if not vectors:
+            return []
 
-        return results[:limit]
+        # Scoring holds the GIL for large scans — run it off the event loop
+        top = await asyncio.to_thread(_cosine_top_k, vectors, query_vec, limit)
+
+        results = []
+        for i, distance in top:
+            result = candidates[i]
+            result["score"] = distance
+            results.append(result)
+        return results
 
     # ── Memory Management ────────────────────────────────────────
 
@@ -475,8 +596,8 @@ class MemoryIndex:
         result = {}
         for k, v in data.items():
             k = _decode(k)
-            if k == "embedding":
-                continue  # Skip binary embedding in response
+            if k in ("embedding", "embedding_q8"):
+                continue  # Skip binary embeddings in response
             result[k] = _decode(v)
 
         # Touch the memory (update access stats)
@@ -27,3 +27,7 @@ class PathAccessDeniedError(NexusError):
 
 class RateLimitExceededError(NexusError):
     """Client has exceeded the rate limit."""
+
+
+class CycleDetectedError(NexusError):
+    """A plan's step dependencies form a cycle, so some steps can never run."""
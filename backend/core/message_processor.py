@@ -5,7 +5,9 @@ from __future__ import annotations
 import asyncio
 import logging
 import re
+import time
 import uuid
+from collections import OrderedDict
 from typing import TYPE_CHECKING, Any
 
 from core.security import validate_path
@@ -19,14 +21,30 @@ logger = logging.getLogger("nexus.processor")
 
 # Regex for legacy skill action extraction
 SKILL_ACTION_PATTERN = re.compile(r"<skill_action>(\w+)\((.*?)\)</skill_action>", re.DOTALL)
+# Splits "a=1, b=2" skill action params on commas that precede a key
+_PARAM_SPLIT = re.compile(r",\s*(?=\w+=)")
 
 # Per-user model overrides (Telegram / API path — no session state like WebSocket)
-# Maps user_id → forced model name (e.g. "ollama", "claude", None for auto)
-_user_model_overrides: dict[str, str | None] = {}
+# Maps user_id → forced model name (e.g. "ollama", "claude", None for auto).
+# Bounded LRU so one entry per user ever seen can't grow without limit.
+_user_model_overrides: OrderedDict[str, str | None] = OrderedDict()
+_MAX_MODEL_OVERRIDES = 10_000
+
+
+def _set_model_override(user_id: str, force: str | None) -> None:
+    """Record a per-user model override, evicting the least recently set."""
+    _user_model_overrides[user_id] = force
+    _user_model_overrides.move_to_end(user_id)
+    if len(_user_model_overrides) > _MAX_MODEL_OVERRIDES:
+        _user_model_overrides.popitem(last=False)
 
 
 async def process_skill_actions(ai_response: str, skills_engine: Any) -> list[dict]:
     """Extract and execute skill action calls from AI response text."""
+    # Most responses contain no action tags — skip the regex scan entirely
+    if "<skill_action>" not in ai_response:
+        return []
+
     matches = SKILL_ACTION_PATTERN.findall(ai_response)
     if not matches:
         return []
@@ -34,7 +52,7 @@ async def process_skill_actions(ai_response: str, skills_engine: Any) -> list[di
     results = []
     for action_name, params_str in matches:
         params: dict[str, str] = {}
-        for part in re.split(r",\s*(?=\w+=)", params_str):
+        for part in _PARAM_SPLIT.split(params_str):
             part = part.strip()
             if "=" in part:
                 k, v = part.split("=", 1)
@@ -65,164 +83,23 @@ async def process_message(
     """Handle a single message — slash commands or AI chat. Returns response text."""
     text = text.strip()
 
-    # ── Slash commands ──
-    if text.startswith("/learn "):
-        topic = text[7:].strip()
-        if topic:
-            task = await task_queue.submit("research", {"topic": topic})
-            return f"Research task queued: **{topic}**\nTask ID: `{task['id']}`"
-        return "Please specify a topic: `/learn <topic>`"
-
-    if text == "/docs":
-        files = scan_directory(cfg.docs_dir)
-        if not files:
-            return f"No documents found in `{cfg.docs_dir}`\n\nPlace files there then use `/ingest <filename>` or `/ingest all`."
-        lines = [f"**Documents in** `{cfg.docs_dir}`\n"]
-        for f in files:
-            lines.append(f"- `{f['relative_path']}` ({f['extension']}, {f['size'] / 1024:.0f}KB)")
-        lines.append("\nUse `/ingest <filename>` to learn from a file, or `/ingest all`.")
-        return "\n".join(lines)
-
-    if text.startswith("/ingest"):
-        arg = text[7:].strip()
-        files = scan_directory(cfg.docs_dir)
-        if not files:
-            return f"No documents found in `{cfg.docs_dir}`."
-        if arg == "all":
-            queued = []
-            for f in files:
-                try:
-                    validate_path(f["path"])
-                except (ValueError, Exception):
-                    continue
-                task = await task_queue.submit("ingest", {"path": f["path"], "name": f["name"]})
-                queued.append(f["name"])
-            return f"Queued {len(queued)} documents for ingestion."
-        if arg:
-            match = next((f for f in files if arg.lower() in f["name"].lower()), None)
-            if match:
-                try:
-                    validate_path(match["path"])
-                except (ValueError, Exception):
-                    return f"Blocked: path for '{match['name']}' is outside allowed directories."
-                task = await task_queue.submit("ingest", {"path": match["path"], "name": match["name"]})
-                return f"Ingesting **{match['name']}**... Task ID: `{task['id']}`"
-            return f"File not found matching '{arg}'. Use `/docs` to see available files."
-        return "Usage: `/ingest <filename>` or `/ingest all`"
-
-    if text == "/skills":
-        skills = await skills_engine.list_skills()
-        if not skills:
-            return "No skills learned yet. Use `/learn <topic>` to start."
-        lines = ["**Learned Skills:**\n"]
-        for s in skills:
-            lines.append(f"- **{s['name']}** ({s['domain']}) -- used {s.get('usage_count', 0)} times")
-        return "\n".join(lines)
-
-    if text.startswith("/catalog"):
-        return await _handle_catalog_command(text, skill_catalog, skills_engine)
-
-    if text == "/tasks":
-        tasks = await task_queue.list_tasks()
-        if not tasks:
-            return "No tasks in queue."
-        emoji = {"pending": "~", "running": ">", "completed": "+", "failed": "x", "cancelled": "-"}
-        lines = ["**Tasks:**\n"]
-        for t in tasks:
-            lines.append(f"[{emoji.get(t['status'], '?')}] `{t['id']}` -- {t['type']} ({t['status']})")
-        return "\n".join(lines)
-
-    # ── Quick model shortcuts (same as WebSocket path) ──
-    _QUICK_MODEL_CMDS = {
-        "/local": "ollama", "/kimi": "ollama",
-        "/cloud": "claude", "/api": "claude",
-        "/code": "claude_code", "/agent": "claude_code",
-        "/auto": None,
-    }
-    text_cmd = text.lower().split()[0] if text else ""
-    if text_cmd in _QUICK_MODEL_CMDS:
-        force = _QUICK_MODEL_CMDS[text_cmd]
-        _user_model_overrides[user_id] = force
-        labels = {
-            "ollama": "Ollama (local)", "claude": "Claude API",
-            "claude_code": "Claude Code (agentic)", None: "auto (local-first)",
-        }
-        return f"⚡ Model → **{labels[force]}**"
-
-    if text.startswith("/model "):
-        choice = text[7:].strip().lower()
-        _MODEL_ALIASES = {
-            "claude": "claude", "cloud": "claude", "api": "claude",
-            "local": "ollama", "ollama": "ollama", "kimi": "ollama",
-            "code": "claude_code", "claude_code": "claude_code",
-            "agent": "claude_code", "agentic": "claude_code",
-            "auto": None,
-        }
-        if choice in _MODEL_ALIASES:
-            force = _MODEL_ALIASES[choice]
-            _user_model_overrides[user_id] = force
-            labels = {
-                "ollama": "Ollama (local)", "claude": "Claude API",
-                "claude_code": "Claude Code (agentic)", None: "auto (local-first)",
-            }
-            return f"⚡ Model → **{labels[force]}**"
-        return "Use `/model local`, `/model claude`, `/model code`, or `/model auto`"
-
-    if text == "/status":
-        return await get_status(model_router, plugin_manager, task_queue, skills_engine)
-
-    if text == "/plugins":
-        if not plugin_manager.plugins:
-            return "No plugins loaded."
-        lines = ["**Loaded Plugins:**\n"]
-        for name, info in plugin_manager.status.items():
-            lines.append(f"**{name}** v{info['version']} -- {info['tools']} tools, {info['commands']} commands")
-        if plugin_manager.list_commands():
-            lines.append("\n**Plugin Commands:**")
-            for cmd in plugin_manager.list_commands():
-                lines.append(f"- `{cmd['command']}` ({cmd['plugin']}) -- {cmd['description']}")
-        return "\n".join(lines)
-
-    if text == "/workstreams":
-        from core.work_registry import work_registry
-        items = work_registry.get_all_active()
-        if not items:
-            return "No active work streams."
-        status_emoji = {"pending": "\u23f3", "running": "\u25b6\ufe0f", "completed": "\u2705", "failed": "\u274c", "cancelled": "\u26d4"}
-        kind_emoji = {
-            "agent": "\U0001f916", "sub_agent": "\U0001f500", "orchestration": "\U0001f310",
-            "plan": "\U0001f4cb", "plan_step": "\u2611\ufe0f", "task": "\u2699\ufe0f", "reminder": "\U0001f514",
-        }
-        lines = ["**Active Work Streams:**\n"]
-        counts = {"pending": 0, "running": 0}
-        for item in items:
-            s = item.get("status", "pending")
-            if s in counts:
-                counts[s] += 1
-            se = status_emoji.get(s, "?")
-            ke = kind_emoji.get(item.get("kind", ""), "\U0001f4e6")
-            title = item.get("title", item.get("id", "?"))[:60]
-            model_tag = f" `{item['model']}`" if item.get("model") else ""
-            lines.append(f"{se} {ke} **{title}**{model_tag}")
-        lines.append(f"\n__{counts['running']} running, {counts['pending']} pending__")
-        return "\n".join(lines)
-
-    # /multi — sub-agent orchestration (Telegram/API path)
-    if text.startswith("/multi"):
-        return await _handle_multi_non_ws(
-            text, cfg=cfg, db=db, model_router=model_router, conv_id=conv_id,
-            plugin_manager=plugin_manager, tool_executor=tool_executor,
+    # ── Slash commands ── (single gate; plain chat skips command parsing)
+    if text.startswith("/"):
+        reply = await _dispatch_command(
+            text,
+            user_id=user_id,
+            cfg=cfg,
+            db=db,
             skills_engine=skills_engine,
+            model_router=model_router,
+            task_queue=task_queue,
+            plugin_manager=plugin_manager,
+            tool_executor=tool_executor,
+            skill_catalog=skill_catalog,
+            conv_id=conv_id,
         )
-
-    # Plugin commands
-    if text.startswith("/"):
-        cmd_parts = text[1:].split(None, 1)
-        cmd_name = cmd_parts[0].lower()
-        cmd_args = cmd_parts[1] if len(cmd_parts) > 1 else ""
-        plugin_response = await plugin_manager.handle_command(cmd_name, cmd_args)
-        if plugin_response is not None:
-            return plugin_response
+        if reply is not None:
+            return reply
 
     # ── AI chat (non-WebSocket path: Telegram, API) ──
     # Use native tool calling (same as WebSocket path) to avoid raw XML leaking
@@ -395,9 +272,236 @@ async def process_message(
         tokens_in=result.get("tokens_in", 0),
         tokens_out=result.get("tokens_out", 0),
     )
+
+    # Passive memory extraction — background task, never delays the reply
+    if passive_memory:
+        passive_memory.schedule(conv_id, text, content)
+
     return content
 
 
+async def _dispatch_command(text: str, *, plugin_manager: Any, **deps: Any) -> str | None:
+    """Run a slash command — built-ins first, then plugin commands.
+
+    Returns None when no handler claims the command, so the message falls
+    through to AI chat.
+    """
+    cmd_parts = text[1:].split(None, 1)
+    cmd_name = cmd_parts[0].lower() if cmd_parts else ""
+    cmd_args = cmd_parts[1].strip() if len(cmd_parts) > 1 else ""
+
+    handler = _COMMANDS.get(cmd_name)
+    if handler is not None:
+        return await handler(cmd_args, cmd=cmd_name, text=text, plugin_manager=plugin_manager, **deps)
+
+    return await plugin_manager.handle_command(cmd_name, cmd_args)
+
+
+# Short-lived cache of the docs directory listing, so back-to-back
+# /docs and /ingest commands share one filesystem walk.
+_DOCS_CACHE_TTL = 2.0  # seconds
+_docs_cache: tuple[str, float, list[dict]] | None = None
+
+
+def _scan_docs(docs_dir: str) -> list[dict]:
+    """Return scan_directory(docs_dir), reusing a result from the last few seconds."""
+    global _docs_cache
+    now = time.monotonic()
+    if _docs_cache and _docs_cache[0] == docs_dir and now - _docs_cache[1] < _DOCS_CACHE_TTL:
+        return _docs_cache[2]
+    files = scan_directory(docs_dir)
+    _docs_cache = (docs_dir, now, files)
+    return files
+
+
+# ── Slash command handlers ──
+# Each handler receives the argument string plus the process_message
+# dependencies as keyword arguments, and picks out the ones it needs.
+
+_MODEL_LABELS = {
+    "ollama": "Ollama (local)", "claude": "Claude API",
+    "claude_code": "Claude Code (agentic)", None: "auto (local-first)",
+}
+
+# Quick model shortcuts (same as WebSocket path)
+_QUICK_MODEL_CMDS = {
+    "local": "ollama", "kimi": "ollama",
+    "cloud": "claude", "api": "claude",
+    "code": "claude_code", "agent": "claude_code",
+    "auto": None,
+}
+
+_MODEL_ALIASES = {
+    "claude": "claude", "cloud": "claude", "api": "claude",
+    "local": "ollama", "ollama": "ollama", "kimi": "ollama",
+    "code": "claude_code", "claude_code": "claude_code",
+    "agent": "claude_code", "agentic": "claude_code",
+    "auto": None,
+}
+
+
+async def _cmd_learn(arg: str, *, task_queue: Any, **_: Any) -> str:
+    if arg:
+        task = await task_queue.submit("research", {"topic": arg})
+        return f"Research task queued: **{arg}**\nTask ID: `{task['id']}`"
+    return "Please specify a topic: `/learn <topic>`"
+
+
+async def _cmd_docs(arg: str, *, cfg: Any, **_: Any) -> str:
+    files = _scan_docs(cfg.docs_dir)
+    if not files:
+        return f"No documents found in `{cfg.docs_dir}`\n\nPlace files there then use `/ingest <filename>` or `/ingest all`."
+    return "\n".join([
+        f"**Documents in** `{cfg.docs_dir}`\n",
+        *[f"- `{f['relative_path']}` ({f['extension']}, {f['size'] / 1024:.0f}KB)" for f in files],
+        "\nUse `/ingest <filename>` to learn from a file, or `/ingest all`.",
+    ])
+
+
+async def _cmd_ingest(arg: str, *, cfg: Any, task_queue: Any, **_: Any) -> str:
+    files = _scan_docs(cfg.docs_dir)
+    if not files:
+        return f"No documents found in `{cfg.docs_dir}`."
+    if arg == "all":
+        queued = []
+        for f in files:
+            try:
+                validate_path(f["path"])
+            except (ValueError, Exception):
+                continue
+            await task_queue.submit("ingest", {"path": f["path"], "name": f["name"]})
+            queued.append(f["name"])
+        return f"Queued {len(queued)} documents for ingestion."
+    if arg:
+        match = next((f for f in files if arg.lower() in f["name"].lower()), None)
+        if match:
+            try:
+                validate_path(match["path"])
+            except (ValueError, Exception):
+                return f"Blocked: path for '{match['name']}' is outside allowed directories."
+            task = await task_queue.submit("ingest", {"path": match["path"], "name": match["name"]})
+            return f"Ingesting **{match['name']}**... Task ID: `{task['id']}`"
+        return f"File not found matching '{arg}'. Use `/docs` to see available files."
+    return "Usage: `/ingest <filename>` or `/ingest all`"
+
+
+async def _cmd_skills(arg: str, *, skills_engine: Any, **_: Any) -> str:
+    skills = await skills_engine.list_skills()
+    if not skills:
+        return "No skills learned yet. Use `/learn <topic>` to start."
+    return "\n".join([
+        "**Learned Skills:**\n",
+        *[f"- **{s['name']}** ({s['domain']}) -- used {s.get('usage_count', 0)} times" for s in skills],
+    ])
+
+
+async def _cmd_catalog(arg: str, *, text: str, skill_catalog: Any, skills_engine: Any, **_: Any) -> str:
+    return await _handle_catalog_command(text, skill_catalog, skills_engine)
+
+
+async def _cmd_tasks(arg: str, *, task_queue: Any, **_: Any) -> str:
+    tasks = await task_queue.list_tasks()
+    if not tasks:
+        return "No tasks in queue."
+    emoji = {"pending": "~", "running": ">", "completed": "+", "failed": "x", "cancelled": "-"}
+    return "\n".join([
+        "**Tasks:**\n",
+        *[f"[{emoji.get(t['status'], '?')}] `{t['id']}` -- {t['type']} ({t['status']})" for t in tasks],
+    ])
+
+
+async def _cmd_quick_model(arg: str, *, cmd: str, user_id: str, **_: Any) -> str:
+    force = _QUICK_MODEL_CMDS[cmd]
+    _set_model_override(user_id, force)
+    return f"⚡ Model → **{_MODEL_LABELS[force]}**"
+
+
+async def _cmd_model(arg: str, *, user_id: str, **_: Any) -> str:
+    choice = arg.lower()
+    if choice in _MODEL_ALIASES:
+        force = _MODEL_ALIASES[choice]
+        _set_model_override(user_id, force)
+        return f"⚡ Model → **{_MODEL_LABELS[force]}**"
+    return "Use `/model local`, `/model claude`, `/model code`, or `/model auto`"
+
+
+async def _cmd_status(
+    arg: str, *, model_router: Any, plugin_manager: Any, task_queue: Any, skills_engine: Any, **_: Any,
+) -> str:
+    return await get_status(model_router, plugin_manager, task_queue, skills_engine)
+
+
+async def _cmd_plugins(arg: str, *, plugin_manager: Any, **_: Any) -> str:
+    if not plugin_manager.plugins:
+        return "No plugins loaded."
+    lines = [
+        "**Loaded Plugins:**\n",
+        *[
+            f"**{name}** v{info['version']} -- {info['tools']} tools, {info['commands']} commands"
+            for name, info in plugin_manager.status.items()
+        ],
+    ]
+    cmds = plugin_manager.list_commands()
+    if cmds:
+        lines.append("\n**Plugin Commands:**")
+        lines.extend(f"- `{cmd['command']}` ({cmd['plugin']}) -- {cmd['description']}" for cmd in cmds)
+    return "\n".join(lines)
+
+
+async def _cmd_workstreams(arg: str, **_: Any) -> str:
+    from core.work_registry import work_registry
+    items = work_registry.get_all_active()
+    if not items:
+        return "No active work streams."
+    status_emoji = {"pending": "\u23f3", "running": "\u25b6\ufe0f", "completed": "\u2705", "failed": "\u274c", "cancelled": "\u26d4"}
+    kind_emoji = {
+        "agent": "\U0001f916", "sub_agent": "\U0001f500", "orchestration": "\U0001f310",
+        "plan": "\U0001f4cb", "plan_step": "\u2611\ufe0f", "task": "\u2699\ufe0f", "reminder": "\U0001f514",
+    }
+    lines = ["**Active Work Streams:**\n"]
+    counts = {"pending": 0, "running": 0}
+    for item in items:
+        s = item.get("status", "pending")
+        if s in counts:
+            counts[s] += 1
+        se = status_emoji.get(s, "?")
+        ke = kind_emoji.get(item.get("kind", ""), "\U0001f4e6")
+        title = item.get("title", item.get("id", "?"))[:60]
+        model_tag = f" `{item['model']}`" if item.get("model") else ""
+        lines.append(f"{se} {ke} **{title}**{model_tag}")
+    lines.append(f"\n__{counts['running']} running, {counts['pending']} pending__")
+    return "\n".join(lines)
+
+
+async def _cmd_multi(
+    arg: str, *, text: str, cfg: Any, db: Any, model_router: Any, conv_id: str | None,
+    plugin_manager: Any, tool_executor: Any, skills_engine: Any, **_: Any,
+) -> str:
+    return await _handle_multi_non_ws(
+        text, cfg=cfg, db=db, model_router=model_router, conv_id=conv_id,
+        plugin_manager=plugin_manager, tool_executor=tool_executor,
+        skills_engine=skills_engine,
+    )
+
+
+# Built-in slash commands, keyed by lower-cased name (without the "/").
+# Looked up before plugin commands, so built-ins take precedence.
+_COMMANDS = {
+    "learn": _cmd_learn,
+    "docs": _cmd_docs,
+    "ingest": _cmd_ingest,
+    "skills": _cmd_skills,
+    "catalog": _cmd_catalog,
+    "tasks": _cmd_tasks,
+    "model": _cmd_model,
+    "status": _cmd_status,
+    "plugins": _cmd_plugins,
+    "workstreams": _cmd_workstreams,
+    "multi": _cmd_multi,
+    **{name: _cmd_quick_model for name in _QUICK_MODEL_CMDS},
+}
+
+
 async def _handle_multi_non_ws(
     text: str,
     *,
@@ -417,6 +521,7 @@ async def _handle_multi_non_ws(
         return (
             "**Sub-Agent Commands:**\n"
             "• `/multi research <q1> | <q2> | ...` — Parallel research\n"
+            "• `/multi batch research <q1> | <q2> | ...` — Parallel research via Message Batches (slower, half price)\n"
             "• `/multi review <task>` — Build + Review\n"
             "• `/multi code-review <task>` — Claude Code build + review\n"
             "• `/multi verify <claim>` — Independent verification"
@@ -429,6 +534,15 @@ async def _handle_multi_non_ws(
     sub_cmd = parts[0].lower()
     payload = parts[1] if len(parts) > 1 else ""
 
+    # "/multi batch research ..." sends the researchers as one Message Batch
+    batch = False
+    if sub_cmd == "batch":
+        parts = payload.split(None, 1)
+        if parts and parts[0].lower() == "research":
+            batch = True
+            sub_cmd = "research"
+            payload = parts[1] if len(parts) > 1 else ""
+
     if not payload:
         return f"Usage: `/multi {sub_cmd} <text>`"
 
@@ -454,7 +568,7 @@ async def _handle_multi_non_ws(
             queries = [q.strip() for q in payload.split(" and ") if q.strip() and len(q.strip()) > 10]
         if len(queries) < 2:
             queries = [payload]
-        orchestration = OrchestrationStrategy.parallel_research(queries, cfg)
+        orchestration = OrchestrationStrategy.parallel_research(queries, cfg, batch=batch)
     elif sub_cmd == "review":
         orchestration = OrchestrationStrategy.build_review(payload, cfg=cfg)
     elif sub_cmd in ("code-review", "codereview"):
@@ -462,7 +576,7 @@ async def _handle_multi_non_ws(
     elif sub_cmd == "verify":
         orchestration = OrchestrationStrategy.verify(payload, cfg=cfg)
     else:
-        return f"Unknown sub-command: `{sub_cmd}`. Use: `research`, `review`, `code-review`, `verify`"
+        return f"Unknown sub-command: `{sub_cmd}`. Use: `research`, `batch research`, `review`, `code-review`, `verify`"
 
     # Build a state shim with real dependencies
     class _StateShim:
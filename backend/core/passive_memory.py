@@ -13,12 +13,16 @@ building a rich context model without explicit user commands.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
 from datetime import datetime, timezone
 from typing import Any, Optional
 
+from sqlalchemy import column, func, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
 logger = logging.getLogger("nexus.passive_memory")
 
 # Patterns that suggest preference statements
@@ -35,17 +39,127 @@ PROJECT_PATTERNS = [
     r"(?:tech stack|framework|language|database)(?:\s+is)?\s+(.+)",
 ]
 
+# Keyword sets for interaction classification. Single words are matched
+# against the message's token set; multi-word phrases fall back to a
+# substring check.
+_WORD_RE = re.compile(r"\w+")
+_DEBUG_KW = frozenset({"fix", "bug", "error", "broken"})
+_DEVELOPMENT_KW = frozenset({"create", "build", "implement", "add"})
+_RESEARCH_KW = frozenset({"search", "find"})
+_RESEARCH_PHRASES = ("look up", "what is")
+_LEARNING_KW = frozenset({"explain", "why"})
+_LEARNING_PHRASES = ("how does", "help me understand")
+
+
+# SQL statements, built once and reused on every call.
+# The preference upsert is built per call (its VALUES list varies), so
+# only a lightweight handle for the columns it writes lives here.
+_user_preferences = table(
+    "user_preferences",
+    column("category"),
+    column("key"),
+    column("value"),
+    column("source"),
+    column("confidence"),
+    column("updated_at"),
+)
+
+_SQL_INSERT_PROJECT_CONTEXT = text("""
+    INSERT INTO project_contexts (key, value, source, updated_at)
+    VALUES (:key, :value, :source, NOW())
+    ON CONFLICT DO NOTHING
+""")
+
+_SQL_INSERT_INTERACTION_PATTERN = text("""
+    INSERT INTO interaction_patterns
+        (conversation_id, pattern_type, detail, created_at)
+    VALUES (:conv_id, :type, :detail, NOW())
+""")
+
+
+_SQL_TOP_PREFERENCES = text("""
+    SELECT key, value, confidence
+    FROM user_preferences
+    ORDER BY confidence DESC, updated_at DESC
+    LIMIT :limit
+""")
+
+_SQL_RECENT_PROJECT_CONTEXT = text("""
+    SELECT key, value
+    FROM project_contexts
+    ORDER BY updated_at DESC
+    LIMIT :limit
+""")
+
+
+def _upsert_preferences_stmt(prefs: list[dict]) -> Any:
+    """Build one multi-row INSERT ... ON CONFLICT (key) DO UPDATE for prefs.
+
+    Rows are de-duplicated by key first — Postgres rejects an upsert that
+    touches the same row twice in one statement.
+    """
+    rows = [{**p, "updated_at": func.now()} for p in {p["key"]: p for p in prefs}.values()]
+    stmt = pg_insert(_user_preferences).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=["key"],
+        set_={
+            "value": stmt.excluded.value,
+            "source": stmt.excluded.source,
+            "confidence": _user_preferences.c.confidence + 0.1,
+            "updated_at": func.now(),
+        },
+    )
+
+
+class _KeyCharTable(dict):
+    """str.translate table mapping every char outside [a-z0-9_] to "_"."""
+
+    def __missing__(self, codepoint: int) -> int:
+        return ord("_")
+
+
+_KEY_CHARS = _KeyCharTable({ord(c): ord(c) for c in "abcdefghijklmnopqrstuvwxyz0123456789_"})
+
+# Max extractions allowed in flight before the oldest is cancelled
+MAX_PENDING_EXTRACTIONS = 32
+
 
 class PassiveMemoryExtractor:
     """Extract learnable context from conversation messages.
 
-    Call `extract_and_store()` after each assistant response to silently
-    learn from the conversation. Lightweight — designed to run inline
-    without noticeably slowing down responses.
+    Call `schedule()` after each assistant response to silently learn from
+    the conversation in the background, so the reply is never held up by
+    the extraction or its DB writes. `extract_and_store()` is the awaitable
+    form for callers that want the result.
     """
 
     def __init__(self, db: Any):
         self.db = db
+        # Insertion-ordered so the oldest in-flight task can be dropped
+        self._pending: dict[asyncio.Task, None] = {}
+
+    def schedule(self, conv_id: str, user_message: str, assistant_message: str) -> asyncio.Task:
+        """Run `extract_and_store()` as a background task.
+
+        Holds a reference to the task until it finishes. If too many
+        extractions are already in flight, the oldest is cancelled.
+        """
+        if len(self._pending) >= MAX_PENDING_EXTRACTIONS:
+            oldest = next(iter(self._pending))
+            oldest.cancel()
+            self._pending.pop(oldest, None)
+            logger.debug("Passive memory: backlog full, dropped oldest extraction")
+
+        task = asyncio.create_task(self._extract_in_background(conv_id, user_message, assistant_message))
+        self._pending[task] = None
+        task.add_done_callback(lambda t: self._pending.pop(t, None))
+        return task
+
+    async def _extract_in_background(self, conv_id: str, user_message: str, assistant_message: str):
+        try:
+            await self.extract_and_store(conv_id, user_message, assistant_message)
+        except Exception as e:
+            logger.debug(f"Passive memory extraction failed: {e}")
 
     async def extract_and_store(
         self,
@@ -57,29 +171,17 @@ class PassiveMemoryExtractor:
 
         Returns a summary of what was learned (for logging, not shown to user).
         """
+        # Extract preferences and project context from user messages,
+        # then track interaction patterns
+        pattern = self._classify_interaction(user_message)
         learned = {
-            "preferences": [],
-            "project_context": [],
-            "patterns": [],
+            "preferences": self._extract_preferences(user_message),
+            "project_context": self._extract_project_context(user_message),
+            "patterns": [pattern] if pattern else [],
         }
 
-        # Extract preferences from user messages
-        preferences = self._extract_preferences(user_message)
-        for pref in preferences:
-            await self._store_preference(pref)
-            learned["preferences"].append(pref)
-
-        # Extract project context
-        project_ctx = self._extract_project_context(user_message)
-        for ctx in project_ctx:
-            await self._store_project_context(ctx)
-            learned["project_context"].append(ctx)
-
-        # Track interaction patterns
-        pattern = self._classify_interaction(user_message)
-        if pattern:
-            await self._store_interaction_pattern(conv_id, pattern)
-            learned["patterns"].append(pattern)
+        if any(learned.values()):
+            await self._store_learned(conv_id, learned)
 
         total = sum(len(v) for v in learned.values())
         if total > 0:
@@ -127,79 +229,47 @@ class PassiveMemoryExtractor:
     def _classify_interaction(self, text: str) -> Optional[dict]:
         """Classify the type of interaction for pattern tracking."""
         text_lower = text.lower()
+        tokens = frozenset(_WORD_RE.findall(text_lower))
 
         # Classify interaction type
-        if any(w in text_lower for w in ["fix", "bug", "error", "broken"]):
-            return {"type": "debugging", "detail": text[:100]}
-        elif any(w in text_lower for w in ["create", "build", "implement", "add"]):
-            return {"type": "development", "detail": text[:100]}
-        elif any(w in text_lower for w in ["search", "find", "look up", "what is"]):
-            return {"type": "research", "detail": text[:100]}
-        elif any(w in text_lower for w in ["explain", "how does", "why", "help me understand"]):
-            return {"type": "learning", "detail": text[:100]}
+        if tokens & _DEBUG_KW:
+            interaction_type = "debugging"
+        elif tokens & _DEVELOPMENT_KW:
+            interaction_type = "development"
+        elif tokens & _RESEARCH_KW or any(p in text_lower for p in _RESEARCH_PHRASES):
+            interaction_type = "research"
+        elif tokens & _LEARNING_KW or any(p in text_lower for p in _LEARNING_PHRASES):
+            interaction_type = "learning"
         elif text.startswith("/"):
-            return {"type": "command", "detail": text[:100]}
+            interaction_type = "command"
+        else:
+            return None
 
-        return None
+        return {"type": interaction_type, "detail": text[:100]}
 
     def _normalize_key(self, text: str) -> str:
         """Normalize text into a key-friendly format."""
-        return re.sub(r"[^a-z0-9_]", "_", text.lower().strip())[:50]
+        return text.lower().strip()[:50].translate(_KEY_CHARS)
 
-    async def _store_preference(self, pref: dict):
-        """Store a preference in the database."""
-        try:
-            from sqlalchemy import text
-            async with self.db._session_factory() as session:
-                await session.execute(
-                    text("""
-                        INSERT INTO user_preferences (category, key, value, source, updated_at)
-                        VALUES (:category, :key, :value, :source, NOW())
-                        ON CONFLICT (key) DO UPDATE SET
-                            value = :value,
-                            source = :source,
-                            confidence = user_preferences.confidence + 0.1,
-                            updated_at = NOW()
-                    """),
-                    pref,
-                )
-                await session.commit()
-        except Exception as e:
-            logger.debug(f"Failed to store preference: {e}")
+    async def _store_learned(self, conv_id: str, learned: dict):
+        """Store all extracted items in a single transaction.
 
-    async def _store_project_context(self, ctx: dict):
-        """Store project context in the database."""
-        try:
-            from sqlalchemy import text
-            async with self.db._session_factory() as session:
-                await session.execute(
-                    text("""
-                        INSERT INTO project_contexts (key, value, source, updated_at)
-                        VALUES (:key, :value, :source, NOW())
-                        ON CONFLICT DO NOTHING
-                    """),
-                    ctx,
-                )
-                await session.commit()
-        except Exception as e:
-            logger.debug(f"Failed to store project context: {e}")
-
-    async def _store_interaction_pattern(self, conv_id: str, pattern: dict):
-        """Store interaction pattern for analytics."""
+        Preferences go in as one multi-row upsert and the other tables as
+        one executemany-style insert each, with a single commit.
+        """
         try:
-            from sqlalchemy import text
-            async with self.db._session_factory() as session:
-                await session.execute(
-                    text("""
-                        INSERT INTO interaction_patterns
-                            (conversation_id, pattern_type, detail, created_at)
-                        VALUES (:conv_id, :type, :detail, NOW())
-                    """),
-                    {"conv_id": conv_id, **pattern},
-                )
-                await session.commit()
+            async with self.db._session_factory() as session, session.begin():
+                if learned["preferences"]:
+                    await session.execute(_upsert_preferences_stmt(learned["preferences"]))
+                if learned["project_context"]:
+                    await session.execute(_SQL_INSERT_PROJECT_CONTEXT, learned["project_context"])
+                if learned["patterns"]:
+                    await session.execute(
+                        _SQL_INSERT_INTERACTION_PATTERN,
+                        [{"conv_id": conv_id, **p} for p in learned["patterns"]],
+                    )
         except Exception as e:
-            logger.debug(f"Failed to store interaction pattern: {e}")
+            logger.debug(f"Failed to store passive memory: {e}")
 
     async def get_context_for_prompt(self, limit: int = 5) -> str:
         """Build context string from stored memories for injection into system prompt.
@@ -208,43 +278,29 @@ class PassiveMemoryExtractor:
         """
         parts = []
 
-        try:
-            from sqlalchemy import text
-            async with self.db._session_factory() as session:
-                # Top preferences
-                result = await session.execute(
-                    text("""
-                        SELECT key, value, confidence
-                        FROM user_preferences
-                        ORDER BY confidence DESC, updated_at DESC
-                        LIMIT :limit
-                    """),
-                    {"limit": limit},
-                )
-                prefs = result.fetchall()
-                if prefs:
-                    pref_lines = [f"- {r[0]}: {r[1]}" for r in prefs]
-                    parts.append("**User Preferences:**\n" + "\n".join(pref_lines))
-
-                # Recent project context
-                result2 = await session.execute(
-                    text("""
-                        SELECT key, value
-                        FROM project_contexts
-                        ORDER BY updated_at DESC
-                        LIMIT :limit
-                    """),
-                    {"limit": limit},
-                )
-                projects = result2.fetchall()
-                if projects:
-                    proj_lines = [f"- {r[1]}" for r in projects]
-                    parts.append("**Project Context:**\n" + "\n".join(proj_lines))
-
-        except Exception as e:
-            logger.debug(f"Failed to get context for prompt: {e}")
+        # The two lookups are independent — run them on separate sessions concurrently
+        prefs, projects = await asyncio.gather(
+            self._fetch_rows(_SQL_TOP_PREFERENCES, limit),
+            self._fetch_rows(_SQL_RECENT_PROJECT_CONTEXT, limit),
+        )
+        if prefs:
+            pref_lines = [f"- {r[0]}: {r[1]}" for r in prefs]
+            parts.append("**User Preferences:**\n" + "\n".join(pref_lines))
+        if projects:
+            proj_lines = [f"- {r[1]}" for r in projects]
+            parts.append("**Project Context:**\n" + "\n".join(proj_lines))
 
         result = "\n\n".join(parts)
         if len(result) > 1600:
             result = result[:1600] + "\n...(memory truncated)"
         return result
+
+    async def _fetch_rows(self, stmt: Any, limit: int) -> list:
+        """Run a read-only SELECT on its own session; returns [] on failure."""
+        try:
+            async with self.db._session_factory() as session:
+                result = await session.execute(stmt, {"limit": limit})
+                return result.fetchall()
+        except Exception as e:
+            logger.debug(f"Failed to get context for prompt: {e}")
+            return []
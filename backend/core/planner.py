@@ -3,7 +3,7 @@
 Allows the agent to:
 1. Decompose a complex request into discrete steps
 2. Present the plan for user approval
-3. Execute steps sequentially with progress tracking
+3. Execute steps with progress tracking — independent steps run in parallel
 4. Handle failures and re-planning
 
 Plan lifecycle: draft -> approved -> executing -> completed/failed
@@ -13,21 +13,49 @@ Usage:
     plan = await planner.create_plan(user_request, model="ollama")
     # User reviews plan...
     await planner.approve_plan(plan_id)
-    # Execution begins automatically via task queue
+    # Either drive steps externally via start_step/complete_step, or let
+    # run_plan dispatch every ready step concurrently:
+    await planner.run_plan(plan_id, execute=run_one_step)
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import sys
+import time
 import uuid
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
 from typing import Any, Optional
 
+from core.exceptions import CycleDetectedError
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger("nexus.planner")
 
+# Plans and steps are long-lived and numerous; drop the per-instance
+# __dict__ where the interpreter supports slotted dataclasses (3.10+).
+_DATACLASS_OPTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _iso(ns: Optional[int]) -> Optional[str]:
+    """Format a ``time.time_ns()`` timestamp as a UTC ISO-8601 string."""
+    if not ns:
+        return None
+    seconds, remainder = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(
+        microsecond=remainder // 1000,
+    ).isoformat()
+
 
 class PlanStatus(str, Enum):
     DRAFT = "draft"
@@ -46,7 +74,7 @@ class StepStatus(str, Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTS)
 class PlanStep:
     id: str
     title: str
@@ -56,8 +84,9 @@ class PlanStep:
     status: StepStatus = StepStatus.PENDING
     result: str = ""
     error: str = ""
-    started_at: Optional[str] = None
-    completed_at: Optional[str] = None
+    started_at: Optional[int] = None  # time.time_ns(); ISO-formatted in to_dict()
+    completed_at: Optional[int] = None
+    rank: float = 0.0  # Estimated cost of the longest path from this step to the end
 
     def to_dict(self) -> dict:
         return {
@@ -69,40 +98,122 @@ class PlanStep:
             "status": self.status.value,
             "result": self.result,
             "error": self.error,
-            "started_at": self.started_at,
-            "completed_at": self.completed_at,
+            "started_at": _iso(self.started_at),
+            "completed_at": _iso(self.completed_at),
+            "rank": self.rank,
         }
 
 
-@dataclass
+# Rough relative cost of a step by tool_hint, used for critical-path ranking
+TOOL_HINT_COST = {
+    "web_search": 10.0,
+    "terminal": 5.0,
+    "code_edit": 3.0,
+    "file_read": 1.0,
+    "none": 0.1,
+}
+DEFAULT_STEP_COST = 3.0
+
+
+@dataclass(**_DATACLASS_OPTS)
 class Plan:
     id: str
     title: str
     original_request: str
     steps: list[PlanStep] = field(default_factory=list)
     status: PlanStatus = PlanStatus.DRAFT
-    created_at: str = ""
-    updated_at: str = ""
+    created_at: int = 0  # time.time_ns(); ISO-formatted in to_dict()
+    updated_at: int = 0
     conv_id: str = ""
+    # Dependency graph (Kahn's algorithm): unmet-dependency count per step,
+    # and the steps waiting on each step. Built once from depends_on.
+    _indegree: dict[str, int] = field(default_factory=dict, init=False, repr=False)
+    _dependents: dict[str, list[str]] = field(default_factory=dict, init=False, repr=False)
+    # Step lookup by ID, and how many steps are not yet completed/skipped
+    _step_index: dict[str, PlanStep] = field(default_factory=dict, init=False, repr=False)
+    _unfinished: int = field(default=0, init=False, repr=False)
+    # Serialized form, reused by to_dict() until the plan is next mutated
+    _cached_dict: Optional[dict] = field(default=None, init=False, repr=False)
 
     def __post_init__(self):
-        now = datetime.now(timezone.utc).isoformat()
+        now = time.time_ns()
         if not self.created_at:
             self.created_at = now
         if not self.updated_at:
             self.updated_at = now
+        self._step_index = {s.id: s for s in self.steps}
+        self._unfinished = sum(
+            1 for s in self.steps if s.status not in (StepStatus.COMPLETED, StepStatus.SKIPPED)
+        )
+        self._build_graph()
+
+    def _build_graph(self) -> None:
+        """Compute in-degrees and dependents from each step's ``depends_on``.
+
+        References to unknown step IDs are ignored rather than blocking the
+        step forever.
+        """
+        ids = self._step_index
+        self._indegree = {}
+        self._dependents = {s.id: [] for s in self.steps}
+        for step in self.steps:
+            deps = [d for d in dict.fromkeys(step.depends_on or []) if d in ids and d != step.id]
+            self._indegree[step.id] = len(deps)
+            for dep in deps:
+                self._dependents[dep].append(step.id)
+        self._rank_steps()
+
+    def _rank_steps(self) -> None:
+        """Set each step's rank to its critical-path cost to plan completion.
+
+        rank(v) = cost(v) + max(rank(u) for u in dependents(v)), evaluated in
+        reverse topological order. Steps caught in a cycle keep their own cost.
+        """
+        by_id = self._step_index
+        indegree = dict(self._indegree)
+        order = [sid for sid, n in indegree.items() if n == 0]
+        for sid in order:  # Kahn's algorithm; order grows while iterating
+            for dep_id in self._dependents[sid]:
+                indegree[dep_id] -= 1
+                if indegree[dep_id] == 0:
+                    order.append(dep_id)
+
+        for step in self.steps:
+            step.rank = TOOL_HINT_COST.get(step.tool_hint, DEFAULT_STEP_COST)
+        for sid in reversed(order):
+            step = by_id[sid]
+            downstream = [by_id[d].rank for d in self._dependents[sid]]
+            step.rank = TOOL_HINT_COST.get(step.tool_hint, DEFAULT_STEP_COST) + max(downstream, default=0.0)
+
+    def _release(self, step_id: str) -> list[str]:
+        """Mark ``step_id``'s dependents as having one fewer unmet dependency.
+
+        Returns the IDs whose in-degree just reached zero.
+        """
+        released = []
+        for dep_id in self._dependents.get(step_id, ()):
+            self._indegree[dep_id] -= 1
+            if self._indegree[dep_id] == 0:
+                released.append(dep_id)
+        return released
+
+    def mark_updated(self) -> None:
+        """Record a mutation: bump updated_at and drop the cached to_dict()."""
+        self.updated_at = time.time_ns()
+        self._cached_dict = None
 
     @property
     def progress(self) -> dict:
+        counts = dict.fromkeys(StepStatus, 0)
+        for s in self.steps:
+            counts[s.status] += 1
         total = len(self.steps)
-        completed = sum(1 for s in self.steps if s.status == StepStatus.COMPLETED)
-        failed = sum(1 for s in self.steps if s.status == StepStatus.FAILED)
-        running = sum(1 for s in self.steps if s.status == StepStatus.RUNNING)
+        completed = counts[StepStatus.COMPLETED]
         return {
             "total": total,
             "completed": completed,
-            "failed": failed,
-            "running": running,
+            "failed": counts[StepStatus.FAILED],
+            "running": counts[StepStatus.RUNNING],
             "percent": round(completed / total * 100) if total else 0,
         }
 
@@ -114,6 +225,15 @@ class Plan:
         return None
 
     def to_dict(self) -> dict:
+        """Serialize the plan.
+
+        Cached until the next mark_updated(); callers must not mutate the result.
+        """
+        if self._cached_dict is None:
+            self._cached_dict = self._build_dict()
+        return self._cached_dict
+
+    def _build_dict(self) -> dict:
         return {
             "id": self.id,
             "title": self.title,
@@ -121,14 +241,37 @@ class Plan:
             "status": self.status.value,
             "steps": [s.to_dict() for s in self.steps],
             "progress": self.progress,
-            "created_at": self.created_at,
-            "updated_at": self.updated_at,
+            "created_at": _iso(self.created_at),
+            "updated_at": _iso(self.updated_at),
             "conv_id": self.conv_id,
         }
 
 
-# In-memory plan store (persists per server session; could be moved to DB later)
+# In-memory plan store (persists per server session; could be moved to DB later).
+# Insertion order is creation order, so listings need no sort; plans are
+# also indexed by conversation so filtered listings don't scan every plan.
 _plans: dict[str, Plan] = {}
+_plans_by_conv: dict[str, list[str]] = {}
+MAX_PLANS = 500  # Oldest plans not currently executing are evicted beyond this
+
+
+def _store_plan(plan: Plan) -> None:
+    """Add a plan to the store, evicting the oldest idle plan if full.
+
+    Drafts and approved plans that never run count towards the cap too.
+    ``_plans`` is in creation order, so the scan only steps past the few
+    plans that are mid-execution.
+    """
+    _plans[plan.id] = plan
+    _plans_by_conv.setdefault(plan.conv_id, []).append(plan.id)
+    if len(_plans) > MAX_PLANS:
+        oldest = next((p for p in _plans.values() if p.status != PlanStatus.EXECUTING), None)
+        if oldest is not None:
+            del _plans[oldest.id]
+            conv_plans = _plans_by_conv.get(oldest.conv_id, [])
+            conv_plans.remove(oldest.id)
+            if not conv_plans:
+                _plans_by_conv.pop(oldest.conv_id, None)
 
 
 PLAN_GENERATION_PROMPT = """You are a task planner. Break the following user request into discrete, actionable steps.
@@ -149,6 +292,30 @@ Steps that can be done independently should have empty depends_on arrays so they
 Example:
 {{"title": "Set up Python project", "steps": [{{"title": "Create project directory", "description": "Create a new directory structure for the Python project with src/ and tests/ folders.", "tool_hint": "terminal", "depends_on": []}}, {{"title": "Initialize virtual environment", "description": "Create a Python virtual environment and install base dependencies.", "tool_hint": "terminal", "depends_on": ["step-1"]}}]}}"""
 
+# The template is static apart from {request}: split it once so building a
+# prompt is a plain concatenation rather than a format() parse per call.
+_PROMPT_PREFIX, _PROMPT_SUFFIX = (
+    part.replace("{{", "{").replace("}}", "}")
+    for part in PLAN_GENERATION_PROMPT.split("{request}", 1)
+)
+
+
+def _parse_plan_json(response: Any) -> dict:
+    """Extract the plan object from a model response.
+
+    Accepts the router's response dict (or a bare string) and tolerates
+    prose or code fences around the JSON object. Raises ValueError when
+    no JSON object can be parsed.
+    """
+    content = response.get("content", "") if isinstance(response, dict) else str(response or "")
+    start, end = content.find("{"), content.rfind("}")
+    if start != -1 and end > start:
+        content = content[start:end + 1]
+    data = _json_loads(content)
+    if not isinstance(data, dict):
+        raise ValueError("Plan response is not a JSON object")
+    return data
+
 
 class PlanExecutor:
     """Creates and manages execution plans."""
@@ -162,14 +329,13 @@ class PlanExecutor:
         plan_id = f"plan-{uuid.uuid4().hex[:8]}"
 
         if self.model_router:
-            prompt = PLAN_GENERATION_PROMPT.format(request=request)
+            prompt = _PROMPT_PREFIX + request + _PROMPT_SUFFIX
             try:
                 response = await self.model_router.chat(
                     messages=[{"role": "user", "content": prompt}],
                     system="You are a task planning assistant. Respond only with valid JSON.",
                 )
-                # Parse the JSON response
-                data = json.loads(response.strip())
+                data = _parse_plan_json(response)
                 title = data.get("title", "Untitled Plan")
                 steps = []
                 for i, s in enumerate(data.get("steps", [])):
@@ -180,7 +346,7 @@ class PlanExecutor:
                         tool_hint=s.get("tool_hint", ""),
                         depends_on=s.get("depends_on", []),
                     ))
-            except (json.JSONDecodeError, Exception) as e:
+            except Exception as e:
                 logger.warning(f"Failed to parse plan from LLM: {e}")
                 title = "Plan"
                 steps = [PlanStep(
@@ -199,7 +365,7 @@ class PlanExecutor:
             steps=steps,
             conv_id=conv_id,
         )
-        _plans[plan_id] = plan
+        _store_plan(plan)
         logger.info(f"Created plan {plan_id}: '{title}' with {len(steps)} steps")
 
         # Register in work registry
@@ -229,7 +395,7 @@ class PlanExecutor:
             raise ValueError(f"Plan {plan_id} is not in draft state (current: {plan.status})")
 
         plan.status = PlanStatus.APPROVED
-        plan.updated_at = datetime.now(timezone.utc).isoformat()
+        plan.mark_updated()
         logger.info(f"Plan {plan_id} approved")
         return plan
 
@@ -240,11 +406,11 @@ class PlanExecutor:
             raise ValueError(f"Plan {plan_id} not found")
 
         plan.status = PlanStatus.CANCELLED
-        plan.updated_at = datetime.now(timezone.utc).isoformat()
+        plan.mark_updated()
         logger.info(f"Plan {plan_id} cancelled")
         try:
             from core.work_registry import work_registry
-            await work_registry.update(plan_id, "cancelled")
+            work_registry.update_later(plan_id, "cancelled")
         except Exception:
             pass
         return plan
@@ -255,18 +421,18 @@ class PlanExecutor:
         if not plan:
             raise ValueError(f"Plan {plan_id} not found")
 
-        step = next((s for s in plan.steps if s.id == step_id), None)
+        step = plan._step_index.get(step_id)
         if not step:
             raise ValueError(f"Step {step_id} not found in plan {plan_id}")
 
         step.status = StepStatus.RUNNING
-        step.started_at = datetime.now(timezone.utc).isoformat()
+        step.started_at = time.time_ns()
         plan.status = PlanStatus.EXECUTING
-        plan.updated_at = datetime.now(timezone.utc).isoformat()
+        plan.mark_updated()
         try:
             from core.work_registry import work_registry
-            await work_registry.update(f"{plan_id}/{step_id}", "running")
-            await work_registry.update(plan_id, "running")
+            work_registry.update_later(f"{plan_id}/{step_id}", "running")
+            work_registry.update_later(plan_id, "running")
         except Exception:
             pass
         return step
@@ -277,25 +443,30 @@ class PlanExecutor:
         if not plan:
             raise ValueError(f"Plan {plan_id} not found")
 
-        step = next((s for s in plan.steps if s.id == step_id), None)
+        step = plan._step_index.get(step_id)
         if not step:
             raise ValueError(f"Step {step_id} not found")
 
+        # A repeat completion (API retry, double click) must not release
+        # dependents a second time
+        if step.status not in (StepStatus.COMPLETED, StepStatus.SKIPPED):
+            plan._unfinished -= 1
+            plan._release(step_id)
         step.status = StepStatus.COMPLETED
         step.result = result
-        step.completed_at = datetime.now(timezone.utc).isoformat()
-        plan.updated_at = datetime.now(timezone.utc).isoformat()
+        step.completed_at = time.time_ns()
+        plan.mark_updated()
 
         # Check if all steps are done
-        if all(s.status in (StepStatus.COMPLETED, StepStatus.SKIPPED) for s in plan.steps):
+        if plan._unfinished == 0:
             plan.status = PlanStatus.COMPLETED
             logger.info(f"Plan {plan_id} completed")
 
         try:
             from core.work_registry import work_registry
-            await work_registry.update(f"{plan_id}/{step_id}", "completed")
+            work_registry.update_later(f"{plan_id}/{step_id}", "completed")
             if plan.status == PlanStatus.COMPLETED:
-                await work_registry.update(plan_id, "completed")
+                work_registry.update_later(plan_id, "completed")
         except Exception:
             pass
 
@@ -307,29 +478,115 @@ class PlanExecutor:
         if not plan:
             raise ValueError(f"Plan {plan_id} not found")
 
-        step = next((s for s in plan.steps if s.id == step_id), None)
+        step = plan._step_index.get(step_id)
         if not step:
             raise ValueError(f"Step {step_id} not found")
 
         step.status = StepStatus.FAILED
         step.error = error
-        step.completed_at = datetime.now(timezone.utc).isoformat()
+        step.completed_at = time.time_ns()
         plan.status = PlanStatus.FAILED
-        plan.updated_at = datetime.now(timezone.utc).isoformat()
+        plan.mark_updated()
         logger.warning(f"Plan {plan_id} step {step_id} failed: {error}")
         try:
             from core.work_registry import work_registry
-            await work_registry.update(f"{plan_id}/{step_id}", "failed", {"error": error})
-            await work_registry.update(plan_id, "failed")
+            work_registry.update_later(f"{plan_id}/{step_id}", "failed", {"error": error})
+            work_registry.update_later(plan_id, "failed")
         except Exception:
             pass
         return step
 
+    def ready_steps(self, plan_id: str) -> list[PlanStep]:
+        """Return pending steps whose dependencies have all completed."""
+        plan = _plans.get(plan_id)
+        if not plan:
+            raise ValueError(f"Plan {plan_id} not found")
+        return [s for s in plan.steps if plan._indegree[s.id] == 0 and s.status == StepStatus.PENDING]
+
+    async def run_plan(
+        self,
+        plan_id: str,
+        execute: Callable[[PlanStep], Awaitable[str]],
+        max_concurrent: Optional[int] = None,
+    ) -> Plan:
+        """Execute a plan, running every ready step concurrently.
+
+        ``execute`` performs one step and returns its result text; raising
+        marks the step (and plan) failed. Each step is dispatched the moment
+        its own dependencies complete — there is no per-level barrier, so a
+        slow step only delays the steps that actually depend on it.
+
+        Ready steps are started highest ``rank`` first (longest remaining
+        critical path), which matters when ``max_concurrent`` caps how many
+        steps run at once.
+
+        Raises CycleDetectedError if steps remain that can never become
+        ready because their dependencies form a cycle.
+        """
+        plan = _plans.get(plan_id)
+        if not plan:
+            raise ValueError(f"Plan {plan_id} not found")
+
+        ready: asyncio.PriorityQueue[tuple[float, str, PlanStep]] = asyncio.PriorityQueue()
+        for step in self.ready_steps(plan_id):
+            ready.put_nowait((-step.rank, step.id, step))
+
+        dispatched: set[str] = set()
+        running: set[asyncio.Task] = set()
+        try:
+            while True:
+                while (
+                    not ready.empty()
+                    and (max_concurrent is None or len(running) < max_concurrent)
+                    and plan.status not in (PlanStatus.FAILED, PlanStatus.CANCELLED)
+                ):
+                    _, step_id, step = ready.get_nowait()
+                    if step_id in dispatched:
+                        continue
+                    dispatched.add(step_id)
+                    running.add(asyncio.create_task(self._execute_step(plan, step, execute, ready)))
+                if not running:
+                    break
+                done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task.result()  # Re-raise bookkeeping errors from the step
+        finally:
+            # Cancelled or failed: don't leave steps running behind our back
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        if plan.status not in (PlanStatus.FAILED, PlanStatus.CANCELLED):
+            blocked = [s.id for s in plan.steps if s.status == StepStatus.PENDING]
+            if blocked:
+                raise CycleDetectedError(f"Plan {plan_id} has a dependency cycle among steps {blocked}")
+        return plan
+
+    async def _execute_step(
+        self,
+        plan: Plan,
+        step: PlanStep,
+        execute: Callable[[PlanStep], Awaitable[str]],
+        ready: asyncio.PriorityQueue[tuple[float, str, PlanStep]],
+    ) -> None:
+        """Run one step, then queue any dependents it was the last blocker for."""
+        await self.start_step(plan.id, step.id)
+        try:
+            result = await execute(step)
+        except Exception as e:
+            await self.fail_step(plan.id, step.id, error=str(e))
+            return
+        await self.complete_step(plan.id, step.id, result=result or "")
+        for dep_id in plan._dependents[step.id]:
+            if plan._indegree[dep_id] == 0:
+                dep = plan._step_index[dep_id]
+                ready.put_nowait((-dep.rank, dep_id, dep))
+
     def get_plan(self, plan_id: str) -> Optional[Plan]:
         return _plans.get(plan_id)
 
     def list_plans(self, conv_id: str = "") -> list[dict]:
-        plans = _plans.values()
-        if conv_id:
-            plans = [p for p in plans if p.conv_id == conv_id]
-        return [p.to_dict() for p in sorted(plans, key=lambda p: p.created_at, reverse=True)]
+        """Return plans newest first, optionally only those for ``conv_id``."""
+        plan_ids = _plans_by_conv.get(conv_id, []) if conv_id else _plans
+        return [_plans[pid].to_dict() for pid in reversed(plan_ids)]
@@ -17,11 +17,18 @@ Lifecycle:
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
 import re
 import time
+from bisect import bisect_right
+from collections import OrderedDict
+from itertools import accumulate
 from typing import Any, Optional
 
+import numpy as np
+
 logger = logging.getLogger("nexus.rag")
 
 # Model-aware context budgets (chars, not tokens)
@@ -42,6 +49,35 @@ MEMORY_TYPE_FACT = "fact"
 MIN_TEXT_LENGTH = 50          # Ignore very short snippets
 MAX_SIMILARITY_SCORE = 0.85   # Cosine distance — lower is more similar
 MIN_INGEST_LENGTH = 100       # Don't ingest messages shorter than this
+INGEST_CONCURRENCY = 16       # Max concurrent store_memory calls per document
+LARGE_DOCUMENT_CHARS = 200_000  # Chunk documents above this size in a worker thread
+
+# Ingest dedup
+INGEST_DEDUP_SIZE = 4096           # Recent exchange digests remembered
+
+# Retrieval cache
+RETRIEVE_CACHE_SIZE = 256          # Exact-match entries
+RETRIEVE_CACHE_TTL = 120           # Seconds before a cached retrieval goes stale
+SEMANTIC_CACHE_SIZE = 64           # Recent query vectors kept for near-duplicate hits
+SEMANTIC_CACHE_THRESHOLD = 0.97    # Cosine similarity needed to reuse a result
+
+# Patterns used by _extract_key_content, compiled once at import
+_LONG_CODE_BLOCK_RE = re.compile(r"```[\s\S]{500,}?```")
+_TOOL_CALL_RE = re.compile(r"<tool_call>[\s\S]*?</tool_call>")
+_TOOL_RESULT_RE = re.compile(r"<tool_result>[\s\S]*?</tool_result>")
+_EXCESS_NEWLINES_RE = re.compile(r"\n{3,}")
+
+# Chunk boundary patterns (lookahead so overlapping "\n\n\n" runs all match)
+_PARA_BREAK_RE = re.compile(r"(?=\n\n)")
+_SENTENCE_BREAK_RE = re.compile(r"[.!?] ")
+
+
+def _last_break(offsets: list[int], lo: int, hi: int) -> int:
+    """Return the largest offset in ``[lo, hi]`` from a sorted list, or -1."""
+    i = bisect_right(offsets, hi) - 1
+    if i >= 0 and offsets[i] >= lo:
+        return offsets[i]
+    return -1
 
 
 class RAGPipeline:
@@ -72,6 +108,18 @@ class RAGPipeline:
         self._total_retrieve_ms = 0
         self._total_ingest_ms = 0
 
+        # Retrieval cache: exact LRU on the query, plus a semantic ring
+        # buffer of recent query vectors for near-duplicate questions
+        self._exact_cache: OrderedDict[tuple, tuple[str, float]] = OrderedDict()
+        self._sem_vecs: Any = None
+        self._sem_entries: list[Optional[tuple]] = []
+        self._sem_next = 0
+        self._cache_hits = 0
+
+        # Recently ingested exchanges: content digest -> memory ID
+        self._ingest_seen: OrderedDict[bytes, str] = OrderedDict()
+        self._duplicate_ingests = 0
+
     @property
     def is_active(self) -> bool:
         """Check if RAG pipeline is operational."""
@@ -109,68 +157,184 @@ class RAGPipeline:
             return ""
 
         start = time.time()
+        cache_key = (
+            hashlib.blake2b(query.encode(), digest_size=16).digest(),
+            model,
+            limit,
+            tuple(memory_types) if memory_types else None,
+            source_conv,
+        )
+        cached = self._exact_cache_get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
             # 1. Embed the query
             query_embedding = await self.embeddings.embed(query)
             if query_embedding is None:
                 return ""
 
-            # 2. Search memory index
-            results = await self.cluster.search_memory(
-                query_embedding, limit=limit * 2  # Fetch extra for filtering
+            query_vec = np.asarray(query_embedding, dtype=np.float32)
+            norm = float(np.linalg.norm(query_vec))
+            if norm > 0:
+                query_vec = query_vec / norm
+                cached = self._semantic_cache_get(cache_key[1:], query_vec)
+                if cached is not None:
+                    self._exact_cache_put(cache_key, cached)
+                    return cached
+
+            # 2-5. Search, filter and format
+            formatted, count = await self._search_and_format(
+                query_embedding, model, limit, memory_types, source_conv,
             )
 
-            if not results:
-                return ""
-
-            # 3. Filter and rank
-            filtered = []
-            for r in results:
-                # Skip low-quality matches
-                score = r.get("score", 1.0)
-                if score > MAX_SIMILARITY_SCORE:
-                    continue
-
-                # Filter by memory type if specified
-                if memory_types and r.get("memory_type") not in memory_types:
-                    continue
-
-                # Filter by source conversation if specified
-                if source_conv and r.get("source_conv") == source_conv:
-                    # Skip results from the SAME conversation (already in context)
-                    continue
-
-                text = r.get("text", "")
-                if len(text) < MIN_TEXT_LENGTH:
-                    continue
-
-                filtered.append(r)
-
-            if not filtered:
-                return ""
-
-            # 4. Truncate to limit
-            filtered = filtered[:limit]
-
-            # 5. Format for the model's context budget
-            max_chars = RAG_CONTEXT_LIMITS.get(model, RAG_CONTEXT_LIMITS["ollama"])
-            formatted = self._format_results(filtered, max_chars)
-
             self._total_retrievals += 1
             self._total_retrieve_ms += int((time.time() - start) * 1000)
 
             if formatted:
                 logger.debug(
-                    f"RAG retrieved {len(filtered)} results for query "
+                    f"RAG retrieved {count} results for query "
                     f"({len(formatted)} chars, {int((time.time() - start) * 1000)}ms)"
                 )
 
+            self._exact_cache_put(cache_key, formatted)
+            if norm > 0:
+                self._semantic_cache_put(cache_key[1:], query_vec, formatted)
             return formatted
 
         except Exception as e:
             logger.warning(f"RAG retrieval error: {e}")
             return ""
 
+    async def _search_and_format(
+        self,
+        query_embedding: list[float],
+        model: str,
+        limit: int,
+        memory_types: list[str] | None,
+        source_conv: str,
+    ) -> tuple[str, int]:
+        """Search the memory index and format the surviving results.
+
+        Returns:
+            (formatted context, number of results used)
+        """
+        # 2. Search memory index
+        results = await self.cluster.search_memory(
+            query_embedding, limit=limit * 2  # Fetch extra for filtering
+        )
+
+        if not results:
+            return "", 0
+
+        # 3. Filter and rank
+        filtered = []
+        for r in results:
+            # Skip low-quality matches
+            score = r.get("score", 1.0)
+            if score > MAX_SIMILARITY_SCORE:
+                continue
+
+            # Filter by memory type if specified
+            if memory_types and r.get("memory_type") not in memory_types:
+                continue
+
+            # Filter by source conversation if specified
+            if source_conv and r.get("source_conv") == source_conv:
+                # Skip results from the SAME conversation (already in context)
+                continue
+
+            text = r.get("text", "")
+            if len(text) < MIN_TEXT_LENGTH:
+                continue
+
+            filtered.append(r)
+
+        if not filtered:
+            return "", 0
+
+        # 4. Truncate to limit
+        filtered = filtered[:limit]
+
+        # 5. Format for the model's context budget
+        max_chars = RAG_CONTEXT_LIMITS.get(model, RAG_CONTEXT_LIMITS["ollama"])
+        return self._format_results(filtered, max_chars), len(filtered)
+
+    # ── Ingest dedup ─────────────────────────────────────────────
+
+    def _seen_ingest(self, digest: bytes) -> Optional[str]:
+        """Memory ID of this exact exchange if it was ingested recently."""
+        memory_id = self._ingest_seen.get(digest)
+        if memory_id is not None:
+            self._ingest_seen.move_to_end(digest)
+            self._duplicate_ingests += 1
+        return memory_id
+
+    def _remember_ingest(self, digest: bytes, memory_id: str) -> None:
+        self._ingest_seen[digest] = memory_id
+        self._ingest_seen.move_to_end(digest)
+        if len(self._ingest_seen) > INGEST_DEDUP_SIZE:
+            self._ingest_seen.popitem(last=False)
+
+    # ── Retrieval cache ──────────────────────────────────────────
+
+    def _exact_cache_get(self, key: tuple) -> Optional[str]:
+        entry = self._exact_cache.get(key)
+        if entry is None:
+            return None
+        formatted, ts = entry
+        if time.time() - ts >= RETRIEVE_CACHE_TTL:
+            del self._exact_cache[key]
+            return None
+        self._exact_cache.move_to_end(key)
+        self._cache_hits += 1
+        return formatted
+
+    def _exact_cache_put(self, key: tuple, formatted: str) -> None:
+        self._exact_cache[key] = (formatted, time.time())
+        self._exact_cache.move_to_end(key)
+        if len(self._exact_cache) > RETRIEVE_CACHE_SIZE:
+            self._exact_cache.popitem(last=False)
+
+    def _semantic_cache_get(self, params: tuple, query_vec: Any) -> Optional[str]:
+        """Return a cached result for a near-identical query with the same params."""
+        if self._sem_vecs is None or self._sem_vecs.shape[1] != query_vec.shape[0]:
+            return None
+
+        sims = self._sem_vecs @ query_vec
+        now = time.time()
+        for i in np.argsort(-sims):
+            if sims[i] < SEMANTIC_CACHE_THRESHOLD:
+                break
+            entry = self._sem_entries[i]
+            if entry is None or entry[0] != params:
+                continue
+            if now - entry[2] >= RETRIEVE_CACHE_TTL:
+                continue
+            self._cache_hits += 1
+            return entry[1]
+        return None
+
+    def _semantic_cache_put(self, params: tuple, query_vec: Any, formatted: str) -> None:
+        """Record a result in the semantic ring buffer (unit-norm query vectors)."""
+        dims = query_vec.shape[0]
+        if self._sem_vecs is None or self._sem_vecs.shape[1] != dims:
+            self._sem_vecs = np.zeros((SEMANTIC_CACHE_SIZE, dims), dtype=np.float32)
+            self._sem_entries = [None] * SEMANTIC_CACHE_SIZE
+            self._sem_next = 0
+
+        slot = self._sem_next
+        self._sem_vecs[slot] = query_vec
+        self._sem_entries[slot] = (params, formatted, time.time())
+        self._sem_next = (slot + 1) % SEMANTIC_CACHE_SIZE
+
+    def clear_cache(self) -> None:
+        """Drop all cached retrieval results (e.g. after new documents are ingested)."""
+        self._exact_cache.clear()
+        self._sem_vecs = None
+        self._sem_entries = []
+        self._sem_next = 0
+
     async def ingest_conversation(
         self,
         conv_id: str,
@@ -190,7 +354,8 @@ class RAGPipeline:
             model_used: Which model generated the response
 
         Returns:
-            Memory ID if stored, None if skipped
+            Memory ID if stored (or of the identical turn stored earlier),
+            None if skipped
         """
         if not self.is_active:
             return None
@@ -210,6 +375,14 @@ class RAGPipeline:
             if not condensed or len(condensed) < MIN_TEXT_LENGTH:
                 return None
 
+            # Skip exact repeats before paying for an embedding.  Only
+            # byte-identical turns count: near-duplicates often differ in
+            # exactly the fact worth storing ("port 5432" vs "port 6543").
+            digest = hashlib.blake2b(condensed.encode(), digest_size=16).digest()
+            seen_id = self._seen_ingest(digest)
+            if seen_id is not None:
+                return seen_id
+
             # Generate embedding for the condensed text
             embedding = await self.embeddings.embed(condensed)
             if embedding is None:
@@ -227,6 +400,7 @@ class RAGPipeline:
             self._total_ingest_ms += int((time.time() - start) * 1000)
 
             if memory_id:
+                self._remember_ingest(digest, memory_id)
                 logger.debug(f"RAG ingested conversation turn ({len(condensed)} chars, {conv_id[:8]})")
 
             return memory_id
@@ -265,33 +439,52 @@ class RAGPipeline:
             return []
 
         try:
-            # Chunk the document
-            chunks = self._chunk_text(text, chunk_size, chunk_overlap)
+            # Chunk the document (large ones off the event loop)
+            if len(text) > LARGE_DOCUMENT_CHARS:
+                chunks = await asyncio.to_thread(
+                    self._chunk_text, text, chunk_size, chunk_overlap,
+                )
+            else:
+                chunks = self._chunk_text(text, chunk_size, chunk_overlap)
             if not chunks:
                 return []
 
             # Batch embed all chunks
             embeddings = await self.embeddings.embed_batch(chunks)
 
-            # Store each chunk
-            memory_ids: list[str] = []
-            for i, (chunk, embedding) in enumerate(zip(chunks, embeddings)):
-                if embedding is None:
-                    continue
+            # Store chunks concurrently, bounded so the vector store isn't flooded
+            semaphore = asyncio.Semaphore(INGEST_CONCURRENCY)
 
+            async def _store(chunk: str, embedding: list[float]) -> Optional[str]:
                 # Add source metadata to chunk
-                chunk_text = chunk
-                if source:
-                    chunk_text = f"[Source: {source}]\n{chunk}"
-
-                mid = await self.cluster.store_memory(
-                    text=chunk_text,
-                    embedding=embedding,
-                    memory_type=memory_type,
-                    source_conv=source,
-                )
-                if mid:
-                    memory_ids.append(mid)
+                chunk_text = f"[Source: {source}]\n{chunk}" if source else chunk
+                async with semaphore:
+                    return await self.cluster.store_memory(
+                        text=chunk_text,
+                        embedding=embedding,
+                        memory_type=memory_type,
+                        source_conv=source,
+                    )
+
+            results = await asyncio.gather(
+                *(
+                    _store(chunk, embedding)
+                    for chunk, embedding in zip(chunks, embeddings)
+                    if embedding is not None
+                ),
+                return_exceptions=True,
+            )
+
+            memory_ids: list[str] = []
+            for result in results:
+                if isinstance(result, BaseException):
+                    logger.warning(f"RAG chunk store error: {result}")
+                elif result:
+                    memory_ids.append(result)
+
+            if memory_ids:
+                # New documents can change what earlier queries should see
+                self.clear_cache()
 
             logger.info(f"RAG ingested document: {len(memory_ids)}/{len(chunks)} chunks from {source}")
             return memory_ids
@@ -350,26 +543,15 @@ class RAGPipeline:
             return ""
 
         # Remove very long code blocks (keep short ones)
-        cleaned = re.sub(
-            r"```[\s\S]{500,}?```",
-            "[code block omitted]",
-            text,
-        )
+        cleaned = _LONG_CODE_BLOCK_RE.sub("[code block omitted]", text)
 
         # Remove tool call/result blocks
-        cleaned = re.sub(
-            r"<tool_call>[\s\S]*?</tool_call>",
-            "",
-            cleaned,
-        )
-        cleaned = re.sub(
-            r"<tool_result>[\s\S]*?</tool_result>",
-            "",
-            cleaned,
-        )
+        if "<tool_" in cleaned:
+            cleaned = _TOOL_CALL_RE.sub("", cleaned)
+            cleaned = _TOOL_RESULT_RE.sub("", cleaned)
 
         # Remove excessive whitespace
-        cleaned = re.sub(r"\n{3,}", "\n\n", cleaned).strip()
+        cleaned = _EXCESS_NEWLINES_RE.sub("\n\n", cleaned).strip()
 
         if len(cleaned) > max_chars:
             # Truncate at paragraph boundary
@@ -392,82 +574,77 @@ class RAGPipeline:
         if len(text) <= chunk_size:
             return [text.strip()] if text.strip() else []
 
+        # Precompute break offsets once so each chunk boundary is a bisect
+        # instead of repeated rfind scans over a sliced window.
+        para_breaks = [m.start() for m in _PARA_BREAK_RE.finditer(text)]
+        sent_breaks = [m.start() for m in _SENTENCE_BREAK_RE.finditer(text)]
+
         chunks: list[str] = []
         start = 0
+        text_len = len(text)
 
-        while start < len(text):
-            end = min(start + chunk_size, len(text))
+        while start < text_len:
+            end = min(start + chunk_size, text_len)
 
-            if end < len(text):
-                # Try to find a natural break point
+            if end < text_len:
+                # Try to find a natural break point in the last 30% of the chunk
                 # Priority: paragraph > sentence > word
-                window = text[start:end]
+                zone_start = start + int((end - start) * 0.7)
 
-                # Look for paragraph break in last 30% of chunk
-                break_zone_start = int(len(window) * 0.7)
-                para_break = window.rfind("\n\n", break_zone_start)
-                if para_break > 0:
-                    end = start + para_break + 2
+                para_break = _last_break(para_breaks, zone_start, end - 2)
+                if para_break > start:
+                    end = para_break + 2
                 else:
-                    # Look for sentence break
-                    sent_break = max(
-                        window.rfind(". ", break_zone_start),
-                        window.rfind("! ", break_zone_start),
-                        window.rfind("? ", break_zone_start),
-                    )
-                    if sent_break > 0:
-                        end = start + sent_break + 2
+                    sent_break = _last_break(sent_breaks, zone_start, end - 2)
+                    if sent_break > start:
+                        end = sent_break + 2
                     else:
-                        # Look for word break
-                        word_break = window.rfind(" ", break_zone_start)
-                        if word_break > 0:
-                            end = start + word_break + 1
+                        word_break = text.rfind(" ", zone_start, end)
+                        if word_break > start:
+                            end = word_break + 1
 
             chunk = text[start:end].strip()
             if chunk and len(chunk) >= MIN_TEXT_LENGTH:
                 chunks.append(chunk)
 
             # Move start with overlap
-            start = end - overlap if end < len(text) else end
+            start = end - overlap if end < text_len else end
 
         return chunks
 
     def _format_results(self, results: list[dict], max_chars: int) -> str:
         """Format retrieved memories as markdown context.
 
-        Respects the character budget for the target model.
+        Respects the character budget for the target model. Results are
+        selected in relevance order but emitted in memory-ID order, with
+        the (drifting) relevance score on a trailing line, so the same set
+        of memories always yields the same leading bytes of prompt.
         """
         if not results:
             return ""
 
-        sections: list[str] = []
-        total_chars = 0
+        ids = [str(r.get("id", "")) for r in results]
+        bodies = [f"**[{r.get('memory_type', 'unknown')}]**\n{r.get('text', '')}" for r in results]
+        tails = [f"\n(relevance: {(1 - r.get('score', 1.0)) * 100:.0f}%)" for r in results]
 
-        for i, r in enumerate(results):
-            text = r.get("text", "")
-            score = r.get("score", 1.0)
-            memory_type = r.get("memory_type", "unknown")
-            relevance = f"{(1 - score) * 100:.0f}%"
-
-            # Format each result
-            section = f"**[{memory_type}]** (relevance: {relevance})\n{text}"
-
-            # Check budget
-            if total_chars + len(section) + 10 > max_chars:
-                # Truncate this section to fit
-                remaining = max_chars - total_chars - 50
-                if remaining > MIN_TEXT_LENGTH:
-                    section = section[:remaining] + "..."
-                    sections.append(section)
-                break
+        # Running total after each section (+5 for separators); the first
+        # section that would take the total within 5 chars of the budget
+        # is the cut point.
+        totals = list(accumulate(len(b) + len(t) + 5 for b, t in zip(bodies, tails)))
+        cut = bisect_right(totals, max_chars - 5)
 
-            sections.append(section)
-            total_chars += len(section) + 5  # +5 for separators
+        selected = [(ids[i], bodies[i] + tails[i]) for i in range(cut)]
+        if cut < len(results):
+            # Truncate the first section that doesn't fit
+            remaining = max_chars - (totals[cut - 1] if cut else 0) - 50 - len(tails[cut])
+            if remaining > MIN_TEXT_LENGTH:
+                selected.append((ids[cut], bodies[cut][:remaining] + "..." + tails[cut]))
 
-        if not sections:
+        if not selected:
             return ""
 
-        return "\n\n---\n\n".join(sections)
+        selected.sort(key=lambda item: item[0])
+        return "\n\n---\n\n".join(section for _, section in selected)
 
     def get_stats(self) -> dict:
         """Get pipeline statistics."""
@@ -485,6 +662,8 @@ class RAGPipeline:
             "active": self.is_active,
             "total_retrievals": self._total_retrievals,
             "total_ingests": self._total_ingests,
+            "cache_hits": self._cache_hits,
+            "duplicate_ingests": self._duplicate_ingests,
             "avg_retrieve_ms": round(avg_retrieve, 1),
             "avg_ingest_ms": round(avg_ingest, 1),
             "embedding": self.embeddings.get_stats() if self.embeddings else None,
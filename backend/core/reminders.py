@@ -12,27 +12,54 @@ The reminder loop runs as part of the TaskQueue scheduler.
 from __future__ import annotations
 
 import asyncio
+import heapq
 import logging
 import re
+import time
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
 from typing import Any, Callable, Optional
 
+from core.work_registry import work_registry
+
+# parse_and_add() runs on user chat text; use RE2's linear-time matcher
+# when the google-re2 bindings are installed
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
 logger = logging.getLogger("nexus.reminders")
 
+# Rebuild the heap once this many cancelled entries linger in it and
+# they make up more than half of it (cf. asyncio's cancelled-timer purge)
+_MIN_CANCELLED_FOR_COMPACTION = 50
+
+# parse_and_add patterns
+_re = re2 if RE2_AVAILABLE else re
+_IN_RE = _re.compile(r"in\s+(\d+)\s+(minute|hour|day|second)s?")
+_EVERY_RE = _re.compile(r"every\s+(\d+)\s+(minute|hour|day)s?")
+_MSG_PREFIX_RE = _re.compile(r"^(to|that|about)\s+")
+
 
 @dataclass
 class Reminder:
     id: str
     message: str
-    trigger_at: datetime
+    # Deadline as epoch seconds; the loop compares against time.time()
+    trigger_at_epoch: float
     conv_id: str = ""
     recurring: bool = False
     interval_seconds: int = 0
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     fired: bool = False
 
+    @property
+    def trigger_at(self) -> datetime:
+        return datetime.fromtimestamp(self.trigger_at_epoch, tz=timezone.utc)
+
     def to_dict(self) -> dict:
         return {
             "id": self.id,
@@ -56,17 +83,36 @@ class ReminderManager:
                      Signature: async (reminder: Reminder) -> None
         """
         self._reminders: dict[str, Reminder] = {}
+        # Min-heap of (trigger_at_epoch, reminder id); see _check_loop
+        self._heap: list[tuple[float, str]] = []
+        self._cancelled_count = 0
+        # list_active() result, reset whenever the schedule changes
+        self._active_cache: Optional[list[dict]] = None
+        self._wake = asyncio.Event()
         self._on_fire = on_fire
         self._task: Optional[asyncio.Task] = None
         self._running = False
 
     def start(self):
-        """Start the reminder check loop."""
+        """Start the reminder manager.
+
+        The check loop task itself is created lazily by the first add(),
+        so an idle manager costs nothing.
+        """
         if not self._running:
             self._running = True
-            self._task = asyncio.create_task(self._check_loop())
+            if self._reminders:
+                self._ensure_loop()
             logger.info("Reminder manager started")
 
+    def _ensure_loop(self) -> None:
+        """Create the check loop task if running and not already started."""
+        if self._running and (self._task is None or self._task.done()):
+            try:
+                self._task = asyncio.get_running_loop().create_task(self._check_loop())
+            except RuntimeError:
+                pass  # No event loop yet — start() will pick it up
+
     def stop(self):
         """Stop the reminder check loop."""
         self._running = False
@@ -74,29 +120,74 @@ class ReminderManager:
             self._task.cancel()
 
     async def _check_loop(self):
-        """Background loop — checks every 15 seconds for due reminders."""
+        """Background loop — sleeps until the earliest reminder is due.
+
+        ``_heap`` holds ``(trigger_at_epoch, reminder id)`` tuples.
+        Entries for cancelled or rescheduled reminders are left in place
+        and skipped when popped. ``_wake`` is set whenever the schedule
+        changes so the sleep is re-evaluated.
+        """
         while self._running:
             try:
-                now = datetime.now(timezone.utc)
-                for reminder in list(self._reminders.values()):
-                    if reminder.fired and not reminder.recurring:
-                        continue
-                    if now >= reminder.trigger_at:
-                        await self._fire(reminder)
-                await asyncio.sleep(15)
+                now = time.time()
+                while self._heap and self._heap[0][0] <= now:
+                    due_at, reminder_id = heapq.heappop(self._heap)
+                    reminder = self._reminders.get(reminder_id)
+                    if reminder is None:
+                        self._cancelled_count = max(0, self._cancelled_count - 1)
+                        continue  # Cancelled — stale entry
+                    if reminder.trigger_at_epoch != due_at:
+                        continue  # Rescheduled — stale entry
+                    await self._fire(reminder)
+
+                try:
+                    if self._heap:
+                        timeout = self._heap[0][0] - time.time()
+                        await asyncio.wait_for(self._wake.wait(), timeout)
+                    else:
+                        # Nothing scheduled — park until add() wakes us
+                        await self._wake.wait()
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    self._wake.clear()
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Reminder loop error: {e}")
                 await asyncio.sleep(30)
 
+    def _schedule(self, reminder: Reminder) -> None:
+        """Queue a reminder's next trigger time.
+
+        The check loop is only woken when this becomes the earliest
+        deadline; otherwise its current sleep already ends early enough.
+        """
+        self._active_cache = None
+        entry = (reminder.trigger_at_epoch, reminder.id)
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] == entry:
+            self._wake.set()
+
+    def _compact_heap(self) -> None:
+        """Drop cancelled entries once they dominate the heap."""
+        if (
+            self._cancelled_count > _MIN_CANCELLED_FOR_COMPACTION
+            and self._cancelled_count > len(self._heap) // 2
+        ):
+            self._heap = [e for e in self._heap if e[1] in self._reminders]
+            heapq.heapify(self._heap)
+            self._cancelled_count = 0
+
     async def _fire(self, reminder: Reminder):
         """Fire a reminder — invoke callback and handle recurrence."""
         logger.info(f"Reminder fired: {reminder.id} - {reminder.message}")
         reminder.fired = True
+        self._active_cache = None
         try:
-            from core.work_registry import work_registry
-            await work_registry.update(reminder.id, "completed")
+            # Queued for the registry's batched flusher so the check loop
+            # never waits on the DB write
+            work_registry.update_later(reminder.id, "completed")
         except Exception:
             pass
 
@@ -108,12 +199,14 @@ class ReminderManager:
 
         if reminder.recurring and reminder.interval_seconds > 0:
             # Reschedule for next occurrence
-            reminder.trigger_at = datetime.now(timezone.utc) + timedelta(seconds=reminder.interval_seconds)
+            reminder.trigger_at_epoch = time.time() + reminder.interval_seconds
             reminder.fired = False
+            self._schedule(reminder)
             logger.info(f"Recurring reminder {reminder.id} rescheduled for {reminder.trigger_at}")
         else:
             # One-shot — remove after firing
             self._reminders.pop(reminder.id, None)
+            self._active_cache = None
 
     def add(
         self,
@@ -128,17 +221,17 @@ class ReminderManager:
         reminder = Reminder(
             id=reminder_id,
             message=message,
-            trigger_at=trigger_at,
+            trigger_at_epoch=trigger_at.timestamp(),
             conv_id=conv_id,
             recurring=recurring,
             interval_seconds=interval_seconds,
         )
         self._reminders[reminder_id] = reminder
+        self._schedule(reminder)
+        self._ensure_loop()
         logger.info(f"Reminder added: {reminder_id} at {trigger_at} — '{message}'")
         try:
-            import asyncio as _aio
-            loop = _aio.get_running_loop()
-            from core.work_registry import work_registry
+            loop = asyncio.get_running_loop()
             loop.create_task(work_registry.register(
                 reminder_id, "reminder", message,
                 status="pending", conv_id=conv_id,
@@ -151,26 +244,32 @@ class ReminderManager:
     def cancel(self, reminder_id: str) -> bool:
         """Cancel a reminder."""
         if reminder_id in self._reminders:
+            # Left in the heap and skipped when popped; see _compact_heap
             del self._reminders[reminder_id]
+            self._active_cache = None
+            self._cancelled_count += 1
+            self._compact_heap()
+            self._wake.set()
             logger.info(f"Reminder cancelled: {reminder_id}")
             try:
-                import asyncio as _aio
-                loop = _aio.get_running_loop()
-                from core.work_registry import work_registry
-                loop.create_task(work_registry.update(reminder_id, "cancelled"))
+                work_registry.update_later(reminder_id, "cancelled")
             except RuntimeError:
-                pass
+                pass  # No event loop — nothing to flush the update
             return True
         return False
 
     def list_active(self) -> list[dict]:
         """List all active (non-fired) reminders."""
-        now = datetime.now(timezone.utc)
-        return [
-            r.to_dict()
-            for r in sorted(self._reminders.values(), key=lambda r: r.trigger_at)
-            if not r.fired or r.recurring
-        ]
+        if self._active_cache is None:
+            # Heap entries already carry the sort key; stale ones (cancelled
+            # or superseded by a reschedule) are filtered out here.
+            active = []
+            for due_at, reminder_id in sorted(self._heap):
+                r = self._reminders.get(reminder_id)
+                if r is not None and r.trigger_at_epoch == due_at and (not r.fired or r.recurring):
+                    active.append(r.to_dict())
+            self._active_cache = active
+        return list(self._active_cache)
 
     def parse_and_add(self, text: str, conv_id: str = "") -> Optional[Reminder]:
         """Parse natural language reminder text and create a reminder.
@@ -187,7 +286,7 @@ class ReminderManager:
         now = datetime.now(timezone.utc)
 
         # "in X minutes/hours/days"
-        match = re.search(r"in\s+(\d+)\s+(minute|hour|day|second)s?", text_lower)
+        match = _IN_RE.search(text_lower)
         if match:
             amount = int(match.group(1))
             unit = match.group(2)
@@ -200,14 +299,14 @@ class ReminderManager:
 
             # Extract message (everything after the time spec)
             msg = text_lower.split(match.group(0))[-1].strip()
-            msg = re.sub(r"^(to|that|about)\s+", "", msg).strip()
+            msg = _MSG_PREFIX_RE.sub("", msg).strip()
             if not msg:
                 msg = "Reminder"
 
             return self.add(msg, now + delta, conv_id=conv_id)
 
         # "every X hours/minutes"
-        match = re.search(r"every\s+(\d+)\s+(minute|hour|day)s?", text_lower)
+        match = _EVERY_RE.search(text_lower)
         if match:
             amount = int(match.group(1))
             unit = match.group(2)
@@ -218,7 +317,7 @@ class ReminderManager:
             }.get(unit, 3600 * amount)
 
             msg = text_lower.split(match.group(0))[-1].strip()
-            msg = re.sub(r"^(to|that|about)\s+", "", msg).strip()
+            msg = _MSG_PREFIX_RE.sub("", msg).strip()
             if not msg:
                 msg = "Recurring reminder"
 
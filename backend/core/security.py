@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import functools
 import os
 from collections.abc import Sequence
 
@@ -10,15 +11,35 @@ from core.exceptions import PathAccessDeniedError
 # Populated at startup from app factory
 ALLOWED_DIRS: list[str] = []
 
+# realpath() of each ALLOWED_DIRS entry. Computed once by
+# init_allowed_dirs(), which must be called again if the allowed
+# directories change.
+_RESOLVED_ALLOWED_SET: frozenset[str] = frozenset()
+
+
+def _resolve_dirs(dirs: Sequence[str]) -> frozenset[str]:
+    return frozenset(os.path.realpath(d) for d in dirs)
+
+
+@functools.lru_cache(maxsize=64)
+def _resolve_dirs_cached(dirs: tuple[str, ...]) -> frozenset[str]:
+    """_resolve_dirs() memoised per caller-supplied root list.
+
+    Only allowed-dir roots are cached; the path being validated is
+    always resolved afresh.
+    """
+    return _resolve_dirs(dirs)
+
 
 def init_allowed_dirs(base_dir: str) -> list[str]:
     """Initialize and return the default allowed directories."""
-    global ALLOWED_DIRS
+    global ALLOWED_DIRS, _RESOLVED_ALLOWED_SET
     ALLOWED_DIRS = [
         os.path.join(base_dir, "data"),
         os.path.join(base_dir, "docs"),
         os.path.join(base_dir, "skills"),
     ]
+    _RESOLVED_ALLOWED_SET = _resolve_dirs(ALLOWED_DIRS)
     return ALLOWED_DIRS
 
 
@@ -28,10 +49,14 @@ def validate_path(file_path: str, allowed_dirs: Sequence[str] | None = None) ->
     Returns the resolved absolute path on success.
     Raises PathAccessDeniedError on disallowed locations.
     """
-    dirs = allowed_dirs or ALLOWED_DIRS
+    allowed = _resolve_dirs_cached(tuple(allowed_dirs)) if allowed_dirs else _RESOLVED_ALLOWED_SET
     resolved = os.path.realpath(file_path)
-    for allowed in dirs:
-        allowed_resolved = os.path.realpath(allowed)
-        if resolved == allowed_resolved or resolved.startswith(allowed_resolved + os.sep):
-            return resolved
-    raise PathAccessDeniedError(f"Path outside allowed directories: {file_path}")
+    # Walk up the (already resolved) path: one set lookup per component
+    # instead of a prefix compare per allowed directory
+    cur = resolved
+    while cur not in allowed:
+        parent = os.path.dirname(cur)
+        if parent == cur:
+            raise PathAccessDeniedError(f"Path outside allowed directories: {file_path}")
+        cur = parent
+    return resolved
@@ -4,13 +4,40 @@ Monitors skill usage, success rates, tool failures, and generates
 actionable improvement reports for the Nexus AI agent.
 """
 
+import io
 import logging
-from collections import defaultdict
-from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+import re
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 logger = logging.getLogger("nexus.core.self_improve")
 
+_SKILL_MENTION_RE = re.compile(r'skill:\s*(\w+[\w-]*)', re.IGNORECASE)
+
+# Outcome indicators, scanned case-insensitively
+_ERROR_INDICATOR_RE = re.compile(r'error:|failed|exception|timeout|not found', re.IGNORECASE)
+_OUTCOME_RE = re.compile(
+    r'(?P<ok>✅|success|completed|done)|(?P<bad>❌|error|failed|exception)',
+    re.IGNORECASE,
+)
+
+# Tool name patterns in error messages, fused into one alternation:
+# "tool X", "function X", "X failed", "error in X"
+_TOOL_NAME_RE = re.compile(
+    r'tool[_\s]+(\w+)|function[_\s]+(\w+)|(\w+)\s+failed|error in (\w+)',
+    re.IGNORECASE,
+)
+
+
+def _new_skill_stats() -> Tuple[Counter, Counter, Counter]:
+    """Per-skill (uses, successes, failures) counters."""
+    return Counter(), Counter(), Counter()
+
+
+def _new_error_patterns() -> Dict[str, Dict]:
+    return defaultdict(lambda: {"count": 0, "examples": []})
+
 
 class SelfImprovementEngine:
     """Analyze agent performance and generate improvement suggestions."""
@@ -37,56 +64,13 @@ class SelfImprovementEngine:
             List of dicts with skill_id, usage_count, success_rate, suggestion
         """
         try:
-            # Query skill usage from database
-            cutoff_date = datetime.now() - timedelta(days=days)
-            results = []
-
-            # Get all conversations with skill usage
-            conversations = await self._get_recent_conversations(cutoff_date)
-
-            # Aggregate skill usage
-            skill_stats = defaultdict(lambda: {"uses": 0, "successes": 0, "failures": 0})
-
-            for conv in conversations:
-                # Parse conversation messages for skill invocations
-                messages = conv.get("messages", [])
-                for msg in messages:
-                    content = msg.get("content", "")
-
-                    # Look for skill usage patterns (tool calls, skill mentions)
-                    skill_mentions = self._extract_skill_mentions(content)
-
-                    for skill_id in skill_mentions:
-                        skill_stats[skill_id]["uses"] += 1
-
-                        # Check if execution was successful (heuristic)
-                        if self._was_execution_successful(msg):
-                            skill_stats[skill_id]["successes"] += 1
-                        else:
-                            skill_stats[skill_id]["failures"] += 1
-
-            # Generate analysis results
-            for skill_id, stats in skill_stats.items():
-                usage_count = stats["uses"]
-                success_rate = stats["successes"] / usage_count if usage_count > 0 else 0.0
-
-                # Generate suggestion based on metrics
-                suggestion = self._generate_skill_suggestion(
-                    skill_id, usage_count, success_rate
-                )
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+            skill_stats = _new_skill_stats()
 
-                results.append({
-                    "skill_id": skill_id,
-                    "usage_count": usage_count,
-                    "success_rate": success_rate,
-                    "successes": stats["successes"],
-                    "failures": stats["failures"],
-                    "suggestion": suggestion,
-                })
-
-            # Sort by usage count descending
-            results.sort(key=lambda x: x["usage_count"], reverse=True)
+            async for msg in self._iter_recent_messages(cutoff_date):
+                self._tally_skill_usage(msg, skill_stats)
 
+            results = self._summarize_skills(skill_stats)
             logger.info(f"Analyzed {len(results)} skills over {days} days")
             return results
 
@@ -104,56 +88,13 @@ class SelfImprovementEngine:
             List of failed tool patterns with tool_name, error_type, count, suggestion
         """
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            conversations = await self._get_recent_conversations(cutoff_date)
-
-            # Track error patterns
-            error_patterns = defaultdict(lambda: {"count": 0, "examples": []})
-
-            for conv in conversations:
-                messages = conv.get("messages", [])
-                for msg in messages:
-                    content = msg.get("content", "")
-
-                    # Look for error indicators
-                    if any(indicator in content.lower() for indicator in [
-                        "error:", "failed", "exception", "timeout", "not found"
-                    ]):
-                        # Extract tool name and error type
-                        tool_name = self._extract_tool_name_from_error(content)
-                        error_type = self._classify_error(content)
-
-                        if tool_name and error_type:
-                            key = f"{tool_name}:{error_type}"
-                            error_patterns[key]["count"] += 1
-
-                            # Keep example (limit to 3 per pattern)
-                            if len(error_patterns[key]["examples"]) < 3:
-                                error_patterns[key]["examples"].append(
-                                    content[:200]  # First 200 chars
-                                )
-
-            # Generate failure analysis
-            results = []
-            for pattern_key, data in error_patterns.items():
-                tool_name, error_type = pattern_key.split(":", 1)
-                count = data["count"]
-
-                suggestion = self._generate_failure_suggestion(
-                    tool_name, error_type, count
-                )
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+            error_patterns = _new_error_patterns()
 
-                results.append({
-                    "tool_name": tool_name,
-                    "error_type": error_type,
-                    "count": count,
-                    "examples": data["examples"],
-                    "suggestion": suggestion,
-                })
-
-            # Sort by count descending
-            results.sort(key=lambda x: x["count"], reverse=True)
+            async for msg in self._iter_recent_messages(cutoff_date):
+                self._tally_tool_failure(msg, error_patterns)
 
+            results = self._summarize_failures(error_patterns)
             logger.info(f"Analyzed {len(results)} error patterns over {days} days")
             return results
 
@@ -161,6 +102,127 @@ class SelfImprovementEngine:
             logger.error(f"Failed to analyze tool failures: {e}")
             return []
 
+    async def analyze_all(self, days: int = 7) -> Tuple[List[Dict], List[Dict]]:
+        """Run the skill and tool-failure analyses in a single pass.
+
+        Streams recent messages once and feeds every message to both
+        tallies, instead of each analyzer querying and iterating separately.
+
+        Returns:
+            (skill analysis, failure analysis) — same shapes as
+            analyze_skill_performance() and analyze_tool_failures()
+        """
+        try:
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+            skill_stats = _new_skill_stats()
+            error_patterns = _new_error_patterns()
+
+            async for msg in self._iter_recent_messages(cutoff_date):
+                self._tally_skill_usage(msg, skill_stats)
+                self._tally_tool_failure(msg, error_patterns)
+
+            skill_results = self._summarize_skills(skill_stats)
+            failure_results = self._summarize_failures(error_patterns)
+            logger.info(
+                f"Analyzed {len(skill_results)} skills and "
+                f"{len(failure_results)} error patterns over {days} days"
+            )
+            return skill_results, failure_results
+
+        except Exception as e:
+            logger.error(f"Failed to analyze recent conversations: {e}")
+            return [], []
+
+    def _tally_skill_usage(
+        self, msg: Dict, skill_stats: Tuple[Counter, Counter, Counter]
+    ) -> None:
+        """Count skill invocations (and their outcome) in one message."""
+        content = msg.get("content", "")
+
+        # Look for skill usage patterns (tool calls, skill mentions)
+        skill_mentions = self._extract_skill_mentions(content)
+        if not skill_mentions:
+            return
+
+        # Check if execution was successful (heuristic)
+        uses, successes, failures = skill_stats
+        uses.update(skill_mentions)
+        if self._was_execution_successful(msg):
+            successes.update(skill_mentions)
+        else:
+            failures.update(skill_mentions)
+
+    def _tally_tool_failure(self, msg: Dict, error_patterns: Dict[str, Dict]) -> None:
+        """Record the tool error pattern in one message, if any."""
+        content = msg.get("content", "")
+
+        # Look for error indicators
+        if not _ERROR_INDICATOR_RE.search(content):
+            return
+
+        # Extract tool name and error type
+        tool_name = self._extract_tool_name_from_error(content)
+        error_type = self._classify_error(content.lower())
+
+        if tool_name and error_type:
+            key = f"{tool_name}:{error_type}"
+            error_patterns[key]["count"] += 1
+
+            # Keep example (limit to 3 per pattern)
+            if len(error_patterns[key]["examples"]) < 3:
+                error_patterns[key]["examples"].append(
+                    content[:200]  # First 200 chars
+                )
+
+    def _summarize_skills(self, skill_stats: Tuple[Counter, Counter, Counter]) -> List[Dict]:
+        """Turn skill tallies into analysis results, most used first."""
+        uses, successes, failures = skill_stats
+        results = []
+        for skill_id, usage_count in uses.items():
+            success_count = successes[skill_id]
+            success_rate = success_count / usage_count if usage_count > 0 else 0.0
+
+            # Generate suggestion based on metrics
+            suggestion = self._generate_skill_suggestion(
+                skill_id, usage_count, success_rate
+            )
+
+            results.append({
+                "skill_id": skill_id,
+                "usage_count": usage_count,
+                "success_rate": success_rate,
+                "successes": success_count,
+                "failures": failures[skill_id],
+                "suggestion": suggestion,
+            })
+
+        # Sort by usage count descending
+        results.sort(key=lambda x: x["usage_count"], reverse=True)
+        return results
+
+    def _summarize_failures(self, error_patterns: Dict[str, Dict]) -> List[Dict]:
+        """Turn error-pattern tallies into analysis results, most frequent first."""
+        results = []
+        for pattern_key, data in error_patterns.items():
+            tool_name, error_type = pattern_key.split(":", 1)
+            count = data["count"]
+
+            suggestion = self._generate_failure_suggestion(
+                tool_name, error_type, count
+            )
+
+            results.append({
+                "tool_name": tool_name,
+                "error_type": error_type,
+                "count": count,
+                "examples": data["examples"],
+                "suggestion": suggestion,
+            })
+
+        # Sort by count descending
+        results.sort(key=lambda x: x["count"], reverse=True)
+        return results
+
     async def generate_improvement_report(self, days: int = 7) -> str:
         """Generate comprehensive improvement report.
 
@@ -170,83 +232,113 @@ class SelfImprovementEngine:
         Returns:
             Formatted markdown report with findings and suggestions
         """
-        try:
-            # Run analyses
-            skill_analysis = await self.analyze_skill_performance(days)
-            failure_analysis = await self.analyze_tool_failures(days)
+        # Run both analyses over one pass of the conversation history
+        skill_analysis, failure_analysis = await self.analyze_all(days)
+        return self.build_improvement_report(days, skill_analysis, failure_analysis)
+
+    def build_improvement_report(
+        self, days: int, skill_analysis: List[Dict], failure_analysis: List[Dict]
+    ) -> str:
+        """Format already-computed analyses as the improvement report.
 
-            # Build report
-            report = []
-            report.append(f"# 🤖 Self-Improvement Report")
-            report.append(f"\n**Period:** Last {days} days")
-            report.append(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        Args:
+            days: Number of days the analyses cover
+            skill_analysis: Result of analyze_skill_performance()/analyze_all()
+            failure_analysis: Result of analyze_tool_failures()/analyze_all()
+
+        Returns:
+            Formatted markdown report with findings and suggestions
+        """
+        try:
+            # Build report in one buffer; every line ends with "\n"
+            buf = io.StringIO()
+            w = buf.write
+            w("# 🤖 Self-Improvement Report\n")
+            w(f"\n**Period:** Last {days} days\n")
+            w(f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+
+            # Bucket skills in one pass; the action items reuse the buckets
+            top_skills = []
+            problem_skills = []
+            underused = []
+            high_usage = []
+            for s in skill_analysis:
+                success_rate = s["success_rate"]
+                usage_count = s["usage_count"]
+                if success_rate > 0.8:
+                    top_skills.append(s)
+                if success_rate < 0.5 and usage_count > 3:
+                    problem_skills.append(s)
+                if usage_count == 1:
+                    underused.append(s)
+                if usage_count > 20:
+                    high_usage.append(s)
 
             # Skill Performance Section
-            report.append("## 📊 Skill Performance Analysis\n")
+            w("## 📊 Skill Performance Analysis\n\n")
 
             if skill_analysis:
-                report.append(f"Analyzed **{len(skill_analysis)}** skills\n")
+                w(f"Analyzed **{len(skill_analysis)}** skills\n\n")
 
                 # Top performers
-                top_skills = [s for s in skill_analysis if s["success_rate"] > 0.8]
                 if top_skills:
-                    report.append("### ✅ Top Performing Skills\n")
+                    w("### ✅ Top Performing Skills\n\n")
                     for skill in top_skills[:5]:
-                        report.append(
+                        w(
                             f"- **{skill['skill_id']}**: "
                             f"{skill['usage_count']} uses, "
-                            f"{skill['success_rate']:.1%} success rate"
+                            f"{skill['success_rate']:.1%} success rate\n"
                         )
-                    report.append("")
+                    w("\n")
 
                 # Needs improvement
-                problem_skills = [s for s in skill_analysis if s["success_rate"] < 0.5 and s["usage_count"] > 3]
                 if problem_skills:
-                    report.append("### ⚠️  Skills Needing Attention\n")
+                    w("### ⚠️  Skills Needing Attention\n\n")
                     for skill in problem_skills:
-                        report.append(
+                        w(
                             f"- **{skill['skill_id']}**: "
-                            f"{skill['failures']} failures / {skill['usage_count']} uses"
+                            f"{skill['failures']} failures / {skill['usage_count']} uses\n"
                         )
-                        report.append(f"  💡 {skill['suggestion']}\n")
-                    report.append("")
+                        w(f"  💡 {skill['suggestion']}\n\n")
+                    w("\n")
 
                 # Underutilized
-                underused = [s for s in skill_analysis if s["usage_count"] == 1]
                 if underused:
-                    report.append(f"### 💤 Underutilized Skills: {len(underused)} skills used only once\n")
+                    w(f"### 💤 Underutilized Skills: {len(underused)} skills used only once\n\n")
 
             else:
-                report.append("*No skill usage data available*\n")
+                w("*No skill usage data available*\n\n")
 
             # Tool Failure Section
-            report.append("## 🔧 Tool Failure Analysis\n")
+            w("## 🔧 Tool Failure Analysis\n\n")
 
             if failure_analysis:
-                report.append(f"Detected **{len(failure_analysis)}** error patterns\n")
+                w(f"Detected **{len(failure_analysis)}** error patterns\n\n")
 
                 for i, failure in enumerate(failure_analysis[:10], 1):
-                    report.append(f"### {i}. {failure['tool_name']} - {failure['error_type']}\n")
-                    report.append(f"**Occurrences:** {failure['count']}")
-                    report.append(f"**Suggestion:** {failure['suggestion']}\n")
+                    w(f"### {i}. {failure['tool_name']} - {failure['error_type']}\n\n")
+                    w(f"**Occurrences:** {failure['count']}\n")
+                    w(f"**Suggestion:** {failure['suggestion']}\n\n")
 
                     if failure["examples"]:
-                        report.append("**Example:**")
-                        report.append(f"```\n{failure['examples'][0]}\n```\n")
+                        w("**Example:**\n")
+                        w(f"```\n{failure['examples'][0]}\n```\n\n")
             else:
-                report.append("*No tool failures detected* ✅\n")
+                w("*No tool failures detected* ✅\n\n")
 
             # Recommendations Section
-            report.append("## 💡 Action Items\n")
+            w("## 💡 Action Items\n\n")
 
-            action_items = self._generate_action_items(skill_analysis, failure_analysis)
+            action_items = self._generate_action_items(
+                failure_analysis, problem_skills, high_usage
+            )
             for i, action in enumerate(action_items, 1):
-                report.append(f"{i}. {action}")
+                w(f"{i}. {action}\n")
 
-            report.append("\n---")
-            report.append("*Generated by Nexus Self-Improvement Engine*")
+            w("\n---\n")
+            w("*Generated by Nexus Self-Improvement Engine*")
 
-            return "\n".join(report)
+            return buf.getvalue()
 
         except Exception as e:
             logger.error(f"Failed to generate improvement report: {e}")
@@ -256,90 +348,55 @@ class SelfImprovementEngine:
     # Helper Methods
     # ────────────────────────────────────────────
 
-    async def _get_recent_conversations(self, cutoff_date: datetime) -> List[Dict]:
-        """Get conversations since cutoff date."""
-        try:
-            # Query database for recent conversations
-            # This is a placeholder - adjust based on actual DB schema
-            if hasattr(self.db, "execute"):
-                cursor = await self.db.execute(
-                    "SELECT * FROM conversations WHERE created_at > ? ORDER BY created_at DESC",
-                    (cutoff_date.isoformat(),)
-                )
-                rows = await cursor.fetchall()
-
-                # Convert to dicts (adjust based on actual schema)
-                conversations = []
-                for row in rows:
-                    conversations.append({
-                        "id": row[0] if len(row) > 0 else None,
-                        "messages": [],  # Would need to parse from row
-                    })
-
-                return conversations
-
-            return []
+    async def _iter_recent_messages(self, cutoff_date: datetime) -> AsyncIterator[Dict]:
+        """Yield messages created since cutoff date, streamed from the DB.
 
+        Only the columns the analyzers read are fetched, via the
+        ``messages.created_at`` index.
+        """
+        if not hasattr(self.db, "iter_messages_since"):
+            return
+        try:
+            async for conv_id, role, content in self.db.iter_messages_since(cutoff_date):
+                yield {"conversation_id": conv_id, "role": role, "content": content or ""}
         except Exception as e:
-            logger.warning(f"Failed to query conversations: {e}")
-            return []
+            logger.warning(f"Failed to query recent messages: {e}")
 
     def _extract_skill_mentions(self, content: str) -> List[str]:
         """Extract skill IDs mentioned in content."""
-        skills = []
+        # Look for skill patterns; the case-insensitive regex needs no
+        # lowercased copy of the content
+        skills = _SKILL_MENTION_RE.findall(content)
 
-        # Look for skill patterns
-        if "skill:" in content.lower():
-            # Extract skill IDs (basic pattern)
-            import re
-            matches = re.findall(r'skill:\s*(\w+[\w-]*)', content, re.IGNORECASE)
-            skills.extend(matches)
-
-        # Check for tool calls that might indicate skills
-        if "tool:" in content.lower() or "action:" in content.lower():
-            # Parse tool names (would map to skills)
-            pass  # Implement based on actual tool naming
+        # Tool calls ("tool:", "action:") might also indicate skills once
+        # tool names are mapped to skills
 
         return list(set(skills))  # Deduplicate
 
     def _was_execution_successful(self, message: Dict) -> bool:
         """Heuristic to determine if execution was successful."""
-        content = message.get("content", "").lower()
-
-        # Success indicators
-        if any(indicator in content for indicator in ["✅", "success", "completed", "done"]):
-            return True
+        content = message.get("content", "")
 
-        # Failure indicators
-        if any(indicator in content for indicator in ["❌", "error", "failed", "exception"]):
-            return False
-
-        # Default: assume success if no error indicators
-        return "error" not in content and "failed" not in content
+        # One scan for both indicator sets: any success indicator wins,
+        # otherwise a failure indicator means failure; default: success
+        failed = False
+        for match in _OUTCOME_RE.finditer(content):
+            if match.lastgroup == "ok":
+                return True
+            failed = True
+        return not failed
 
     def _extract_tool_name_from_error(self, content: str) -> Optional[str]:
         """Extract tool name from error message."""
-        import re
-
-        # Try to find tool name patterns
-        patterns = [
-            r'tool[_\s]+(\w+)',
-            r'function[_\s]+(\w+)',
-            r'(\w+)\s+failed',
-            r'error in (\w+)',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, content, re.IGNORECASE)
-            if match:
-                return match.group(1)
+        # Single pass over the content; the leftmost matching pattern wins
+        match = _TOOL_NAME_RE.search(content)
+        if match:
+            return next((g for g in match.groups() if g), None)
 
         return None
 
-    def _classify_error(self, content: str) -> str:
-        """Classify error type from content."""
-        content_lower = content.lower()
-
+    def _classify_error(self, content_lower: str) -> str:
+        """Classify error type from already-lowercased content."""
         if "timeout" in content_lower:
             return "timeout"
         elif "not found" in content_lower or "404" in content_lower:
@@ -386,9 +443,18 @@ class SelfImprovementEngine:
             return f"Investigate {tool_name} for {error_type} errors ({count} occurrences)"
 
     def _generate_action_items(
-        self, skill_analysis: List[Dict], failure_analysis: List[Dict]
+        self,
+        failure_analysis: List[Dict],
+        problem_skills: List[Dict],
+        high_usage: List[Dict],
     ) -> List[str]:
-        """Generate prioritized action items."""
+        """Generate prioritized action items.
+
+        Args:
+            failure_analysis: Tool failure patterns
+            problem_skills: Skills with low success rates (pre-bucketed)
+            high_usage: Frequently-used skills (pre-bucketed)
+        """
         actions = []
 
         # High priority: frequent failures
@@ -399,14 +465,12 @@ class SelfImprovementEngine:
             )
 
         # Skills with low success rates
-        problem_skills = [s for s in skill_analysis if s["success_rate"] < 0.5 and s["usage_count"] > 3]
         if problem_skills:
             actions.append(
                 f"🟡 **Important:** Fix {len(problem_skills)} underperforming skills"
             )
 
         # Optimization opportunities
-        high_usage = [s for s in skill_analysis if s["usage_count"] > 20]
         if high_usage:
             actions.append(
                 f"🟢 **Optimize:** Consider caching or optimization for {len(high_usage)} frequently-used skills"
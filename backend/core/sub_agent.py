@@ -8,7 +8,8 @@ Architecture
 ------------
 - ``SubAgentOrchestrator`` sits between ``AgentRunner`` and ``AgentAttempt``.
 - Each sub-agent is defined by a ``SubAgentSpec`` (role, model, prompt, dependencies).
-- Specs are topologically sorted into dependency layers and executed via ``asyncio.gather``.
+- Locally, each spec starts as soon as its own dependencies finish (no layer
+  barrier); distributed runs execute topologically sorted layers.
 - Claude Code sub-agents run as direct subprocess invocations (``ClaudeCodeClient``).
 - Results are synthesised by a final LLM call or returned directly if only one agent.
 """
@@ -16,21 +17,45 @@ Architecture
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
+import re
+import secrets
 import time
-import uuid
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Awaitable
 
 from core.errors import AgentAbortError
-from websocket_manager import websocket_manager
+from core.sub_agent_cache import make_key, make_scope, plan_template_key
+from websocket_manager import WebsocketBatcher, websocket_manager
 
 if TYPE_CHECKING:
     from config_manager import ConfigManager
 
 logger = logging.getLogger("nexus.sub_agent")
 
+# Conversation messages a sub-agent sees for context
+CONTEXT_LIMIT = 10
+
+# Claude Code streaming progress: at most one update per interval, showing
+# the last PROGRESS_TAIL_CHARS characters
+PROGRESS_INTERVAL = 0.05
+PROGRESS_TAIL_CHARS = 500
+
+# Speculative specs start once their stream_dep has streamed this much, and
+# their result is kept only if that snapshot is at least this share of the
+# dependency's final output (otherwise they are re-run on the final output)
+_SPECULATIVE_MIN_CHARS = 2000
+_SPECULATIVE_MIN_COVERAGE = 0.9
+
+# {{result:<spec_id>}} placeholder in a sub-agent prompt
+_RESULT_PLACEHOLDER_RE = re.compile(r"\{\{result:([^{}]*)\}\}")
+
+# "8/10"-style rating in a reviewer's output
+_RATING_RE = re.compile(r"(\d+)\s*/\s*10")
+
 
 # ── Enums ────────────────────────────────────────────────────────
 
@@ -68,6 +93,28 @@ class SubAgentSpec:
     include_tools: bool = True
     include_context: bool = True      # Whether sub-agent sees conversation history
     use_mcp: bool = False             # True for claude_code
+    # Resources read/written, used to infer ordering between steps that
+    # declare no depends_on ("*" = anything). Empty = no side effects.
+    reads: tuple = ()
+    writes: tuple = ()
+    # Hash of a plan step's own inputs; set by from_plan for template replay
+    input_hash: str = ""
+    # Start early on stream_dep's partial output (include_tools=False only)
+    speculative: bool = False
+    stream_dep: str | None = None
+    # Send through the Anthropic Message Batches API (model "claude",
+    # no tools): half price, results within minutes to hours
+    batch_eligible: bool = False
+    # Prompt split around its {{result:...}} placeholders, parsed once:
+    # literal parts interleave with the referenced spec ids
+    prompt_template_parts: tuple = field(default=(), init=False, repr=False)
+    prompt_template_deps: tuple = field(default=(), init=False, repr=False)
+
+    def __post_init__(self):
+        if "{{result:" in self.prompt:
+            pieces = _RESULT_PLACEHOLDER_RE.split(self.prompt)
+            self.prompt_template_parts = tuple(pieces[0::2])
+            self.prompt_template_deps = tuple(pieces[1::2])
 
 
 @dataclass
@@ -92,6 +139,10 @@ class Orchestration:
     specs: list = field(default_factory=list)
     results: dict = field(default_factory=dict)  # spec_id -> SubAgentResult
     final_output: str = ""
+    template_key: str = ""  # Plan skeleton hash (plan_execution only)
+    # Precomputed by the factories (see _compute_schedule); specs are not
+    # modified after construction
+    schedule: dict = field(default_factory=dict)
 
 
 # ── Role Prompts ─────────────────────────────────────────────────
@@ -143,17 +194,115 @@ ROLE_PROMPTS: dict[str, dict[str, str]] = {
 }
 
 
+# Resources touched by a plan step, by tool_hint: (reads, writes).
+# Unknown hints are assumed to read and write anything.
+TOOL_HINT_ACCESS: dict[str, tuple[tuple, tuple]] = {
+    "web_search": (("web",), ()),
+    "file_read": (("fs",), ()),
+    "terminal": (("fs",), ("fs",)),
+    "code_edit": (("fs",), ("fs",)),
+    "none": ((), ()),
+    "": ((), ()),
+}
+_UNKNOWN_ACCESS = (("*",), ("*",))
+
+
+def _conflicts(writes: tuple, accessed: tuple) -> bool:
+    """True if any resource in *writes* is also in *accessed*."""
+    if not writes or not accessed:
+        return False
+    if "*" in writes or "*" in accessed:
+        return True
+    return not set(writes).isdisjoint(accessed)
+
+
+def _infer_deps(specs: list[SubAgentSpec]) -> None:
+    """Add ordering edges implied by the specs' read/write sets.
+
+    ``A -> B`` is added when A comes first and writes something B reads or
+    writes.  Edges that would close a cycle with the explicit
+    ``depends_on`` are skipped.
+    """
+    by_id = {s.id: s for s in specs}
+
+    def _ancestors(spec_id: str) -> set:
+        seen, stack = set(), list(by_id[spec_id].depends_on)
+        while stack:
+            dep = stack.pop()
+            if dep not in seen and dep in by_id:
+                seen.add(dep)
+                stack.extend(by_id[dep].depends_on)
+        return seen
+
+    for i, earlier in enumerate(specs):
+        if not earlier.writes:
+            continue
+        for later in specs[i + 1:]:
+            if earlier.id in later.depends_on:
+                continue
+            if not _conflicts(earlier.writes, later.reads + later.writes):
+                continue
+            if later.id in _ancestors(earlier.id):
+                continue
+            later.depends_on.append(earlier.id)
+
+
+# ROLE_PROMPTS flattened to (role, model) → prompt; the "default" variant
+# is stored under model "".
+_ROLE_PROMPT_TABLE: dict[tuple[SubAgentRole, str], str] = {
+    (SubAgentRole(role), "" if variant == "default" else variant): prompt
+    for role, variants in ROLE_PROMPTS.items()
+    for variant, prompt in variants.items()
+}
+
+
 def _get_role_prompt(role: SubAgentRole, model: str | None = None) -> str:
     """Get the appropriate role prompt, with model-specific variant if available."""
-    role_dict = ROLE_PROMPTS.get(role.value, {})
-    if model and model in role_dict:
-        return role_dict[model]
-    return role_dict.get("default", "")
+    prompt = _ROLE_PROMPT_TABLE.get((role, model or ""))
+    if prompt is None:
+        return _ROLE_PROMPT_TABLE.get((role, ""), "")
+    return prompt
 
 
 # ── Strategy Factory ─────────────────────────────────────────────
 
 
+def _compute_schedule(specs: list[SubAgentSpec]) -> dict:
+    """Dependency layers, edges and critical-path length for *specs*.
+
+    Returns ``{"layers": [[id]], "deps": {id: (id,)},
+    "dependents": {id: [id]}, "critical_path_len": {id: int}}``.
+    """
+    deps, dependents, priority = SubAgentOrchestrator._dag_plan(specs)
+    order = {s.id: i for i, s in enumerate(specs)}
+    return {
+        "layers": [
+            sorted((s.id for s in layer), key=order.__getitem__)
+            for layer in SubAgentOrchestrator._topological_sort(specs)
+        ],
+        "deps": {s.id: tuple(d for d in s.depends_on if d in deps[s.id]) for s in specs},
+        "dependents": {sid: [c.id for c in children] for sid, children in dependents.items()},
+        "critical_path_len": priority,
+    }
+
+
+def _fan_in_schedule(workers: list[SubAgentSpec], synth: SubAgentSpec) -> dict:
+    """Schedule for N independent specs merged by one synthesiser."""
+    worker_ids = [s.id for s in workers]
+    return {
+        "layers": [worker_ids, [synth.id]],
+        "deps": {**{sid: () for sid in worker_ids}, synth.id: tuple(worker_ids)},
+        "dependents": {**{sid: [synth.id] for sid in worker_ids}, synth.id: []},
+        "critical_path_len": {**{sid: 2 for sid in worker_ids}, synth.id: 1},
+    }
+
+
+def _hex_ids(n: int) -> list[str]:
+    """*n* random 8-char hex ids from a single ``secrets`` draw."""
+    raw = secrets.token_hex(n * 4)
+    return [raw[i:i + 8] for i in range(0, n * 8, 8)]
+
+
 class OrchestrationStrategy:
     """Factory for pre-defined orchestration patterns."""
 
@@ -161,31 +310,40 @@ class OrchestrationStrategy:
     def parallel_research(
         queries: list[str],
         cfg: ConfigManager | None = None,
+        batch: bool = False,
     ) -> Orchestration:
-        """N researchers run in parallel, synthesiser merges results."""
-        orch_id = f"orch-{uuid.uuid4().hex[:8]}"
+        """N researchers run in parallel, synthesiser merges results.
+
+        With *batch*, the researchers go to Claude as one Message Batch
+        (no tools) instead of N live requests.
+        """
+        orch_hex, synth_hex, *spec_hex = _hex_ids(len(queries) + 2)
+        orch_id = f"orch-{orch_hex}"
         specs = []
 
         for i, query in enumerate(queries):
-            spec_id = f"sa-{uuid.uuid4().hex[:6]}"
             specs.append(SubAgentSpec(
-                id=spec_id,
+                id=f"sa-{spec_hex[i]}",
                 role=SubAgentRole.RESEARCHER,
                 prompt=query,
-                model=None,  # auto-route
+                model="claude" if batch else None,  # None = auto-route
+                include_tools=not batch,
+                batch_eligible=batch,
             ))
 
         # Add synthesiser that depends on all researchers
-        synth_id = f"sa-synth-{uuid.uuid4().hex[:6]}"
-        specs.append(SubAgentSpec(
-            id=synth_id,
+        synth = SubAgentSpec(
+            id=f"sa-synth-{synth_hex}",
             role=SubAgentRole.SYNTHESIZER,
             prompt="Merge the research findings above into one coherent response.",
             depends_on=[s.id for s in specs],
             include_tools=False,
-        ))
+        )
 
-        return Orchestration(id=orch_id, strategy="parallel_research", specs=specs)
+        return Orchestration(
+            id=orch_id, strategy="parallel_research", specs=specs + [synth],
+            schedule=_fan_in_schedule(specs, synth),
+        )
 
     @staticmethod
     def build_review(
@@ -195,7 +353,8 @@ class OrchestrationStrategy:
         cfg: ConfigManager | None = None,
     ) -> Orchestration:
         """Builder creates output, Reviewer critiques it."""
-        orch_id = f"orch-{uuid.uuid4().hex[:8]}"
+        orch_hex, builder_hex, reviewer_hex = _hex_ids(3)
+        orch_id = f"orch-{orch_hex}"
 
         # Resolve default models from config
         if cfg and not builder_model:
@@ -203,8 +362,8 @@ class OrchestrationStrategy:
         if cfg and not reviewer_model:
             reviewer_model = cfg.get("SUB_AGENT_REVIEWER_MODEL") or "claude"
 
-        builder_id = f"sa-build-{uuid.uuid4().hex[:6]}"
-        reviewer_id = f"sa-review-{uuid.uuid4().hex[:6]}"
+        builder_id = f"sa-build-{builder_hex}"
+        reviewer_id = f"sa-review-{reviewer_hex}"
 
         specs = [
             SubAgentSpec(
@@ -221,8 +380,16 @@ class OrchestrationStrategy:
                 depends_on=[builder_id],
             ),
         ]
-
-        return Orchestration(id=orch_id, strategy="build_review", specs=specs)
+        if cfg and cfg.get_bool("SUB_AGENT_SPECULATIVE_REVIEW", False):
+            # Review is read-only: let it overlap the builder's stream
+            reviewer = specs[1]
+            reviewer.speculative = True
+            reviewer.stream_dep = builder_id
+            reviewer.include_tools = False
+
+        return Orchestration(
+            id=orch_id, strategy="build_review", specs=specs, schedule=_compute_schedule(specs),
+        )
 
     @staticmethod
     def build_review_code(
@@ -230,7 +397,8 @@ class OrchestrationStrategy:
         cfg: ConfigManager | None = None,
     ) -> Orchestration:
         """Claude Code builds, Claude Code reviews — full MCP tool access."""
-        orch_id = f"orch-{uuid.uuid4().hex[:8]}"
+        orch_hex, builder_hex, reviewer_hex = _hex_ids(3)
+        orch_id = f"orch-{orch_hex}"
 
         # Resolve models from config
         code_builder = "claude_code"
@@ -239,8 +407,8 @@ class OrchestrationStrategy:
             code_builder = cfg.get("SUB_AGENT_CODE_BUILDER_MODEL") or "claude_code"
             code_reviewer = cfg.get("SUB_AGENT_CODE_REVIEWER_MODEL") or "claude_code"
 
-        builder_id = f"sa-build-{uuid.uuid4().hex[:6]}"
-        reviewer_id = f"sa-review-{uuid.uuid4().hex[:6]}"
+        builder_id = f"sa-build-{builder_hex}"
+        reviewer_id = f"sa-review-{reviewer_hex}"
 
         specs = [
             SubAgentSpec(
@@ -262,7 +430,9 @@ class OrchestrationStrategy:
             ),
         ]
 
-        return Orchestration(id=orch_id, strategy="build_review_code", specs=specs)
+        return Orchestration(
+            id=orch_id, strategy="build_review_code", specs=specs, schedule=_compute_schedule(specs),
+        )
 
     @staticmethod
     def verify(
@@ -271,29 +441,31 @@ class OrchestrationStrategy:
         cfg: ConfigManager | None = None,
     ) -> Orchestration:
         """N verifiers independently check a claim in parallel."""
-        orch_id = f"orch-{uuid.uuid4().hex[:8]}"
+        orch_hex, synth_hex, *spec_hex = _hex_ids(num_verifiers + 2)
+        orch_id = f"orch-{orch_hex}"
         specs = []
 
         for i in range(num_verifiers):
-            spec_id = f"sa-verify-{uuid.uuid4().hex[:6]}"
             specs.append(SubAgentSpec(
-                id=spec_id,
+                id=f"sa-verify-{spec_hex[i]}",
                 role=SubAgentRole.VERIFIER,
                 prompt=f"Verify this claim: {claim}",
                 model=None,  # auto-route
             ))
 
         # Synthesiser merges verification results
-        synth_id = f"sa-synth-{uuid.uuid4().hex[:6]}"
-        specs.append(SubAgentSpec(
-            id=synth_id,
+        synth = SubAgentSpec(
+            id=f"sa-synth-{synth_hex}",
             role=SubAgentRole.SYNTHESIZER,
             prompt="Compare the verification results and provide a final verdict with confidence level.",
             depends_on=[s.id for s in specs],
             include_tools=False,
-        ))
+        )
 
-        return Orchestration(id=orch_id, strategy="verify", specs=specs)
+        return Orchestration(
+            id=orch_id, strategy="verify", specs=specs + [synth],
+            schedule=_fan_in_schedule(specs, synth),
+        )
 
     @staticmethod
     def from_plan(plan: Any, cfg: Any = None) -> Orchestration:
@@ -302,24 +474,41 @@ class OrchestrationStrategy:
         Independent plan steps (no depends_on) become parallel sub-agents.
         Dependent steps are executed in order via the dependency graph.
         """
-        orch_id = f"orch-plan-{uuid.uuid4().hex[:8]}"
+        orch_hex, synth_hex = _hex_ids(2)
+        orch_id = f"orch-plan-{orch_hex}"
         specs = []
 
         for step in plan.steps:
             spec_id = f"sa-plan-{step.id}"
+            tool_hint = getattr(step, 'tool_hint', '')
+            reads, writes = TOOL_HINT_ACCESS.get(tool_hint, _UNKNOWN_ACCESS)
+            resources = tuple(getattr(step, 'resources', ()) or ())
+            if resources:
+                # Explicit resources narrow the hint's wildcard/category
+                reads = resources if reads else ()
+                writes = resources if writes else ()
             specs.append(SubAgentSpec(
                 id=spec_id,
                 role=SubAgentRole.RESEARCHER,
                 prompt=f"{step.title}: {step.description}",
                 model=None,  # auto-route
                 depends_on=[f"sa-plan-{dep}" for dep in getattr(step, 'depends_on', [])],
-                include_tools=getattr(step, 'tool_hint', '') not in ("none", ""),
+                include_tools=tool_hint not in ("none", ""),
+                reads=reads,
+                writes=writes,
+                input_hash=hashlib.blake2b(
+                    f"{step.title}\x00{step.description}\x00{tool_hint}".encode(), digest_size=16
+                ).hexdigest(),
             ))
 
         # If there are multiple independent steps, add a synthesiser
         independent_count = sum(1 for s in specs if not s.depends_on)
+
+        # Order steps that touch the same resources even if the plan
+        # didn't say so; disjoint steps stay parallel
+        _infer_deps(specs)
         if len(specs) > 1 and independent_count > 1:
-            synth_id = f"sa-plan-synth-{uuid.uuid4().hex[:6]}"
+            synth_id = f"sa-plan-synth-{synth_hex}"
             specs.append(SubAgentSpec(
                 id=synth_id,
                 role=SubAgentRole.SYNTHESIZER,
@@ -328,7 +517,10 @@ class OrchestrationStrategy:
                 include_tools=False,
             ))
 
-        return Orchestration(id=orch_id, strategy="plan_execution", specs=specs)
+        return Orchestration(
+            id=orch_id, strategy="plan_execution", specs=specs,
+            template_key=plan_template_key(plan), schedule=_compute_schedule(specs),
+        )
 
 
 # ── Runner Shim ──────────────────────────────────────────────────
@@ -370,6 +562,8 @@ class SubAgentOrchestrator:
         self.conv_id = conv_id
         self.parent_abort = parent_abort
         self.messages = messages
+        # Conversation context shared (not copied) by every sub-agent
+        self._context_prefix: tuple[dict, ...] = tuple(messages[-CONTEXT_LIMIT:]) if messages else ()
         self.cfg = cfg
 
         # Concurrency controls
@@ -379,11 +573,36 @@ class SubAgentOrchestrator:
             max_concurrent = cfg.get_int("SUB_AGENT_MAX_CONCURRENT", 4)
             cc_concurrent = cfg.get_int("SUB_AGENT_CLAUDE_CODE_CONCURRENT", 2)
 
-        self._semaphore = asyncio.Semaphore(max_concurrent)
+        # Local execution runs at most this many sub-agents at once
+        self._max_concurrent = max_concurrent
         self._claude_code_semaphore = asyncio.Semaphore(cc_concurrent)
 
-        # Track running tasks for abort
-        self._running_tasks: list[asyncio.Task] = []
+        # Live tasks, cancelled on abort; each removes itself when done
+        self._running_tasks: set[asyncio.Task] = set()
+
+        # Speculative execution: dependency id → specs waiting on its stream,
+        # streamed-so-far text, and launched runs (spec id → dep id,
+        # snapshot, task)
+        self._speculation_watch: dict[str, list[SubAgentSpec]] = {}
+        self._partial_output: dict[str, list[str]] = {}
+        self._speculative: dict[str, tuple[str, str, asyncio.Task]] = {}
+
+        # System prompts of Claude Code sub-agents not yet given a process;
+        # the next one is pre-spawned whenever a warm session is taken
+        self._claude_code_backlog: deque[str] = deque()
+        # Processes this orchestrator pre-spawned, and the background tasks
+        # still spawning them; any left unused are killed once execute() ends
+        self._warm_sessions: list[Any] = []
+        self._prewarm_tasks: set[asyncio.Task] = set()
+
+        # Built once per orchestrator and shared by its sub-agents, so every
+        # sub-agent on a model gets a byte-identical (cacheable) prefix:
+        # model name → base system prompt / Anthropic tool schemas
+        self._system_cache: dict[str, str] = {}
+        self._tools_cache: dict[str, Any] = {}
+
+        # Progress updates from all sub-agents are coalesced into batched sends
+        self._progress = WebsocketBatcher(ws_id, "sub_agent_progress_batch") if ws_id else None
 
     async def execute(self, orchestration: Orchestration) -> str:
         """Run the full orchestration. Returns synthesised output."""
@@ -424,70 +643,19 @@ class SubAgentOrchestrator:
                 },
             )
 
-        try:
-            # Topologically sort specs into dependency layers
-            layers = self._topological_sort(orchestration.specs)
-
-            for layer_idx, layer in enumerate(layers):
-                if self.parent_abort.is_set():
-                    raise AgentAbortError("Orchestration aborted by user")
-
-                logger.info(
-                    f"[{orchestration.id}] Executing layer {layer_idx + 1}/{len(layers)}: "
-                    f"{[s.id for s in layer]}"
-                )
+        if not orchestration.schedule:
+            orchestration.schedule = _compute_schedule(orchestration.specs)
 
-                # Check for distributed execution via Redis Streams
-                task_stream = self._get_task_stream()
+        try:
+            await self._prewarm_claude_code(orchestration)
 
-                if task_stream:
-                    results = await self._execute_layer_distributed(
-                        layer, orchestration, task_stream
-                    )
-                else:
-                    # Local execution: run sub-agents in-process
-                    tasks = []
-                    for spec in layer:
-                        task = asyncio.create_task(
-                            self._run_sub_agent_with_semaphore(spec, orchestration),
-                            name=f"sub-agent-{spec.id}",
-                        )
-                        self._running_tasks.append(task)
-                        tasks.append(task)
-
-                    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-                # Process results
-                for spec, result in zip(layer, results):
-                    if isinstance(result, Exception):
-                        logger.error(f"[{orchestration.id}] Sub-agent {spec.id} failed: {result}")
-                        orchestration.results[spec.id] = SubAgentResult(
-                            id=spec.id,
-                            role=spec.role,
-                            model_used=spec.model or "unknown",
-                            output="",
-                            error=str(result),
-                            status=SubAgentStatus.FAILED,
-                        )
-                    else:
-                        orchestration.results[spec.id] = result
-
-                    # Notify UI of completion
-                    if self.ws_id:
-                        r = orchestration.results[spec.id]
-                        await websocket_manager.send_to_client(
-                            self.ws_id,
-                            {
-                                "type": "sub_agent_complete",
-                                "orchestration_id": orchestration.id,
-                                "sub_agent_id": spec.id,
-                                "sub_agent_role": spec.role.value,
-                                "sub_agent_model": r.model_used,
-                                "sub_agent_status": r.status.value,
-                                "content": r.output[:500] if r.output else r.error[:200],
-                                "duration_ms": r.duration_ms,
-                            },
-                        )
+            # Check for distributed execution via Redis Streams
+            task_stream = self._get_task_stream()
+            if task_stream:
+                await self._execute_layers_distributed(orchestration, task_stream)
+            else:
+                # Local execution: run sub-agents in-process
+                await self._execute_dag(orchestration)
 
             # Synthesise results
             final = await self._synthesize(orchestration)
@@ -509,10 +677,11 @@ class SubAgentOrchestrator:
             return final
 
         except AgentAbortError:
-            # Cancel all running tasks
-            for task in self._running_tasks:
-                if not task.done():
-                    task.cancel()
+            # Cancel all running tasks and wait for them to unwind
+            live = list(self._running_tasks)
+            for task in live:
+                task.cancel()
+            await asyncio.gather(*live, return_exceptions=True)
             try:
                 await work_registry.update(orchestration.id, "cancelled")
             except Exception:
@@ -527,6 +696,362 @@ class SubAgentOrchestrator:
                 pass
             raise
 
+        finally:
+            await self._discard_warm_claude_code()
+
+    async def _unless_aborted(self, aw: Awaitable) -> Any:
+        """Await *aw*, or cancel it and raise AgentAbortError on abort."""
+        task = asyncio.ensure_future(aw)
+        abort_task = asyncio.ensure_future(self.parent_abort.wait())
+        try:
+            await asyncio.wait({task, abort_task}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        finally:
+            abort_task.cancel()
+        if not task.done():
+            # Let the work unwind (e.g. cancel a remote batch) before raising
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            raise AgentAbortError("Orchestration aborted by user")
+        return task.result()
+
+    def _track(self, task: asyncio.Task) -> asyncio.Task:
+        """Register *task* for cancellation on abort until it finishes."""
+        self._running_tasks.add(task)
+        task.add_done_callback(self._running_tasks.discard)
+        return task
+
+    async def _execute_dag(self, orchestration: Orchestration) -> None:
+        """Run sub-agents in-process, each as soon as its own dependencies finish.
+
+        Unlike layer-by-layer execution there is no barrier: a slow spec
+        only delays the specs that depend on it.  ``max_concurrent``
+        workers pull ready specs from a priority queue, longest remaining
+        dependency chain first, so the critical path is never starved.
+        Batch-eligible root specs skip the queue and go to Claude as one
+        Message Batch alongside the workers.
+        """
+        specs = orchestration.specs
+        if not specs:
+            return
+        schedule = orchestration.schedule
+        by_id = {s.id: s for s in specs}
+        deps = {sid: set(d) for sid, d in schedule["deps"].items()}
+        dependents = {sid: [by_id[c] for c in children] for sid, children in schedule["dependents"].items()}
+        priority = schedule["critical_path_len"]
+        ready: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        order = {s.id: i for i, s in enumerate(specs)}
+        batched = []
+        for spec in specs:
+            if not deps[spec.id]:
+                if self._can_batch(spec):
+                    batched.append(spec)
+                else:
+                    ready.put_nowait((-priority[spec.id], order[spec.id], spec))
+            elif self._can_speculate(spec) and spec.stream_dep in deps[spec.id]:
+                self._speculation_watch.setdefault(spec.stream_dep, []).append(spec)
+
+        pending = len(specs)
+
+        async def _finish(spec: SubAgentSpec, result: Any) -> None:
+            nonlocal pending
+            await self._record_result(spec, result, orchestration)
+
+            for child in dependents[spec.id]:
+                child_deps = deps[child.id]
+                child_deps.discard(spec.id)
+                if not child_deps:
+                    ready.put_nowait((-priority[child.id], order[child.id], child))
+
+            pending -= 1
+            if pending == 0:
+                # Release every worker
+                for _ in range(self._max_concurrent):
+                    ready.put_nowait((0, len(specs), None))
+
+        async def _batch() -> None:
+            try:
+                results = await self._run_batch(batched, orchestration)
+            except (asyncio.CancelledError, AgentAbortError):
+                raise
+            except Exception as exc:
+                # Batch API unavailable or too slow: run them live instead
+                logger.warning(
+                    f"[{orchestration.id}] Message batch failed, running "
+                    f"{len(batched)} sub-agents directly: {exc}"
+                )
+                for spec in batched:
+                    ready.put_nowait((-priority[spec.id], order[spec.id], spec))
+                return
+            for spec in batched:
+                await _finish(spec, results[spec.id])
+
+        async def _worker() -> None:
+            while True:
+                _, _, spec = await ready.get()
+                if spec is None:
+                    return
+                if self.parent_abort.is_set():
+                    raise AgentAbortError("Orchestration aborted by user")
+
+                # Recurring plan step with unchanged inputs: replay it
+                step_hash = self._plan_step_hash(spec, orchestration)
+                result = self._replay_plan_step(spec, orchestration, step_hash)
+                if result is None:
+                    result = await self._take_speculative(spec, orchestration)
+                if result is None:
+                    try:
+                        result = await self._run_sub_agent(spec, orchestration)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as exc:
+                        result = exc
+                    if step_hash and isinstance(result, SubAgentResult):
+                        self._store_plan_step(spec, orchestration, step_hash, result)
+                await _finish(spec, result)
+
+        workers = [
+            asyncio.create_task(_worker(), name=f"sub-agent-worker-{orchestration.id}-{i}")
+            for i in range(max(1, min(self._max_concurrent, len(specs))))
+        ]
+        if batched:
+            workers.append(asyncio.create_task(_batch(), name=f"sub-agent-batch-{orchestration.id}"))
+        for worker in workers:
+            self._track(worker)
+        try:
+            await self._unless_aborted(asyncio.gather(*workers))
+        except BaseException:
+            # The surviving workers would otherwise wait on the queue forever
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise
+
+    @staticmethod
+    def _dag_plan(
+        specs: list[SubAgentSpec],
+    ) -> tuple[dict[str, set], dict[str, list], dict[str, int]]:
+        """Dependency sets, dependents and critical-path priority per spec.
+
+        Priority is the length of the longest chain of specs that still
+        depend on a spec (itself included).  Unknown dependency ids are
+        ignored; dependencies inside a cycle are dropped with a warning,
+        matching _topological_sort's forced layer.
+        """
+        spec_ids = {s.id for s in specs}
+        deps = {s.id: {d for d in s.depends_on if d in spec_ids} for s in specs}
+        dependents: dict[str, list] = {s.id: [] for s in specs}
+        for spec in specs:
+            for dep_id in deps[spec.id]:
+                dependents[dep_id].append(spec)
+
+        # Kahn's algorithm to find a topological order (and any cycle)
+        indegree = {sid: len(d) for sid, d in deps.items()}
+        topo = [s for s in specs if not indegree[s.id]]
+        for spec in topo:
+            for child in dependents[spec.id]:
+                indegree[child.id] -= 1
+                if not indegree[child.id]:
+                    topo.append(child)
+        if len(topo) < len(specs):
+            logger.warning("Circular dependency detected, forcing remaining specs")
+            cyclic = {sid for sid, n in indegree.items() if n}
+            for sid in cyclic:
+                for dep_id in deps[sid] & cyclic:
+                    dependents[dep_id] = [c for c in dependents[dep_id] if c.id != sid]
+                deps[sid] -= cyclic
+            topo.extend(s for s in specs if s.id in cyclic)
+
+        priority: dict[str, int] = {}
+        for spec in reversed(topo):
+            priority[spec.id] = 1 + max(
+                (priority.get(c.id, 0) for c in dependents[spec.id]), default=0
+            )
+        return deps, dependents, priority
+
+    def _can_batch(self, spec: SubAgentSpec) -> bool:
+        """Batched specs must target the Claude API and need no tool loop."""
+        router = self.state.model_router
+        return (
+            spec.batch_eligible and spec.model == "claude" and not spec.include_tools
+            and getattr(router, "_claude_available", False)
+            and getattr(router, "claude", None) is not None
+        )
+
+    async def _run_batch(
+        self, specs: list[SubAgentSpec], orchestration: Orchestration
+    ) -> dict[str, SubAgentResult]:
+        """Run *specs* as one Anthropic Message Batch; spec id → result.
+
+        Raises if the batch cannot be submitted or does not finish within
+        SUB_AGENT_BATCH_TIMEOUT.
+        """
+        timeout = 3600
+        if self.cfg:
+            timeout = self.cfg.get_int("SUB_AGENT_BATCH_TIMEOUT", 3600)
+
+        requests = []
+        for spec in specs:
+            prompt = self._resolve_prompt(spec, orchestration)
+            requests.append({
+                "custom_id": spec.id,
+                "messages": self._build_messages(spec, prompt),
+                "system": self._system_for(
+                    "claude", spec.system_addendum or _get_role_prompt(spec.role, spec.model)
+                ),
+            })
+
+        logger.info(
+            f"[{orchestration.id}] Submitting {len(specs)} sub-agents as a message batch"
+        )
+        start_time = time.monotonic()
+        replies = await self._unless_aborted(asyncio.wait_for(
+            self.state.model_router.claude.batch_chat(requests), timeout=timeout
+        ))
+        duration_ms = int((time.monotonic() - start_time) * 1000)
+
+        results = {}
+        for spec in specs:
+            reply = replies.get(spec.id) or {"error": "Missing from batch results"}
+            if reply.get("error"):
+                results[spec.id] = SubAgentResult(
+                    id=spec.id, role=spec.role, model_used="claude+batch", output="",
+                    error=reply["error"], status=SubAgentStatus.FAILED, duration_ms=duration_ms,
+                )
+            else:
+                results[spec.id] = SubAgentResult(
+                    id=spec.id, role=spec.role, model_used="claude+batch",
+                    output=reply.get("content", ""), status=SubAgentStatus.COMPLETED,
+                    duration_ms=duration_ms,
+                )
+        return results
+
+    def _can_speculate(self, spec: SubAgentSpec) -> bool:
+        """Speculative runs must be free of side effects."""
+        return (
+            spec.speculative and bool(spec.stream_dep) and not spec.include_tools
+            and spec.model != "claude_code" and not spec.use_mcp
+        )
+
+    def _on_stream_chunk(self, spec: SubAgentSpec, chunk: str, orchestration: Orchestration) -> None:
+        """Track *spec*'s streamed output; launch speculative dependents once
+        enough of it has arrived."""
+        waiting = self._speculation_watch.get(spec.id)
+        if not waiting:
+            return
+        parts = self._partial_output.setdefault(spec.id, [])
+        parts.append(chunk)
+        if sum(map(len, parts)) < _SPECULATIVE_MIN_CHARS:
+            return
+        del self._speculation_watch[spec.id]
+        snapshot = "".join(self._partial_output.pop(spec.id))
+        partial = SubAgentResult(
+            id=spec.id, role=spec.role, model_used=spec.model or "auto",
+            output=snapshot, status=SubAgentStatus.COMPLETED,
+        )
+        for child in waiting:
+            if set(child.depends_on) - {spec.id} - orchestration.results.keys():
+                continue  # Other dependencies still outstanding
+            prompt = self._resolve_prompt(child, orchestration, {spec.id: partial})
+            task = self._track(asyncio.create_task(self._run_sub_agent(child, orchestration, prompt)))
+            self._speculative[child.id] = (spec.id, snapshot, task)
+            logger.info(
+                f"[{orchestration.id}] Speculatively started {child.id} on "
+                f"{len(snapshot)} chars of {spec.id}"
+            )
+
+    async def _take_speculative(
+        self, spec: SubAgentSpec, orchestration: Orchestration
+    ) -> SubAgentResult | None:
+        """Return *spec*'s speculative result if it saw (nearly) the final input.
+
+        The speculative run is kept when its dependency completed with
+        output that extends the snapshot by no more than the coverage
+        margin; otherwise it is cancelled and the caller runs *spec* anew.
+        """
+        entry = self._speculative.pop(spec.id, None)
+        if entry is None:
+            return None
+        dep_id, snapshot, task = entry
+        final = orchestration.results.get(dep_id)
+        if (
+            final is not None
+            and final.status == SubAgentStatus.COMPLETED
+            and final.output.startswith(snapshot)
+            and len(snapshot) >= _SPECULATIVE_MIN_COVERAGE * len(final.output)
+        ):
+            try:
+                result = await task
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[{orchestration.id}] Speculative {spec.id} failed: {e}")
+                return None
+            if result.status == SubAgentStatus.COMPLETED:
+                logger.info(f"[{orchestration.id}] Speculative {spec.id} accepted")
+                return result
+            return None
+        if not task.done():
+            task.cancel()
+        elif not task.cancelled():
+            task.exception()  # Retrieve so a failed discarded run isn't reported as unhandled
+        logger.info(f"[{orchestration.id}] Speculative {spec.id} discarded; {dep_id} changed")
+        return None
+
+    async def _execute_layers_distributed(self, orchestration: Orchestration, task_stream) -> None:
+        """Run sub-agents layer by layer via Redis Streams."""
+        # Dependency layers, precomputed with the orchestration
+        by_id = {s.id: s for s in orchestration.specs}
+        layers = [[by_id[sid] for sid in layer] for layer in orchestration.schedule["layers"]]
+
+        for layer_idx, layer in enumerate(layers):
+            if self.parent_abort.is_set():
+                raise AgentAbortError("Orchestration aborted by user")
+
+            logger.info(
+                f"[{orchestration.id}] Executing layer {layer_idx + 1}/{len(layers)}: "
+                f"{[s.id for s in layer]}"
+            )
+
+            await self._execute_layer_distributed(layer, orchestration, task_stream)
+
+    async def _record_result(
+        self, spec: SubAgentSpec, result: Any, orchestration: Orchestration
+    ) -> None:
+        """Store a sub-agent's result (or exception) and notify the UI."""
+        if isinstance(result, Exception):
+            logger.error(f"[{orchestration.id}] Sub-agent {spec.id} failed: {result}")
+            orchestration.results[spec.id] = SubAgentResult(
+                id=spec.id,
+                role=spec.role,
+                model_used=spec.model or "unknown",
+                output="",
+                error=str(result),
+                status=SubAgentStatus.FAILED,
+            )
+        else:
+            orchestration.results[spec.id] = result
+
+        # Notify UI of completion (after any progress still buffered)
+        if self.ws_id:
+            await self._progress.flush()
+            r = orchestration.results[spec.id]
+            await websocket_manager.send_to_client(
+                self.ws_id,
+                {
+                    "type": "sub_agent_complete",
+                    "orchestration_id": orchestration.id,
+                    "sub_agent_id": spec.id,
+                    "sub_agent_role": spec.role.value,
+                    "sub_agent_model": r.model_used,
+                    "sub_agent_status": r.status.value,
+                    "content": r.output[:500] if r.output else r.error[:200],
+                    "duration_ms": r.duration_ms,
+                },
+            )
+
     def _get_task_stream(self):
         """Get the distributed task stream, if clustering is active."""
         try:
@@ -539,16 +1064,14 @@ class SubAgentOrchestrator:
 
     async def _execute_layer_distributed(
         self, layer: list, orchestration, task_stream
-    ) -> list:
+    ) -> None:
         """Execute a layer of sub-agents via Redis Streams.
 
-        Publishes each sub-agent as a task, then waits for results.
-        Returns a list of SubAgentResult (or Exception) per spec.
+        Publishes every sub-agent in the layer as a task at once, then
+        records each result (and notifies the UI) as soon as it arrives
+        rather than after the slowest task in the layer.
         """
-        import json
-
-        task_ids = []
-        for spec in layer:
+        async def _publish(spec: SubAgentSpec) -> str:
             # Resolve the prompt for this spec
             prompt = self._resolve_prompt(spec, orchestration)
 
@@ -560,84 +1083,93 @@ class SubAgentOrchestrator:
                     "role": spec.role.value,
                     "prompt": prompt,
                     "model": spec.model or "",
-                    "max_tokens": spec.max_tokens,
-                    "dependencies": spec.dependencies,
+                    "timeout_seconds": spec.timeout_seconds,
+                    "depends_on": list(spec.depends_on),
                 },
                 priority="normal",
                 conv_id=self.conv_id,
                 role=spec.role.value,
                 model_hint=spec.model or "",
                 parent_id=orchestration.id,
-                timeout_ms=(spec.max_tokens // 4) * 1000 or 60_000,
+                timeout_ms=spec.timeout_seconds * 1000,
             )
-            task_ids.append((spec, task_id))
 
             logger.info(
                 f"[{orchestration.id}] Published sub-agent {spec.id} "
                 f"to stream (task_id={task_id})"
             )
+            return task_id
 
-        # Wait for all results
+        # Publish the whole layer concurrently: one Redis round trip of
+        # latency instead of one per spec
+        published = await asyncio.gather(*(_publish(spec) for spec in layer))
+        task_ids = list(zip(layer, published))
+
+        # Wait for results, handling each as it completes
         timeout = 120  # 2 minutes per layer
         if self.cfg:
             timeout = self.cfg.get_int("SUB_AGENT_TIMEOUT", 120)
 
-        stream_results = await task_stream.await_results(
-            [tid for _, tid in task_ids],
-            timeout=timeout,
-        )
-
-        # Convert stream results back to SubAgentResult
-        results = []
-        for spec, task_id in task_ids:
-            stream_result = stream_results.get(task_id)
-
-            if not stream_result:
-                results.append(SubAgentResult(
-                    id=spec.id,
-                    role=spec.role,
-                    model_used=spec.model or "unknown",
-                    output="",
-                    error="Timed out waiting for distributed result",
-                    status=SubAgentStatus.FAILED,
-                ))
-            elif stream_result.get("status") == "completed":
-                result_data = stream_result.get("result", "")
-                if isinstance(result_data, dict):
-                    output = result_data.get("output", str(result_data))
-                else:
-                    output = str(result_data)
+        waiters = {
+            asyncio.create_task(task_stream.await_result(task_id, timeout=timeout)): spec
+            for spec, task_id in task_ids
+        }
+        for waiter in waiters:
+            self._track(waiter)
+        pending = set(waiters)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in done:
+                spec = waiters[waiter]
+                try:
+                    result = self._distributed_result(spec, waiter.result())
+                except Exception as exc:
+                    result = exc
+                await self._record_result(spec, result, orchestration)
 
-                results.append(SubAgentResult(
-                    id=spec.id,
-                    role=spec.role,
-                    model_used=stream_result.get("agent_id", spec.model or "distributed"),
-                    output=output,
-                    status=SubAgentStatus.COMPLETED,
-                ))
+    @staticmethod
+    def _distributed_result(spec: SubAgentSpec, stream_result: dict | None) -> SubAgentResult:
+        """Convert a Redis Streams task result into a SubAgentResult."""
+        if not stream_result:
+            return SubAgentResult(
+                id=spec.id,
+                role=spec.role,
+                model_used=spec.model or "unknown",
+                output="",
+                error="Timed out waiting for distributed result",
+                status=SubAgentStatus.FAILED,
+            )
+        if stream_result.get("status") == "completed":
+            result_data = stream_result.get("result", "")
+            if isinstance(result_data, dict):
+                output = result_data.get("output", str(result_data))
             else:
-                results.append(SubAgentResult(
-                    id=spec.id,
-                    role=spec.role,
-                    model_used=spec.model or "unknown",
-                    output="",
-                    error=stream_result.get("error", "Unknown error"),
-                    status=SubAgentStatus.FAILED,
-                ))
+                output = str(result_data)
 
-        return results
-
-    async def _run_sub_agent_with_semaphore(
-        self, spec: SubAgentSpec, orchestration: Orchestration
-    ) -> SubAgentResult:
-        """Run a sub-agent with concurrency control."""
-        async with self._semaphore:
-            return await self._run_sub_agent(spec, orchestration)
+            return SubAgentResult(
+                id=spec.id,
+                role=spec.role,
+                model_used=stream_result.get("agent_id", spec.model or "distributed"),
+                output=output,
+                status=SubAgentStatus.COMPLETED,
+            )
+        return SubAgentResult(
+            id=spec.id,
+            role=spec.role,
+            model_used=spec.model or "unknown",
+            output="",
+            error=stream_result.get("error", "Unknown error"),
+            status=SubAgentStatus.FAILED,
+        )
 
     async def _run_sub_agent(
-        self, spec: SubAgentSpec, orchestration: Orchestration
+        self, spec: SubAgentSpec, orchestration: Orchestration, prompt: str | None = None
     ) -> SubAgentResult:
-        """Execute a single sub-agent. Routes to the appropriate execution path."""
+        """Execute a single sub-agent. Routes to the appropriate execution path.
+
+        *prompt* overrides the prompt resolved from dependency results
+        (used for speculative runs).
+        """
         start_time = time.monotonic()
 
         # Check abort
@@ -665,24 +1197,51 @@ class SubAgentOrchestrator:
 
         # Notify UI of start
         if self.ws_id:
-            await websocket_manager.send_to_client(
-                self.ws_id,
-                {
-                    "type": "sub_agent_progress",
-                    "orchestration_id": orchestration.id,
-                    "sub_agent_id": spec.id,
-                    "sub_agent_role": spec.role.value,
-                    "content": f"Starting {spec.role.value} ({spec.model or 'auto'})...",
-                },
-            )
+            self._progress.enqueue({
+                "type": "sub_agent_progress",
+                "orchestration_id": orchestration.id,
+                "sub_agent_id": spec.id,
+                "sub_agent_role": spec.role.value,
+                "content": f"Starting {spec.role.value} ({spec.model or 'auto'})...",
+            })
 
         # Build the prompt — inject dependency results
-        prompt = self._resolve_prompt(spec, orchestration)
+        if prompt is None:
+            prompt = self._resolve_prompt(spec, orchestration)
 
         # Get role-specific system addendum
         role_prompt = _get_role_prompt(spec.role, spec.model)
         system_addendum = spec.system_addendum or role_prompt
 
+        # Replay an earlier output for identical inputs, if cached
+        cache = self._response_cache(spec)
+        if cache:
+            context = self._context_prefix if spec.include_context else ()
+            cache_scope = make_scope(spec.role.value, spec.model or "auto", system_addendum, context)
+            cache_key = make_key(cache_scope, prompt)
+            # Verifiers never take a near-match: "X is 330m" vs "X is 300m"
+            semantic_prompt = "" if spec.role == SubAgentRole.VERIFIER else prompt
+            cached = await cache.lookup(cache_key, cache_scope, semantic_prompt)
+            if cached is not None:
+                duration_ms = int((time.monotonic() - start_time) * 1000)
+                logger.info(
+                    f"[{orchestration.id}] Sub-agent {spec.id} ({spec.role.value}) "
+                    f"served from response cache"
+                )
+                try:
+                    await work_registry.update(spec.id, "completed",
+                                               {"duration_ms": duration_ms, "cached": True})
+                except Exception:
+                    pass
+                return SubAgentResult(
+                    id=spec.id,
+                    role=spec.role,
+                    model_used=f"{spec.model or 'auto'}+cache",
+                    output=cached,
+                    status=SubAgentStatus.COMPLETED,
+                    duration_ms=duration_ms,
+                )
+
         try:
             # Route to the right execution path
             if spec.model == "claude_code" or spec.use_mcp:
@@ -697,6 +1256,9 @@ class SubAgentOrchestrator:
             duration_ms = int((time.monotonic() - start_time) * 1000)
             result.duration_ms = duration_ms
 
+            if cache and result.status == SubAgentStatus.COMPLETED and result.output:
+                await cache.update(cache_key, result.output, cache_scope, semantic_prompt)
+
             logger.info(
                 f"[{orchestration.id}] Sub-agent {spec.id} ({spec.role.value}) "
                 f"completed in {duration_ms}ms via {result.model_used}"
@@ -747,6 +1309,189 @@ class SubAgentOrchestrator:
                 duration_ms=duration_ms,
             )
 
+    def _claude_code_client(self):
+        """The Claude Code CLI client, from the state or the model router."""
+        client = getattr(self.state, "claude_code_client", None)
+        if client is None:
+            client = getattr(getattr(self.state, "model_router", None), "claude_code", None)
+        return client
+
+    def _base_system(self, model_name: str) -> str:
+        """Base system prompt for *model_name*, built on first use."""
+        system = self._system_cache.get(model_name)
+        if system is None:
+            from core.system_prompt import build_system_prompt
+
+            system = self._system_cache[model_name] = build_system_prompt(
+                self.cfg,
+                getattr(self.state, "plugin_manager", None),
+                tool_calling_mode="native",
+                model=model_name,
+            )
+        return system
+
+    def _system_for(self, model_name: str, system_addendum: str) -> str | list[dict]:
+        """System prompt for a sub-agent: the shared base plus its role addendum."""
+        # The base prompt is the same for every sub-agent on a model; only
+        # the role addendum differs.
+        base_system = self._base_system(model_name)
+        if model_name == "claude":
+            # Put the addendum after a cache breakpoint so the base prompt
+            # (and the tool list before it) is a shared cached prefix.
+            system: list[dict] = [
+                {"type": "text", "text": base_system, "cache_control": {"type": "ephemeral"}},
+            ]
+            if system_addendum:
+                system.append({"type": "text", "text": system_addendum})
+            return system
+        if system_addendum:
+            return f"{base_system}\n\n{system_addendum}"
+        return base_system
+
+    def _tools_for(self, model_name: str, prompt: str) -> list[dict] | None:
+        """Tool definitions for *model_name* in its API format.
+
+        The Anthropic list is prompt-independent and built once; Ollama
+        tools are filtered per prompt by ToolSelector.
+        """
+        tool_executor = getattr(self.state, "tool_executor", None)
+        if not tool_executor:
+            return None
+        if model_name == "claude":
+            tools = self._tools_cache.get(model_name)
+            if tools is None:
+                tools = self._tools_cache[model_name] = tool_executor.to_anthropic_tools()
+            return tools
+        if model_name == "ollama":
+            return tool_executor.to_ollama_tools(message=prompt)
+        return None
+
+    def _claude_code_system(self, system_addendum: str) -> str:
+        """System prompt for a Claude Code sub-agent with its role addendum."""
+        system = self._base_system("claude_code")
+        if system_addendum:
+            system += f"\n\n{system_addendum}"
+        return system
+
+    async def _prewarm_claude_code(self, orchestration: Orchestration) -> None:
+        """Spawn CLI processes for the orchestration's Claude Code sub-agents.
+
+        Startup (binary load, auth, MCP connect) then overlaps with earlier
+        layers instead of delaying each Claude Code sub-agent.  Sub-agents
+        beyond the pool size are queued and spawned one at a time as warm
+        sessions are taken (see _prewarm_next_claude_code).
+        """
+        if not self.ws_id:
+            return  # Non-streaming path uses chat() directly
+        claude_code = self._claude_code_client()
+        if not claude_code or not hasattr(claude_code, "prewarm"):
+            return
+        systems = [
+            self._claude_code_system(spec.system_addendum or _get_role_prompt(spec.role, spec.model))
+            for spec in orchestration.specs
+            if spec.model == "claude_code" or spec.use_mcp
+        ]
+        pool_size = getattr(claude_code, "pool_size", len(systems))
+        self._claude_code_backlog.extend(systems[pool_size:])
+        for system in systems[:pool_size]:
+            try:
+                await self._prewarm_one(claude_code, system)
+            except Exception as e:
+                logger.debug(f"[{orchestration.id}] Claude Code prewarm skipped: {e}")
+
+    def _prewarm_next_claude_code(self, claude_code: Any) -> None:
+        """Start spawning the next queued Claude Code process in the background."""
+        if not self._claude_code_backlog:
+            return
+        system = self._claude_code_backlog.popleft()
+        task = self._track(asyncio.create_task(self._prewarm_one(claude_code, system)))
+        self._prewarm_tasks.add(task)
+        task.add_done_callback(self._prewarm_tasks.discard)
+
+    async def _prewarm_one(self, claude_code: Any, system: str) -> None:
+        session = await claude_code.prewarm(system)
+        if session is not None:
+            self._warm_sessions.append(session)
+
+    async def _discard_warm_claude_code(self) -> None:
+        """Kill pre-spawned processes the orchestration never used.
+
+        Covers aborts, failures and sub-agents answered from the cache, so
+        idle CLIs (and their MCP servers) don't outlive the orchestration.
+        """
+        self._claude_code_backlog.clear()
+        if self._prewarm_tasks:
+            await asyncio.gather(*self._prewarm_tasks, return_exceptions=True)
+        if not self._warm_sessions:
+            return
+        claude_code = self._claude_code_client()
+        if claude_code is not None and hasattr(claude_code, "discard"):
+            claude_code.discard(self._warm_sessions)
+        self._warm_sessions.clear()
+
+    def _build_messages(self, spec: SubAgentSpec, prompt: str) -> list[dict]:
+        """Shared conversation context (if the spec wants it) plus the prompt."""
+        user_msg = {"role": "user", "content": prompt}
+        if spec.include_context:
+            return [*self._context_prefix, user_msg]
+        return [user_msg]
+
+    def _plan_step_hash(self, spec: SubAgentSpec, orchestration: Orchestration) -> str:
+        """Hash of everything a plan step's output depends on, or "" if the
+        step may not be replayed from the plan-template cache.
+
+        Tool-using steps fetch fresh data on every run and Claude Code / MCP
+        steps have side effects, so only pure-reasoning steps qualify.
+        """
+        if not (orchestration.template_key and spec.input_hash):
+            return ""
+        if not getattr(self.state, "plan_template_cache", None):
+            return ""
+        if spec.include_tools or spec.model == "claude_code" or spec.use_mcp:
+            return ""
+        context = self._context_prefix if spec.include_context else ()
+        scope = make_scope(spec.role.value, spec.model or "auto", spec.system_addendum, context)
+        return make_key(scope, f"{spec.input_hash}\x00{self._resolve_prompt(spec, orchestration)}")
+
+    def _replay_plan_step(
+        self, spec: SubAgentSpec, orchestration: Orchestration, step_hash: str
+    ) -> SubAgentResult | None:
+        """Return the stored result for an unchanged plan step, if any."""
+        if not step_hash:
+            return None
+        output = self.state.plan_template_cache.lookup(orchestration.template_key, spec.id, step_hash)
+        if output is None:
+            return None
+        logger.info(f"[{orchestration.id}] Plan step {spec.id} replayed from plan template cache")
+        return SubAgentResult(
+            id=spec.id,
+            role=spec.role,
+            model_used="plan-template",
+            output=output,
+            status=SubAgentStatus.COMPLETED,
+        )
+
+    def _store_plan_step(
+        self, spec: SubAgentSpec, orchestration: Orchestration, step_hash: str, result: SubAgentResult
+    ) -> None:
+        if result.status == SubAgentStatus.COMPLETED and result.output:
+            self.state.plan_template_cache.store(orchestration.template_key, spec.id, step_hash, result.output)
+
+    def _response_cache(self, spec: SubAgentSpec):
+        """Return the shared response cache if *spec*'s output may be cached.
+
+        Synthesizers merge fresh upstream results, and sub-agents with
+        tools (Claude Code / MCP included) act on the filesystem or fetch
+        live data — replaying their text would skip the side effects and
+        serve stale results — so none of them is cached.
+        """
+        cache = getattr(self.state, "sub_agent_cache", None)
+        if not cache or spec.role == SubAgentRole.SYNTHESIZER:
+            return None
+        if spec.include_tools or spec.model == "claude_code" or spec.use_mcp:
+            return None
+        return cache
+
     async def _run_claude_code_sub_agent(
         self,
         spec: SubAgentSpec,
@@ -755,60 +1500,63 @@ class SubAgentOrchestrator:
         orchestration: Orchestration,
     ) -> SubAgentResult:
         """Run a sub-agent via Claude Code CLI subprocess."""
-        claude_code = getattr(self.state, "claude_code_client", None)
+        claude_code = self._claude_code_client()
         if not claude_code:
             raise RuntimeError("Claude Code client not available for sub-agent")
 
         # Apply Claude Code semaphore (heavier resource usage)
         async with self._claude_code_semaphore:
             # Build system prompt with role addendum
-            from core.system_prompt import build_system_prompt
-
-            system = build_system_prompt(
-                self.cfg,
-                getattr(self.state, "plugin_manager", None),
-                tool_calling_mode="native",
-                model="claude_code",
-            )
-            if system_addendum:
-                system += f"\n\n{system_addendum}"
+            system = self._claude_code_system(system_addendum)
 
             # Build messages for Claude Code
-            messages = []
-            if spec.include_context and self.messages:
-                # Include conversation context (truncated for claude_code)
-                context_limit = 10  # Keep last 10 messages for context
-                messages = list(self.messages[-context_limit:])
-
-            messages.append({"role": "user", "content": prompt})
+            messages = self._build_messages(spec, prompt)
 
             # Stream progress to UI if WebSocket available
             if self.ws_id:
                 # Use streaming mode
-                full_text = ""
-                async for chunk in claude_code.chat_stream(messages, system):
-                    if self.parent_abort.is_set():
-                        raise AgentAbortError("Sub-agent aborted")
-
-                    if isinstance(chunk, str):
-                        full_text += chunk
-                        # Send progress periodically (every ~200 chars)
-                        if len(full_text) % 200 < len(chunk):
-                            await websocket_manager.send_to_client(
-                                self.ws_id,
-                                {
-                                    "type": "sub_agent_progress",
-                                    "orchestration_id": orchestration.id,
-                                    "sub_agent_id": spec.id,
-                                    "content": full_text[-500:],
-                                },
-                            )
+                parts: list[str] = []
+                tail: deque[str] = deque(maxlen=PROGRESS_TAIL_CHARS)
+                last_push = time.monotonic()
+                unsent = False
+
+                def _push_progress() -> None:
+                    self._progress.enqueue({
+                        "type": "sub_agent_progress",
+                        "orchestration_id": orchestration.id,
+                        "sub_agent_id": spec.id,
+                        "content": "".join(tail),
+                    })
+
+                # Use a pre-spawned CLI process (see _prewarm_claude_code)
+                async with claude_code.acquire_session(system) as session:
+                    # Boot the next queued sub-agent's process while this one runs
+                    self._prewarm_next_claude_code(claude_code)
+                    async for chunk in session.chat_stream(messages):
+                        if self.parent_abort.is_set():
+                            raise AgentAbortError("Sub-agent aborted")
+
+                        if isinstance(chunk, str):
+                            parts.append(chunk)
+                            self._on_stream_chunk(spec, chunk, orchestration)
+                            # Send progress at most every PROGRESS_INTERVAL
+                            tail.extend(chunk)
+                            now = time.monotonic()
+                            if now - last_push >= PROGRESS_INTERVAL:
+                                _push_progress()
+                                last_push = now
+                                unsent = False
+                            else:
+                                unsent = True
+
+                if unsent:
+                    _push_progress()
 
                 return SubAgentResult(
                     id=spec.id,
                     role=spec.role,
                     model_used="claude_code",
-                    output=full_text,
+                    output="".join(parts),
                     status=SubAgentStatus.COMPLETED,
                 )
             else:
@@ -834,39 +1582,19 @@ class SubAgentOrchestrator:
     ) -> SubAgentResult:
         """Run a sub-agent via AgentAttempt (Ollama/Claude API path)."""
         from core.agent_attempt import AgentAttempt
-        from core.system_prompt import build_system_prompt
 
         # Determine model — auto-route if not specified
         model_name = spec.model
         if not model_name:
             model_name = self.state.model_router.select_model(prompt)
 
-        # Build system prompt
-        system = build_system_prompt(
-            self.cfg,
-            getattr(self.state, "plugin_manager", None),
-            tool_calling_mode="native",
-            model=model_name,
-        )
-        if system_addendum:
-            system += f"\n\n{system_addendum}"
+        system = self._system_for(model_name, system_addendum)
 
         # Build messages
-        messages = []
-        if spec.include_context and self.messages:
-            context_limit = 10
-            messages = list(self.messages[-context_limit:])
-
-        messages.append({"role": "user", "content": prompt})
+        messages = self._build_messages(spec, prompt)
 
         # Build tool definitions
-        tool_executor = getattr(self.state, "tool_executor", None)
-        tools_for_api = None
-        if spec.include_tools and tool_executor and model_name != "claude_code":
-            if model_name == "claude":
-                tools_for_api = tool_executor.to_anthropic_tools()
-            elif model_name == "ollama":
-                tools_for_api = tool_executor.to_ollama_tools(message=prompt)
+        tools_for_api = self._tools_for(model_name, prompt) if spec.include_tools else None
 
         # Use a virtual ws_id for this sub-agent so its streaming messages
         # get transformed into sub_agent_progress messages
@@ -874,36 +1602,41 @@ class SubAgentOrchestrator:
         real_ws_id = self.ws_id
 
         if real_ws_id:
-            # Register a transform that converts stream_* messages to sub_agent_*
+            # Register a transform that converts stream_* messages to
+            # sub_agent_progress updates, delivered through the batcher
+            progress = self._progress
+
             def _transform(message: dict) -> tuple[str, dict | None]:
                 msg_type = message.get("type", "")
                 if msg_type == "stream_start":
-                    return real_ws_id, {
+                    progress.enqueue({
                         "type": "sub_agent_progress",
                         "orchestration_id": orchestration.id,
                         "sub_agent_id": spec.id,
                         "sub_agent_role": spec.role.value,
                         "content": f"[{spec.role.value} starting on {model_name}]",
-                    }
+                    })
                 elif msg_type == "stream_chunk":
-                    return real_ws_id, {
+                    self._on_stream_chunk(spec, message.get("content", ""), orchestration)
+                    progress.enqueue({
                         "type": "sub_agent_progress",
                         "orchestration_id": orchestration.id,
                         "sub_agent_id": spec.id,
                         "content": message.get("content", ""),
-                    }
-                elif msg_type == "stream_end":
-                    # Suppress — orchestrator sends sub_agent_complete
-                    return real_ws_id, None
+                    })
                 elif msg_type == "system":
-                    return real_ws_id, {
+                    progress.enqueue({
                         "type": "sub_agent_progress",
                         "orchestration_id": orchestration.id,
                         "sub_agent_id": spec.id,
                         "content": f"[{message.get('content', '')}]",
-                    }
-                # Pass through anything else
-                return real_ws_id, message
+                    })
+                elif msg_type != "stream_end":
+                    # Pass through anything else
+                    return real_ws_id, message
+                # Progress is sent by the batcher; stream_end is suppressed
+                # because the orchestrator sends sub_agent_complete
+                return real_ws_id, None
 
             websocket_manager.register_transform(virtual_ws_id, _transform)
 
@@ -964,7 +1697,7 @@ class SubAgentOrchestrator:
 
         # Single result — return directly
         if len(completed) == 1:
-            return list(completed.values())[0].output
+            return next(iter(completed.values())).output
 
         # If a synthesizer sub-agent already ran and succeeded, use its output directly
         # (avoids double-synthesis where we'd call another LLM to re-merge)
@@ -977,20 +1710,17 @@ class SubAgentOrchestrator:
 
         # Build/Review: if reviewer rates high (>7), return builder output with review notes
         if orchestration.strategy in ("build_review", "build_review_code"):
-            builder_result = None
-            reviewer_result = None
+            # First completed result per role
+            by_role: dict[SubAgentRole, SubAgentResult] = {}
             for r in completed.values():
-                if r.role == SubAgentRole.BUILDER:
-                    builder_result = r
-                elif r.role == SubAgentRole.REVIEWER:
-                    reviewer_result = r
+                by_role.setdefault(r.role, r)
+            builder_result = by_role.get(SubAgentRole.BUILDER)
+            reviewer_result = by_role.get(SubAgentRole.REVIEWER)
 
             if builder_result and reviewer_result:
                 # Check if review mentions high quality
-                review_text = reviewer_result.output.lower()
                 # Look for ratings 8/10, 9/10, 10/10
-                import re
-                rating_match = re.search(r"(\d+)\s*/\s*10", review_text)
+                rating_match = _RATING_RE.search(reviewer_result.output)
                 if rating_match and int(rating_match.group(1)) >= 8:
                     # High quality — return builder output with brief review note
                     return (
@@ -1000,64 +1730,97 @@ class SubAgentOrchestrator:
                     )
 
         # General synthesis — ask an LLM to merge results
-        synthesis_prompt = "Merge the following outputs into a single coherent response:\n\n"
+        sections = ["Merge the following outputs into a single coherent response:\n\n"]
         for r in completed.values():
             role_label = r.role.value.capitalize()
-            synthesis_prompt += f"## {role_label} ({r.model_used})\n{r.output}\n\n"
-        synthesis_prompt += (
+            sections.append(f"## {role_label} ({r.model_used})\n{r.output}\n\n")
+        sections.append(
             "---\nProvide a unified, well-structured response that incorporates "
             "all the above. Do not mention that multiple agents were used."
         )
+        synthesis_prompt = "".join(sections)
 
-        # Use the model router for synthesis (prefer Claude for quality)
+        # Recurring merges of the same outputs reuse the earlier synthesis
+        cache = getattr(self.state, "sub_agent_cache", None)
+        if cache:
+            cache_scope = make_scope(
+                SubAgentRole.SYNTHESIZER.value, "merge", orchestration.strategy, ()
+            )
+            cache_key = make_key(cache_scope, synthesis_prompt)
+            # Exact key only: a near-identical merge can still differ in
+            # the lines that matter (a changed value, a different verdict)
+            cached = await cache.lookup(cache_key, cache_scope, "")
+            if cached is not None:
+                logger.info(f"[{orchestration.id}] Synthesis served from response cache")
+                return cached
+
+        # Fallback: concatenate results (ready before the LLM is asked)
+        fallback = "\n\n---\n\n".join(
+            f"**{r.role.value.capitalize()}** ({r.model_used}):\n{r.output}"
+            for r in completed.values()
+        )
+
+        # Use the model router for synthesis (prefer Claude for quality);
+        # an abort cancels it rather than sitting out the timeout
         try:
-            synth_result = await asyncio.wait_for(
+            synth_result = await self._unless_aborted(asyncio.wait_for(
                 self.state.model_router.chat(
                     [{"role": "user", "content": synthesis_prompt}],
                     system=_get_role_prompt(SubAgentRole.SYNTHESIZER),
                     force_model="claude" if self.state.model_router._claude_available else None,
                 ),
                 timeout=60,
-            )
-            return synth_result.get("content", synthesis_prompt)
+            ))
+        except AgentAbortError:
+            raise
         except Exception as exc:
             logger.warning(f"Synthesis LLM call failed, falling back to concatenation: {exc}")
-            # Fallback: concatenate results
-            parts = []
-            for r in completed.values():
-                parts.append(f"**{r.role.value.capitalize()}** ({r.model_used}):\n{r.output}")
-            return "\n\n---\n\n".join(parts)
-
-    def _resolve_prompt(self, spec: SubAgentSpec, orchestration: Orchestration) -> str:
+            return fallback
+        content = synth_result.get("content", synthesis_prompt)
+        if cache and synth_result.get("content"):
+            await cache.update(cache_key, content, cache_scope, "")
+        return content
+
+    def _resolve_prompt(
+        self, spec: SubAgentSpec, orchestration: Orchestration, overrides: dict | None = None
+    ) -> str:
         """Replace {{result:spec_id}} placeholders with actual results.
 
         If the prompt has no explicit placeholders but has dependencies,
         automatically appends all dependency results so the sub-agent has context.
+        *overrides* (spec_id → SubAgentResult) take precedence over
+        ``orchestration.results``.
         """
         prompt = spec.prompt
-        has_placeholders = "{{result:" in prompt
-
-        if has_placeholders:
-            # Explicit placeholders — replace them
-            for dep_id in spec.depends_on:
-                placeholder = f"{{{{result:{dep_id}}}}}"
-                if dep_id in orchestration.results:
-                    dep_result = orchestration.results[dep_id]
+        if not spec.depends_on:
+            # Nothing to inject; placeholders for non-dependencies stay as written
+            return prompt
+        results = {**orchestration.results, **overrides} if overrides else orchestration.results
+
+        if spec.prompt_template_parts:
+            # Explicit placeholders — interleave the pre-split template
+            # with the dependency results
+            literals = spec.prompt_template_parts
+            parts = [literals[0]]
+            for dep_id, literal in zip(spec.prompt_template_deps, literals[1:]):
+                if dep_id not in spec.depends_on:
+                    parts.append(f"{{{{result:{dep_id}}}}}")
+                elif dep_id in results:
+                    dep_result = results[dep_id]
                     if dep_result.status == SubAgentStatus.COMPLETED:
-                        prompt = prompt.replace(placeholder, dep_result.output)
+                        parts.append(dep_result.output)
                     else:
-                        prompt = prompt.replace(
-                            placeholder,
-                            f"[{dep_result.role.value} failed: {dep_result.error}]",
-                        )
+                        parts.append(f"[{dep_result.role.value} failed: {dep_result.error}]")
                 else:
-                    prompt = prompt.replace(placeholder, "[result not available]")
-        elif spec.depends_on:
+                    parts.append("[result not available]")
+                parts.append(literal)
+            prompt = "".join(parts)
+        else:
             # No placeholders but has dependencies — auto-append results
             dep_sections = []
             for dep_id in spec.depends_on:
-                if dep_id in orchestration.results:
-                    dep_result = orchestration.results[dep_id]
+                if dep_id in results:
+                    dep_result = results[dep_id]
                     if dep_result.status == SubAgentStatus.COMPLETED and dep_result.output:
                         role_label = dep_result.role.value.capitalize()
                         dep_sections.append(
@@ -1068,7 +1831,7 @@ class SubAgentOrchestrator:
                             f"## {dep_result.role.value.capitalize()} [FAILED]\n{dep_result.error}"
                         )
             if dep_sections:
-                prompt += "\n\n---\n\n" + "\n\n".join(dep_sections)
+                prompt = "".join((prompt, "\n\n---\n\n", "\n\n".join(dep_sections)))
 
         return prompt
 
@@ -1079,29 +1842,33 @@ class SubAgentOrchestrator:
         Returns a list of layers. Each layer contains specs that can run
         concurrently (all their dependencies are in earlier layers).
         """
-        spec_map = {s.id: s for s in specs}
-        remaining = set(s.id for s in specs)
-        completed = set()
-        layers = []
-
-        while remaining:
-            # Find all specs whose dependencies are satisfied
-            layer = []
-            for sid in list(remaining):
-                spec = spec_map[sid]
-                deps = set(spec.depends_on)
-                if deps.issubset(completed):
-                    layer.append(spec)
-
-            if not layer:
-                # Circular dependency — force remaining into one layer
-                logger.warning("Circular dependency detected, forcing remaining specs")
-                layer = [spec_map[sid] for sid in remaining]
-
-            for spec in layer:
-                remaining.discard(spec.id)
-                completed.add(spec.id)
+        # Kahn's algorithm: a spec joins the next layer once its last
+        # dependency has been placed.  Dependencies on unknown ids are never
+        # satisfied, so such specs end up in the forced layer below.
+        order = {s.id: i for i, s in enumerate(specs)}
+        indegree = {s.id: len(s.depends_on) for s in specs}
+        children: dict[str, list[SubAgentSpec]] = {}
+        for spec in specs:
+            for dep_id in spec.depends_on:
+                children.setdefault(dep_id, []).append(spec)
 
+        layers = []
+        layer = [s for s in specs if not indegree[s.id]]
+        placed = 0
+        while layer:
             layers.append(layer)
+            placed += len(layer)
+            next_layer = []
+            for spec in layer:
+                for child in children.get(spec.id, ()):
+                    indegree[child.id] -= 1
+                    if not indegree[child.id]:
+                        next_layer.append(child)
+            layer = sorted(next_layer, key=lambda s: order[s.id])
+
+        if placed < len(specs):
+            # Circular dependency — force remaining into one layer
+            logger.warning("Circular dependency detected, forcing remaining specs")
+            layers.append([s for s in specs if indegree[s.id] > 0])
 
         return layers
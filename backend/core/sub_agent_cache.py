@@ -0,0 +1,396 @@
+"""Sub-Agent Response Cache — skip the LLM for repeated sub-agent inputs.
+
+Recurring orchestrations (periodic reports, repeated verifications, re-run
+plans) often hand a sub-agent exactly the same role, model, prompt and
+context as a previous run.  This cache lets ``SubAgentOrchestrator`` return
+the earlier output instead of paying for another model round trip.
+
+Tiers, checked in order:
+    - Exact: in-memory LRU with TTL, keyed on a blake2b hash of the inputs
+    - Disk (optional): SQLite table so entries survive restarts, behind
+      an in-memory Bloom filter so misses skip the disk entirely.  Expired
+      rows are pruned and the table is capped at DISK_MAX_ROWS.
+    - Semantic (optional, off unless an embedder is passed): cosine match
+      of the prompt embedding against earlier prompts with the same
+      role/model/system/context.  Prompts differing only in a number or a
+      negation can match, so callers must keep it away from work where
+      that matters.
+
+Only successful outputs are stored; the orchestrator decides which specs
+are cacheable at all.
+
+``PlanTemplateCache`` works one level up: for plans whose skeleton (step
+titles, tool hints and dependency edges) recurs, it keeps each step's last
+output together with a hash of the inputs it was produced from, so the
+orchestrator can skip steps whose inputs have not changed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger("nexus.sub_agent_cache")
+
+# Defaults
+CACHE_MAX_SIZE = 256
+CACHE_TTL_SECONDS = 3600
+SEMANTIC_MAX_SIZE = 128
+SEMANTIC_THRESHOLD = 0.95  # Cosine similarity needed for a semantic hit
+PLAN_TEMPLATE_MAX_SIZE = 64
+BLOOM_CAPACITY = 1 << 20
+BLOOM_FP_RATE = 0.01
+DISK_MAX_ROWS = 10_000
+DISK_PRUNE_EVERY = 256  # Disk writes between prunes
+
+
+def make_scope(role: str, model: str, system_addendum: str, context: Sequence[dict]) -> str:
+    """Hash everything that shapes a sub-agent's answer except the prompt."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (role, model, system_addendum):
+        h.update(part.encode())
+        h.update(b"\x00")
+    h.update(json.dumps(context, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def make_key(scope: str, prompt: str) -> str:
+    """Exact-match cache key for a prompt within a scope."""
+    return hashlib.blake2b(f"{scope}\x00{prompt}".encode(), digest_size=16).hexdigest()
+
+
+def plan_template_key(plan: Any) -> str:
+    """Structural hash of a plan: step titles, tool hints and dependencies."""
+    skeleton = tuple(
+        (s.title, getattr(s, "tool_hint", ""), tuple(getattr(s, "depends_on", ())))
+        for s in plan.steps
+    )
+    return hashlib.sha256(repr(skeleton).encode()).hexdigest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys.
+
+    ``may_contain`` never returns False for an added key; it returns True
+    for an absent key with probability about *fp_rate* once *capacity*
+    keys have been added.
+    """
+
+    def __init__(self, capacity: int = BLOOM_CAPACITY, fp_rate: float = BLOOM_FP_RATE):
+        self._size = max(8, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+
+    def _positions(self, key: str):
+        # Double hashing: k positions from two 64-bit halves of one digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self._hashes):
+            yield (h1 + i * h2) % self._size
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def may_contain(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
+
+
+class SqliteBackend:
+    """Persistent key → output store in a local SQLite file.
+
+    Methods are synchronous; ``SubAgentCache`` calls them via
+    ``asyncio.to_thread``.
+    """
+
+    def __init__(self, path: str, max_rows: int = DISK_MAX_ROWS):
+        self._path = path
+        self._max_rows = max_rows
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sub_agent_cache ("
+                "key TEXT PRIMARY KEY, output TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS sub_agent_cache_created "
+                "ON sub_agent_cache (created_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=5)
+
+    def get(self, key: str, ttl: int) -> Optional[str]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT output FROM sub_agent_cache WHERE key = ? AND created_at > ?",
+                (key, time.time() - ttl),
+            ).fetchone()
+        return row[0] if row else None
+
+    def keys(self, ttl: int) -> list[str]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT key FROM sub_agent_cache WHERE created_at > ?",
+                (time.time() - ttl,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def put(self, key: str, output: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sub_agent_cache (key, output, created_at) VALUES (?, ?, ?)",
+                (key, output, time.time()),
+            )
+
+    def prune(self, ttl: int) -> int:
+        """Delete expired rows, then the oldest beyond max_rows; return the count."""
+        with self._connect() as conn:
+            deleted = conn.execute(
+                "DELETE FROM sub_agent_cache WHERE created_at <= ?",
+                (time.time() - ttl,),
+            ).rowcount
+            deleted += conn.execute(
+                "DELETE FROM sub_agent_cache WHERE key IN ("
+                "SELECT key FROM sub_agent_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self._max_rows,),
+            ).rowcount
+        return deleted
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM sub_agent_cache")
+
+
+class SubAgentCache:
+    """Exact + semantic cache of sub-agent outputs.
+
+    Usage:
+        cache = SubAgentCache(backend=...)
+        await cache.start()  # prune the disk tier, load its keys
+        scope = make_scope(role, model, system_addendum, context)
+        key = make_key(scope, prompt)
+        output = await cache.lookup(key, scope, prompt)
+        ...
+        await cache.update(key, output, scope, prompt)
+
+    Pass ``prompt=""`` to skip the semantic tier for a call.
+    """
+
+    def __init__(
+        self,
+        max_size: int = CACHE_MAX_SIZE,
+        ttl: int = CACHE_TTL_SECONDS,
+        backend: SqliteBackend | None = None,
+        embed: Callable[[str], Awaitable[Optional[list[float]]]] | None = None,
+        semantic_threshold: float = SEMANTIC_THRESHOLD,
+    ):
+        self._cache: OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._max_size = max_size
+        self._ttl = ttl
+        self._backend = backend
+        # Keys written to the backend; a negative answer skips the disk.
+        # None (every lookup reads the disk) until start() has loaded it.
+        self._bloom: BloomFilter | None = None
+        self._disk_writes = 0
+        self._embed = embed
+        self._semantic_threshold = semantic_threshold
+        # (scope, unit-norm prompt embedding, output, stored_at)
+        self._semantic: list[tuple[str, Any, str, float]] = []
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    async def start(self) -> None:
+        """Prune the disk tier and build its Bloom filter off the event loop."""
+        if not self._backend:
+            return
+        try:
+            await asyncio.to_thread(self._backend.prune, self._ttl)
+            keys = await asyncio.to_thread(self._backend.keys, self._ttl)
+        except Exception as e:
+            logger.debug(f"Sub-agent cache disk scan failed: {e}")
+            return
+        bloom = BloomFilter()
+        for key in keys:
+            bloom.add(key)
+        self._bloom = bloom
+
+    async def lookup(self, key: str, scope: str = "", prompt: str = "") -> Optional[str]:
+        """Return a cached output for *key* (or a near-identical prompt), if any."""
+        entry = self._cache.get(key)
+        if entry is not None:
+            output, ts = entry
+            if time.time() - ts < self._ttl:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return output
+            del self._cache[key]
+
+        if self._backend and (self._bloom is None or self._bloom.may_contain(key)):
+            try:
+                output = await asyncio.to_thread(self._backend.get, key, self._ttl)
+            except Exception as e:
+                logger.debug(f"Sub-agent cache disk lookup failed: {e}")
+                output = None
+            if output is not None:
+                self._put_memory(key, output)
+                self.hits += 1
+                return output
+
+        if self._embed and prompt and self._semantic:
+            output = await self._semantic_lookup(scope, prompt)
+            if output is not None:
+                self.semantic_hits += 1
+                return output
+
+        self.misses += 1
+        return None
+
+    async def update(self, key: str, output: str, scope: str = "", prompt: str = "") -> None:
+        """Store a successful output under *key*."""
+        self._put_memory(key, output)
+
+        if self._backend:
+            if self._bloom is not None:
+                self._bloom.add(key)
+            try:
+                await asyncio.to_thread(self._backend.put, key, output)
+                self._disk_writes += 1
+                if self._disk_writes % DISK_PRUNE_EVERY == 0:
+                    await asyncio.to_thread(self._backend.prune, self._ttl)
+            except Exception as e:
+                logger.debug(f"Sub-agent cache disk write failed: {e}")
+
+        if self._embed and prompt:
+            vec = await self._unit_embedding(prompt)
+            if vec is not None:
+                self._semantic.append((scope, vec, output, time.time()))
+                if len(self._semantic) > SEMANTIC_MAX_SIZE:
+                    del self._semantic[0]
+
+    def _put_memory(self, key: str, output: str) -> None:
+        self._cache[key] = (output, time.time())
+        self._cache.move_to_end(key)
+        if len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+
+    async def _unit_embedding(self, text: str):
+        try:
+            embedding = await self._embed(text)
+        except Exception as e:
+            logger.debug(f"Sub-agent cache embedding failed: {e}")
+            return None
+        if not embedding:
+            return None
+        vec = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else None
+
+    async def _semantic_lookup(self, scope: str, prompt: str) -> Optional[str]:
+        vec = await self._unit_embedding(prompt)
+        if vec is None:
+            return None
+        now = time.time()
+        best_score, best_output = self._semantic_threshold, None
+        for entry_scope, entry_vec, output, ts in self._semantic:
+            if entry_scope != scope or now - ts >= self._ttl or entry_vec.shape != vec.shape:
+                continue
+            score = float(np.dot(vec, entry_vec))
+            if score >= best_score:
+                best_score, best_output = score, output
+        return best_output
+
+    def clear(self) -> None:
+        self._cache.clear()
+        self._semantic.clear()
+        if self._bloom is not None:
+            self._bloom.clear()
+        if self._backend:
+            try:
+                self._backend.clear()
+            except Exception as e:
+                logger.debug(f"Sub-agent cache disk clear failed: {e}")
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.semantic_hits + self.misses
+        return {
+            "size": len(self._cache),
+            "max_size": self._max_size,
+            "semantic_size": len(self._semantic),
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.semantic_hits) / total, 3) if total > 0 else 0.0,
+        }
+
+
+class PlanTemplateCache:
+    """Per-step outputs of recurring plan shapes.
+
+    Usage:
+        output = cache.lookup(template_key, step_id, input_hash)
+        ...
+        cache.store(template_key, step_id, input_hash, output)
+    """
+
+    def __init__(self, max_templates: int = PLAN_TEMPLATE_MAX_SIZE, ttl: int = CACHE_TTL_SECONDS):
+        # template_key → {step_id: (input_hash, output, stored_at)}
+        self._templates: OrderedDict[str, dict[str, tuple[str, str, float]]] = OrderedDict()
+        self._max_templates = max_templates
+        self._ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, template_key: str, step_id: str, input_hash: str) -> Optional[str]:
+        """Return the step's stored output if it was produced from *input_hash*."""
+        steps = self._templates.get(template_key)
+        entry = steps.get(step_id) if steps else None
+        if entry is not None:
+            stored_hash, output, ts = entry
+            if stored_hash == input_hash and time.time() - ts < self._ttl:
+                self._templates.move_to_end(template_key)
+                self.hits += 1
+                return output
+        self.misses += 1
+        return None
+
+    def store(self, template_key: str, step_id: str, input_hash: str, output: str) -> None:
+        """Record *output* as the step's latest result for *input_hash*."""
+        steps = self._templates.get(template_key)
+        if steps is None:
+            steps = self._templates[template_key] = {}
+        steps[step_id] = (input_hash, output, time.time())
+        self._templates.move_to_end(template_key)
+        if len(self._templates) > self._max_templates:
+            self._templates.popitem(last=False)
+
+    def clear(self) -> None:
+        self._templates.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "templates": len(self._templates),
+            "max_templates": self._max_templates,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total > 0 else 0.0,
+        }
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import os
-from datetime import datetime, timezone, timedelta
+from datetime import datetime
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -11,6 +12,117 @@ if TYPE_CHECKING:
     from plugins.manager import PluginManager
 
 
+_TONE_INSTRUCTIONS = {
+    "professional": "Maintain a professional, polished tone.",
+    "casual": "Be relaxed and conversational.",
+    "technical": "Be precise and technically detailed.",
+    "balanced": "",
+}
+
+_MODEL_LABELS = {
+    "ollama": "Ollama (kimi-k2.5, running locally)",
+    "claude": "Claude API (Anthropic, cloud)",
+    "claude_code": "Claude Code (agentic mode with MCP tools)",
+}
+
+# Tool-calling sections, by tool mode and model
+
+# Ollama gets a focused behavioral prompt. Tool definitions come
+# through the API — don't duplicate them here with wrong names.
+_TOOL_BLOCK_OLLAMA = """
+
+## Tool Calling
+
+You have tools available via function calling. The tool definitions describe exactly what each does.
+
+**Rules:**
+1. Pick the 1–2 most relevant tools for the user's question. Do NOT call unrelated tools.
+2. Call tools immediately — do not just describe what you would do.
+3. After tool results come back, synthesise them into a clear, useful answer.
+4. Try to answer within 1–2 tool rounds. Do not scatter across 5 rounds.
+5. If a tool returns an error, explain the issue to the user. Do not silently retry with different tools.
+6. If the user's question can be answered from your knowledge without tools, just answer directly."""
+
+# Claude Code runs as an agentic subprocess with MCP tools.
+# It handles its own tool loop — just tell it what's available.
+_TOOL_BLOCK_CLAUDE_CODE = """
+
+## You are running as Claude Code (Agentic Mode)
+
+You are operating as a Claude Code CLI agent with full access to Nexus tools via MCP (Model Context Protocol).
+You have an agentic tool loop — you can call tools, inspect results, and chain actions autonomously.
+
+**Your MCP tools include:**
+- **Terminal execution**: Run shell commands, scripts, manage processes
+- **File operations**: Read, write, search files across the filesystem
+- **Web browsing**: Search the web (Brave), fetch and parse web pages
+- **macOS control**: Open apps, manage windows, system commands, clipboard, notifications
+- **Memory**: Store and recall personal memories and context (Mem0)
+- **Documents**: Ingest, search, and query document knowledge base
+- **Skills**: Execute learned skill actions, install new skills from catalog
+- **GitHub**: Repository operations, issues, PRs
+- **System**: Self-improvement, health checks, configuration
+
+**Rules:**
+1. Use your MCP tools proactively — don't just describe what you'd do, actually do it.
+2. You can chain multiple tool calls across rounds to complete complex tasks.
+3. After completing tool operations, summarise what you did and the results clearly.
+4. If a tool fails, try an alternative approach before giving up.
+5. You have full autonomy to execute multi-step workflows without asking permission for each step."""
+
+# Claude handles large tool arrays well — keep it concise.
+_TOOL_BLOCK_CLAUDE = """
+
+## Tool Calling
+You have tools available. When a user's request can be answered by calling a tool, call it
+immediately -- do not just describe what you would do. You can call multiple tools in one
+response and chain them across rounds (up to 5 rounds).
+
+After receiving tool results, synthesize them into a clear, useful answer for the user."""
+
+_TOOL_BLOCK_LEGACY = """
+
+## Tool Calling
+You can call tools by including tool_call tags in your response:
+  <tool_call>plugin_name:tool_name(param1=value1, param2=value2)</tool_call>
+
+You can also call skill actions:
+  <skill_action>action_name(param1=value1, param2=value2)</skill_action>
+
+You can include multiple tool calls in one response. The system will execute them,
+show results, and let you continue with another response. This loops up to 5 rounds,
+so you can chain actions: read a file, modify it, test it, etc.
+
+**Important**: After tool results come back, give a clear final answer incorporating
+the results. Don't just dump raw tool output on the user."""
+
+
+@lru_cache(maxsize=8)
+def _get_zoneinfo(name: str):
+    """Resolve (and keep) a zoneinfo timezone by name."""
+    from zoneinfo import ZoneInfo
+    return ZoneInfo(name)
+
+
+@lru_cache(maxsize=4)
+def _format_datetime(minute: datetime, tz_name: str) -> str:
+    """Format a minute-truncated aware datetime; the text only changes once a minute."""
+    if tz_name:
+        offset = minute.strftime("%z")  # e.g. "+0400"
+        offset_formatted = f"UTC{offset[:3]}:{offset[3:]}"
+        return minute.strftime(f"%A, %-d %B %Y at %H:%M ({tz_name}, {offset_formatted})")
+
+    offset_seconds = round(minute.utcoffset().total_seconds())
+    sign = "-" if offset_seconds < 0 else "+"
+    offset_hours, offset_minutes = divmod(abs(offset_seconds) // 60, 60)
+    if offset_minutes:
+        offset_str = f"UTC{sign}{offset_hours}:{offset_minutes:02d}"
+    else:
+        offset_str = f"UTC{sign}{offset_hours}"
+
+    return minute.strftime(f"%A, %-d %B %Y at %H:%M ({offset_str})")
+
+
 def _get_current_datetime(cfg: "ConfigManager | None" = None) -> str:
     """Return a human-readable date/time string with timezone.
 
@@ -29,59 +141,32 @@ def _get_current_datetime(cfg: "ConfigManager | None" = None) -> str:
     if tz_name:
         # Try to use the named timezone via zoneinfo (Python 3.9+)
         try:
-            from zoneinfo import ZoneInfo
-            tz = ZoneInfo(tz_name)
-            now = datetime.now(tz)
-            offset = now.strftime("%z")  # e.g. "+0400"
-            offset_formatted = f"UTC{offset[:3]}:{offset[3:]}"
-            return now.strftime(f"%A, %-d %B %Y at %H:%M ({tz_name}, {offset_formatted})")
+            now = datetime.now(_get_zoneinfo(tz_name))
+            return _format_datetime(now.replace(second=0, microsecond=0), tz_name)
         except Exception:
             pass  # Fall through to system detection
 
-    # Detect system local timezone
-    now = datetime.now()
-    utc_now = datetime.now(timezone.utc)
-    # Calculate offset from UTC
-    offset_seconds = round((now - utc_now.replace(tzinfo=None)).total_seconds())
-    offset_hours = offset_seconds // 3600
-    offset_minutes = abs(offset_seconds % 3600) // 60
-    if offset_minutes:
-        offset_str = f"UTC{offset_hours:+d}:{offset_minutes:02d}"
-    else:
-        offset_str = f"UTC{offset_hours:+d}"
+    # System local timezone, as an aware datetime
+    now = datetime.now().astimezone()
+    return _format_datetime(now.replace(second=0, microsecond=0), "")
 
-    return now.strftime(f"%A, %-d %B %Y at %H:%M ({offset_str})")
 
-
-def build_system_prompt(
-    cfg: ConfigManager | None = None,
-    plugin_manager: PluginManager | None = None,
-    tool_calling_mode: str = "native",
-    model: str = "claude",
-    memory_context: str = "",
-    rag_context: str = "",
-    kg_context: str = "",
+@lru_cache(maxsize=32)
+def _build_prompt_head(
+    name: str,
+    custom: str,
+    tone: str,
+    current_datetime: str,
+    model: str,
+    tool_calling_mode: str,
 ) -> str:
-    """Build the full system prompt from config, plugins, and tool mode."""
-    name = cfg.agent_name if cfg else "Nexus"
-    custom = cfg.custom_system_prompt if cfg else ""
-    tone = cfg.persona_tone if cfg else "balanced"
+    """Build the static part of the system prompt (everything before injected context).
 
-    tone_instruction = {
-        "professional": "Maintain a professional, polished tone.",
-        "casual": "Be relaxed and conversational.",
-        "technical": "Be precise and technically detailed.",
-        "balanced": "",
-    }.get(tone, "")
-
-    current_datetime = _get_current_datetime(cfg)
-
-    model_labels = {
-        "ollama": "Ollama (kimi-k2.5, running locally)",
-        "claude": "Claude API (Anthropic, cloud)",
-        "claude_code": "Claude Code (agentic mode with MCP tools)",
-    }
-    current_model = model_labels.get(model, model)
+    Depends only on its arguments, so it is memoised — the date/time is
+    minute-resolution, so repeat messages within a minute reuse the string.
+    """
+    tone_instruction = _TONE_INSTRUCTIONS.get(tone, "")
+    current_model = _MODEL_LABELS.get(model, model)
 
     prompt = f"""You are **{name}**, an autonomous AI agent running on the Nexus platform. You are helpful, capable, and direct.
 Your name is {name} — always use this name when introducing yourself. Nexus is your platform, not your name.
@@ -126,6 +211,7 @@ Use these proactively when they'd help the user. Don't just describe what you'd
 - /exec python|bash <code> -- execute code
 - /install-skill owner/repo -- install skill from GitHub
 - /multi research <q1> | <q2> -- parallel research with sub-agents
+- /multi batch research <q1> | <q2> -- same, via Claude Message Batches (slower, half price)
 - /multi review <task> -- build + review with sub-agents
 - /multi code-review <task> -- Claude Code build + review (full MCP tools)
 - /multi verify <claim> -- independent fact-checking with sub-agents
@@ -143,96 +229,76 @@ synthesised into a single response. Strategies include:
 
     if tool_calling_mode == "native":
         if model == "ollama":
-            # Ollama gets a focused behavioral prompt. Tool definitions come
-            # through the API — don't duplicate them here with wrong names.
-            prompt += """
-
-## Tool Calling
-
-You have tools available via function calling. The tool definitions describe exactly what each does.
-
-**Rules:**
-1. Pick the 1–2 most relevant tools for the user's question. Do NOT call unrelated tools.
-2. Call tools immediately — do not just describe what you would do.
-3. After tool results come back, synthesise them into a clear, useful answer.
-4. Try to answer within 1–2 tool rounds. Do not scatter across 5 rounds.
-5. If a tool returns an error, explain the issue to the user. Do not silently retry with different tools.
-6. If the user's question can be answered from your knowledge without tools, just answer directly."""
+            prompt += _TOOL_BLOCK_OLLAMA
         elif model == "claude_code":
-            # Claude Code runs as an agentic subprocess with MCP tools.
-            # It handles its own tool loop — just tell it what's available.
-            prompt += """
-
-## You are running as Claude Code (Agentic Mode)
-
-You are operating as a Claude Code CLI agent with full access to Nexus tools via MCP (Model Context Protocol).
-You have an agentic tool loop — you can call tools, inspect results, and chain actions autonomously.
-
-**Your MCP tools include:**
-- **Terminal execution**: Run shell commands, scripts, manage processes
-- **File operations**: Read, write, search files across the filesystem
-- **Web browsing**: Search the web (Brave), fetch and parse web pages
-- **macOS control**: Open apps, manage windows, system commands, clipboard, notifications
-- **Memory**: Store and recall personal memories and context (Mem0)
-- **Documents**: Ingest, search, and query document knowledge base
-- **Skills**: Execute learned skill actions, install new skills from catalog
-- **GitHub**: Repository operations, issues, PRs
-- **System**: Self-improvement, health checks, configuration
-
-**Rules:**
-1. Use your MCP tools proactively — don't just describe what you'd do, actually do it.
-2. You can chain multiple tool calls across rounds to complete complex tasks.
-3. After completing tool operations, summarise what you did and the results clearly.
-4. If a tool fails, try an alternative approach before giving up.
-5. You have full autonomy to execute multi-step workflows without asking permission for each step."""
+            prompt += _TOOL_BLOCK_CLAUDE_CODE
         else:
-            # Claude handles large tool arrays well — keep it concise.
-            prompt += """
-
-## Tool Calling
-You have tools available. When a user's request can be answered by calling a tool, call it
-immediately -- do not just describe what you would do. You can call multiple tools in one
-response and chain them across rounds (up to 5 rounds).
-
-After receiving tool results, synthesize them into a clear, useful answer for the user."""
+            prompt += _TOOL_BLOCK_CLAUDE
 
     elif tool_calling_mode == "legacy":
-        prompt += """
+        prompt += _TOOL_BLOCK_LEGACY
 
-## Tool Calling
-You can call tools by including tool_call tags in your response:
-  <tool_call>plugin_name:tool_name(param1=value1, param2=value2)</tool_call>
+    if custom:
+        prompt += f"\n\nAdditional instructions:\n{custom}"
 
-You can also call skill actions:
-  <skill_action>action_name(param1=value1, param2=value2)</skill_action>
+    return prompt
 
-You can include multiple tool calls in one response. The system will execute them,
-show results, and let you continue with another response. This loops up to 5 rounds,
-so you can chain actions: read a file, modify it, test it, etc.
 
-**Important**: After tool results come back, give a clear final answer incorporating
-the results. Don't just dump raw tool output on the user."""
+@lru_cache(maxsize=32)
+def _build_prompt_base(
+    name: str,
+    custom: str,
+    tone: str,
+    current_datetime: str,
+    model: str,
+    tool_calling_mode: str,
+    memory_context: str,
+) -> str:
+    """Prompt head plus the passive memory section.
 
-    if custom:
-        prompt += f"\n\nAdditional instructions:\n{custom}"
+    Passive memory changes far less often than the per-query RAG and
+    knowledge-graph context, so this layer is memoised as well.
+    """
+    prompt = _build_prompt_head(name, custom, tone, current_datetime, model, tool_calling_mode)
 
     # Inject passive memory context (learned preferences + project context)
     if memory_context:
         prompt += f"\n\n## What I Know About You\n{memory_context}"
 
+    return prompt
+
+
+def build_system_prompt(
+    cfg: ConfigManager | None = None,
+    plugin_manager: PluginManager | None = None,
+    tool_calling_mode: str = "native",
+    model: str = "claude",
+    memory_context: str = "",
+    rag_context: str = "",
+    kg_context: str = "",
+) -> str:
+    """Build the full system prompt from config, plugins, and tool mode."""
+    name = cfg.agent_name if cfg else "Nexus"
+    custom = cfg.custom_system_prompt if cfg else ""
+    tone = cfg.persona_tone if cfg else "balanced"
+
+    parts = [_build_prompt_base(
+        name, custom, tone, _get_current_datetime(cfg), model, tool_calling_mode, memory_context,
+    )]
+
     # Inject RAG context (retrieved relevant memories)
     if rag_context:
-        prompt += f"\n\n## Retrieved Context\nThe following information was retrieved from memory and may be relevant:\n\n{rag_context}"
+        parts.append(f"## Retrieved Context\nThe following information was retrieved from memory and may be relevant:\n\n{rag_context}")
 
     # Inject Knowledge Graph context (related entities)
     if kg_context:
-        prompt += f"\n\n{kg_context}"
+        parts.append(kg_context)
 
     # In legacy mode, append text-based tool descriptions from plugins.
     # In native mode, skip this — tool definitions are sent via the API.
     if tool_calling_mode == "legacy" and plugin_manager:
         plugin_prompt = plugin_manager.get_system_prompt_additions()
         if plugin_prompt:
-            prompt += f"\n\n{plugin_prompt}"
+            parts.append(plugin_prompt)
 
-    return prompt
+    return "\n\n".join(parts)
@@ -103,8 +103,13 @@ class ToolExecutor:
         return definitions
 
     def to_anthropic_tools(self) -> list[dict]:
-        """Convert all tool definitions to Anthropic API format."""
-        return [d.to_anthropic_format() for d in self.get_tool_definitions()]
+        """Convert all tool definitions to Anthropic API format.
+
+        Sorted by name so the tool list — part of the prompt-cache prefix —
+        is byte-identical regardless of plugin load order.
+        """
+        definitions = sorted(self.get_tool_definitions(), key=lambda d: d.name)
+        return [d.to_anthropic_format() for d in definitions]
 
     def to_ollama_tools(
         self,
@@ -13,6 +13,9 @@ Usage:
     # In any subsystem:
     await work_registry.register("agent-abc", "agent", "Process user query", "running", conv_id="...")
     await work_registry.update("agent-abc", "completed")
+
+    # Hot paths can queue updates instead of awaiting each one:
+    work_registry.update_later("agent-abc", "completed")
 """
 
 from __future__ import annotations
@@ -25,6 +28,11 @@ from typing import Any, Optional
 
 logger = logging.getLogger("nexus.work_registry")
 
+# update_later() coalescing
+BATCH_MAX_SIZE = 64            # Max updates written per batch
+BATCH_WINDOW_SECONDS = 0.01    # How long to wait for more updates after the first
+FLUSHER_IDLE_SECONDS = 30.0    # Flusher exits after this long without updates
+
 
 class WorkRegistry:
     """Maintains unified registry of all work items with real-time events.
@@ -47,6 +55,9 @@ class WorkRegistry:
         # WebSocket manager reference (injected at startup)
         self._ws_manager: Any = None
         self._initialized = False
+        # Queued update_later() entries and the task draining them
+        self._pending: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
 
     def init(self, db: Any, ws_manager: Any) -> None:
         """Called from app.py lifespan after DB is ready."""
@@ -108,21 +119,100 @@ class WorkRegistry:
         metadata_patch: dict = None,
     ) -> Optional[dict]:
         """Update a work item's status."""
-        item = self._items.get(item_id)
+        item = self._apply_update(item_id, status, metadata_patch)
 
-        if not item:
-            # Item not in cache — update DB directly (may have been evicted)
-            if self._db:
+        # Persist to DB
+        if self._db:
+            try:
+                await self._db.update_work_item_status(item_id, status, metadata_patch)
+            except Exception as e:
+                log = logger.warning if item else logger.debug
+                log(f"WorkRegistry DB update failed for {item_id}: {e}")
+
+        await self._emit_update(item_id, status, item)
+        return item
+
+    async def batch_update(
+        self, entries: list[tuple[str, str, Optional[dict]]],
+    ) -> None:
+        """Apply several ``(item_id, status, metadata_patch)`` updates at once.
+
+        Same semantics as calling :meth:`update` for each entry in order,
+        but the DB writes share one transaction.
+        """
+        if not entries:
+            return
+
+        items = [self._apply_update(*entry) for entry in entries]
+
+        if self._db:
+            try:
+                await self._db.update_work_item_statuses(entries)
+            except Exception as e:
+                logger.warning(f"WorkRegistry DB batch update failed ({len(entries)} items): {e}")
+
+        for (item_id, status, _), item in zip(entries, items):
+            await self._emit_update(item_id, status, item)
+
+    def update_later(self, item_id: str, status: str, metadata_patch: dict = None) -> None:
+        """Queue a status update without waiting for it.
+
+        Updates are coalesced by a background flusher that drains up to
+        ``BATCH_MAX_SIZE`` entries (or whatever arrives within
+        ``BATCH_WINDOW_SECONDS``) into a single :meth:`batch_update`.
+        Order is preserved.
+        """
+        # Raises outside a running loop, before anything is queued
+        loop = asyncio.get_running_loop()
+        if self._pending is None:
+            self._pending = asyncio.Queue()
+        self._pending.put_nowait((item_id, status, metadata_patch))
+        if self._flusher is None or self._flusher.done():
+            self._flusher = loop.create_task(self._flush_pending())
+
+    async def flush(self) -> None:
+        """Wait until every queued :meth:`update_later` entry has been applied."""
+        if self._pending is None:
+            return
+        if not self._pending.empty() and (self._flusher is None or self._flusher.done()):
+            self._flusher = asyncio.create_task(self._flush_pending())
+        await self._pending.join()
+
+    async def _flush_pending(self) -> None:
+        queue = self._pending
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                batch = [await asyncio.wait_for(queue.get(), timeout=FLUSHER_IDLE_SECONDS)]
+            except asyncio.TimeoutError:
+                return  # Idle — restarted on the next update_later()
+
+            deadline = loop.time() + BATCH_WINDOW_SECONDS
+            while len(batch) < BATCH_MAX_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
                 try:
-                    await self._db.update_work_item_status(item_id, status, metadata_patch)
-                except Exception as e:
-                    logger.debug(f"WorkRegistry DB update for non-cached {item_id}: {e}")
-            # Emit a minimal event so SSE/WS clients can react
-            minimal = {"id": item_id, "status": status}
-            await self._emit(minimal, "updated")
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self.batch_update(batch)
+            except Exception as e:
+                logger.warning(f"WorkRegistry batch flush failed: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _apply_update(
+        self, item_id: str, status: str, metadata_patch: dict = None,
+    ) -> Optional[dict]:
+        """Update the in-memory cache; returns the item, or None if not cached."""
+        item = self._items.get(item_id)
+        if not item:
             return None
 
-        # Update in-memory cache
         item["status"] = status
         now = datetime.now(timezone.utc).isoformat()
         if status == "running" and not item.get("started_at"):
@@ -131,23 +221,21 @@ class WorkRegistry:
             item["completed_at"] = now
         if metadata_patch:
             item["metadata"].update(metadata_patch)
+        return item
 
-        # Persist to DB
-        if self._db:
-            try:
-                await self._db.update_work_item_status(item_id, status, metadata_patch)
-            except Exception as e:
-                logger.warning(f"WorkRegistry DB update failed for {item_id}: {e}")
+    async def _emit_update(self, item_id: str, status: str, item: Optional[dict]) -> None:
+        if not item:
+            # Item not in cache (may have been evicted) — emit a minimal
+            # event so SSE/WS clients can react
+            await self._emit({"id": item_id, "status": status}, "updated")
+            return
 
-        # Emit event
         await self._emit(item, "updated")
 
         # Remove from cache if terminal
         if status in ("completed", "failed", "cancelled"):
             self._items.pop(item_id, None)
 
-        return item
-
     # ── Query Operations ─────────────────────────────────────────
 
     def get(self, item_id: str) -> Optional[dict]:
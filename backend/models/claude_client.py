@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from collections.abc import AsyncGenerator
 from typing import Any
@@ -37,14 +38,15 @@ class ClaudeClient:
     async def chat(
         self,
         messages: list,
-        system: str | None = None,
+        system: str | list[dict] | None = None,
         tools: list[dict] | None = None,
     ) -> dict:
         """Send a chat completion request (non-streaming).
 
         Args:
             messages: Conversation messages.
-            system: System prompt.
+            system: System prompt, or a list of text blocks (which may carry
+                ``cache_control`` breakpoints).
             tools: Anthropic-format tool definitions (optional).
 
         Returns:
@@ -98,7 +100,7 @@ class ClaudeClient:
     async def chat_stream(
         self,
         messages: list,
-        system: str | None = None,
+        system: str | list[dict] | None = None,
         tools: list[dict] | None = None,
     ) -> AsyncGenerator[str | dict, None]:
         """Stream a chat completion response.
@@ -166,5 +168,79 @@ class ClaudeClient:
         except anthropic.APIError as e:
             yield f"\n\n[Error: Claude API -- {e.message}]"
 
+    async def batch_chat(
+        self,
+        requests: list[dict],
+        poll_interval: float = 30.0,
+        max_poll_interval: float = 300.0,
+    ) -> dict[str, dict]:
+        """Run independent requests through the Message Batches API.
+
+        Batched requests cost half as much but finish asynchronously, so
+        this polls (with exponential backoff) until the batch has ended.
+        Cancelling the call cancels the batch.
+
+        Args:
+            requests: Dicts with ``custom_id``, ``messages`` and optional
+                ``system``.  Tools are not supported.
+
+        Returns:
+            custom_id → dict with content, model, tokens and provider, or
+            with ``error`` for a request that did not succeed.
+        """
+        batches = self._client.beta.messages.batches
+        params = []
+        for req in requests:
+            body: dict[str, Any] = {
+                "model": self.model,
+                "max_tokens": 8192,
+                "messages": req["messages"],
+            }
+            if req.get("system"):
+                body["system"] = req["system"]
+            params.append({"custom_id": req["custom_id"], "params": body})
+
+        try:
+            batch = await batches.create(requests=params)
+        except anthropic.RateLimitError:
+            raise RuntimeError("Claude API rate limit reached. Please wait a moment.")
+        except anthropic.APIError as e:
+            raise RuntimeError(f"Claude API error: {e.message}")
+        logger.info(f"Submitted message batch {batch.id} ({len(params)} requests)")
+
+        try:
+            delay = poll_interval
+            while batch.processing_status != "ended":
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_poll_interval)
+                batch = await batches.retrieve(batch.id)
+
+            results: dict[str, dict] = {}
+            async for entry in await batches.results(batch.id):
+                outcome = entry.result
+                if outcome.type == "succeeded":
+                    msg = outcome.message
+                    results[entry.custom_id] = {
+                        "content": "".join(b.text for b in msg.content if b.type == "text"),
+                        "model": msg.model,
+                        "tokens_in": msg.usage.input_tokens,
+                        "tokens_out": msg.usage.output_tokens,
+                        "provider": "anthropic",
+                        "stop_reason": msg.stop_reason,
+                    }
+                elif outcome.type == "errored":
+                    results[entry.custom_id] = {"error": f"Claude API error: {outcome.error.error.message}"}
+                else:
+                    results[entry.custom_id] = {"error": f"Batch request {outcome.type}"}
+            return results
+        except asyncio.CancelledError:
+            try:
+                await batches.cancel(batch.id)
+            except Exception as e:
+                logger.debug(f"Could not cancel message batch {batch.id}: {e}")
+            raise
+        except anthropic.APIError as e:
+            raise RuntimeError(f"Claude API error: {e.message}")
+
     async def close(self) -> None:
         await self._client.close()
@@ -8,7 +8,10 @@ Key design decisions
 --------------------
 * Uses subprocess (not SDK) because ``claude-code-sdk`` doesn't exist on PyPI.
 * The CLI is expected at ``/opt/homebrew/bin/claude`` (configurable).
-* Each request is a fresh subprocess — no persistent session state.
+* Each request gets its own subprocess — no persistent session state.
+  ``prewarm()`` / ``acquire_session()`` let callers spawn that process
+  ahead of time (waiting on stdin with ``--input-format stream-json``),
+  so the CLI's startup cost is paid off the critical path.
 * Streaming: we parse newline-delimited JSON from stdout line by line.
 * Tool calls: Claude Code handles its own tool loop internally when MCP
   tools are configured.  We don't need to re-execute tools — the final
@@ -22,7 +25,9 @@ import json
 import logging
 import os
 import tempfile
-from collections.abc import AsyncGenerator
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 
 logger = logging.getLogger("nexus.claude_code")
@@ -33,6 +38,51 @@ _DEFAULT_CLI_PATH = "/opt/homebrew/bin/claude"
 # Maximum time to wait for a response (seconds)
 _DEFAULT_TIMEOUT = 300  # 5 minutes — Claude Code can do multi-step work
 
+# Pre-spawned processes idle longer than this are recycled
+_WARM_IDLE_SECONDS = 600
+
+
+class ClaudeCodeSession:
+    """A Claude Code process started ahead of its request.
+
+    The process was spawned with ``--input-format stream-json`` and is
+    blocked reading stdin, so by the time a request arrives the binary is
+    loaded and MCP servers are connected.  Each session serves exactly one
+    request — conversation state never leaks between callers.
+    """
+
+    def __init__(self, client: ClaudeCodeClient, proc: asyncio.subprocess.Process, system: str | None):
+        self._client = client
+        self.proc = proc
+        self.system = system
+        self.spawned_at = time.monotonic()
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.returncode is None
+
+    async def chat_stream(self, messages: list) -> AsyncGenerator[str, None]:
+        """Send one request to the waiting process and stream the reply."""
+        prompt = self._client._messages_to_prompt(messages)
+        line = json.dumps({"type": "user", "message": {"role": "user", "content": prompt}})
+        logger.info(f"Claude Code stream: using pre-spawned process ({len(prompt)} char prompt)")
+        try:
+            self.proc.stdin.write(line.encode() + b"\n")
+            await self.proc.stdin.drain()
+            self.proc.stdin.close()
+        except Exception as e:
+            yield f"\n\n[Claude Code error: {e}]"
+            return
+        async for chunk in self._client._stream_process(self.proc):
+            yield chunk
+
+    def kill(self) -> None:
+        if self.alive:
+            try:
+                self.proc.kill()
+            except Exception:
+                pass
+
 
 class ClaudeCodeClient:
     """Client that spawns Claude Code CLI as a subprocess.
@@ -49,6 +99,7 @@ class ClaudeCodeClient:
         system_prompt: str | None = None,
         allowed_tools: list[str] | None = None,
         timeout: int = _DEFAULT_TIMEOUT,
+        pool_size: int = 2,
     ):
         self.cli_path = cli_path
         self.model = model
@@ -56,6 +107,11 @@ class ClaudeCodeClient:
         self.system_prompt = system_prompt
         self.allowed_tools = allowed_tools
         self.timeout = timeout
+        # Pre-spawned sessions waiting for a request, most recent last
+        self._warm: list[ClaudeCodeSession] = []
+        self.pool_size = pool_size
+        # Fires when the oldest warm process would go idle (see _schedule_reap)
+        self._reap_handle: asyncio.TimerHandle | None = None
 
     async def is_available(self) -> bool:
         """Check if the Claude CLI is installed and responsive."""
@@ -89,18 +145,24 @@ class ClaudeCodeClient:
 
     def _build_command(
         self,
-        prompt: str,
+        prompt: str | None,
         system: str | None = None,
         output_format: str = "stream-json",
         tools: list[dict] | None = None,
     ) -> list[str]:
-        """Build the CLI command with all flags."""
-        cmd = [
-            self.cli_path,
-            "-p", prompt,
+        """Build the CLI command with all flags.
+
+        With ``prompt=None`` the request is read from stdin as stream-json
+        (used for pre-spawned sessions).
+        """
+        if prompt is None:
+            cmd = [self.cli_path, "-p", "--input-format", "stream-json"]
+        else:
+            cmd = [self.cli_path, "-p", prompt]
+        cmd.extend([
             "--output-format", output_format,
             "--model", self.model,
-        ]
+        ])
 
         if output_format == "stream-json":
             cmd.append("--verbose")
@@ -218,7 +280,7 @@ class ClaudeCodeClient:
             # Get the actual model used
             actual_model = "claude-code"
             if model_usage:
-                actual_model = list(model_usage.keys())[0]
+                actual_model = next(iter(model_usage))
 
             return {
                 "content": result_text,
@@ -258,13 +320,26 @@ class ClaudeCodeClient:
         logger.info(f"Claude Code stream: spawning subprocess ({len(prompt)} char prompt)")
 
         try:
-            proc = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env={**os.environ, "CLAUDE_CODE_DISABLE_NONESSENTIAL_TRAFFIC": "1"},
-            )
-
+            proc = await self._spawn(cmd, stdin=False)
+        except Exception as e:
+            yield f"\n\n[Claude Code error: {e}]"
+            return
+
+        async for chunk in self._stream_process(proc):
+            yield chunk
+
+    async def _spawn(self, cmd: list[str], stdin: bool) -> asyncio.subprocess.Process:
+        return await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE if stdin else None,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env={**os.environ, "CLAUDE_CODE_DISABLE_NONESSENTIAL_TRAFFIC": "1"},
+        )
+
+    async def _stream_process(self, proc: asyncio.subprocess.Process) -> AsyncGenerator[str, None]:
+        """Parse stream-json output from *proc*, yielding text deltas."""
+        try:
             last_text = ""
 
             async for line in proc.stdout:
@@ -334,6 +409,91 @@ class ClaudeCodeClient:
         except Exception as e:
             yield f"\n\n[Claude Code error: {e}]"
 
+    # ── Pre-spawned sessions ──
+
+    async def prewarm(self, system: str | None = None) -> ClaudeCodeSession | None:
+        """Spawn a process for *system* that waits for its request on stdin.
+
+        Returns the new session so the caller can ``discard()`` it if it
+        goes unused.  No-op (returns None) once ``pool_size`` warm
+        processes exist.
+        """
+        self._reap_warm()
+        if len(self._warm) >= self.pool_size:
+            return None
+        cmd = self._build_command(None, system, output_format="stream-json")
+        try:
+            proc = await self._spawn(cmd, stdin=True)
+        except Exception as e:
+            logger.warning(f"Claude Code prewarm failed: {e}")
+            return None
+        session = ClaudeCodeSession(self, proc, system)
+        self._warm.append(session)
+        self._schedule_reap()
+        logger.debug(f"Claude Code: pre-spawned process (pid {proc.pid})")
+        return session
+
+    @asynccontextmanager
+    async def acquire_session(self, system: str | None = None) -> AsyncIterator[ClaudeCodeSession]:
+        """Check out a warm session for *system*, spawning one if none is ready.
+
+        The most recently spawned matching process is used first.  The
+        session is single-use and is killed on exit if still running.
+        """
+        self._reap_warm()
+        session = None
+        for i in range(len(self._warm) - 1, -1, -1):
+            if self._warm[i].system == system:
+                session = self._warm.pop(i)
+                break
+        if session is None:
+            cmd = self._build_command(None, system, output_format="stream-json")
+            session = ClaudeCodeSession(self, await self._spawn(cmd, stdin=True), system)
+        try:
+            yield session
+        finally:
+            session.kill()
+
+    def _reap_warm(self) -> None:
+        """Drop warm processes that exited or sat idle too long."""
+        now = time.monotonic()
+        keep = []
+        for session in self._warm:
+            if session.alive and now - session.spawned_at < _WARM_IDLE_SECONDS:
+                keep.append(session)
+            else:
+                session.kill()
+        self._warm = keep
+
+    def discard(self, sessions: list[ClaudeCodeSession]) -> None:
+        """Kill those of *sessions* that are still waiting for a request."""
+        for session in sessions:
+            if session in self._warm:
+                self._warm.remove(session)
+                session.kill()
+
+    def _schedule_reap(self) -> None:
+        """Arm a timer for when the oldest warm process goes idle.
+
+        Without it an unused process (and its MCP servers) would only be
+        recycled by the next prewarm() or acquire_session() call.
+        """
+        if self._reap_handle is not None or not self._warm:
+            return
+        oldest = min(session.spawned_at for session in self._warm)
+        delay = max(0.0, oldest + _WARM_IDLE_SECONDS - time.monotonic())
+        self._reap_handle = asyncio.get_running_loop().call_later(delay, self._on_reap_timer)
+
+    def _on_reap_timer(self) -> None:
+        self._reap_handle = None
+        self._reap_warm()
+        self._schedule_reap()
+
     async def close(self) -> None:
-        """No persistent connections to close."""
-        pass
+        """Kill any pre-spawned processes."""
+        if self._reap_handle is not None:
+            self._reap_handle.cancel()
+            self._reap_handle = None
+        for session in self._warm:
+            session.kill()
+        self._warm.clear()
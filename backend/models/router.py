@@ -36,6 +36,18 @@ SIMPLE_INDICATORS = [
 ]
 
 
+def _system_for(model_name: str, system: str | list[dict] | None) -> str | list[dict] | None:
+    """Adapt *system* to the target client.
+
+    Only the Anthropic API accepts a list of system text blocks (used to
+    place ``cache_control`` breakpoints); other clients get the blocks
+    joined back into a plain string.
+    """
+    if model_name == "claude" or not isinstance(system, list):
+        return system
+    return "\n\n".join(block.get("text", "") for block in system)
+
+
 class ModelRouter:
     """Routes requests to the appropriate model based on complexity.
 
@@ -247,7 +259,7 @@ class ModelRouter:
     async def chat(
         self,
         messages: list,
-        system: str | None = None,
+        system: str | list[dict] | None = None,
         force_model: str | None = None,
         tools: list[dict] | None = None,
         fallback_tools: list[dict] | None = None,
@@ -256,7 +268,7 @@ class ModelRouter:
 
         Args:
             messages: Conversation messages.
-            system: System prompt.
+            system: System prompt, or Anthropic-style text blocks.
             force_model: Override model selection.
             tools: Tool definitions in the primary model's format.
             fallback_tools: Tool definitions for the fallback model's format.
@@ -272,7 +284,7 @@ class ModelRouter:
         async def _try(c: Any, name: str, t: list[dict] | None = None, msgs: list | None = None) -> dict:
             try:
                 result = await asyncio.wait_for(
-                    c.chat(msgs or messages, system, tools=t),
+                    c.chat(msgs or messages, _system_for(name, system), tools=t),
                     timeout=self.timeout_seconds,
                 )
                 result["routed_to"] = name
@@ -311,7 +323,7 @@ class ModelRouter:
     async def chat_stream(
         self,
         messages: list,
-        system: str | None = None,
+        system: str | list[dict] | None = None,
         force_model: str | None = None,
         tools: list[dict] | None = None,
     ) -> tuple[str, AsyncGenerator]:
@@ -321,7 +333,7 @@ class ModelRouter:
         client = self._get_client(model_name)
 
         logger.info(f"Streaming via: {model_name}")
-        return model_name, client.chat_stream(messages, system, tools=tools)
+        return model_name, client.chat_stream(messages, _system_for(model_name, system), tools=tools)
 
     @property
     def status(self) -> dict:
@@ -26,6 +26,7 @@ from plugins.base import NexusPlugin
 logger = logging.getLogger("nexus.plugins.brave")
 
 MAX_EXEC_TIME = 30  # seconds
+MAX_CONNECTIONS = 16  # Cap concurrent outbound HTTP requests from web tools
 
 
 class BraveBrowserPlugin(NexusPlugin):
@@ -37,6 +38,7 @@ class BraveBrowserPlugin(NexusPlugin):
         super().__init__(config, db, router)
         self.google_api_key = None
         self.google_search_engine_id = None
+        self._client = None  # Shared httpx.AsyncClient, created on first use
 
     async def setup(self):
         # Try to get Google API credentials from config
@@ -51,6 +53,28 @@ class BraveBrowserPlugin(NexusPlugin):
             logger.info("    Google Search API not configured (set GOOGLE_API_KEY and GOOGLE_SEARCH_ENGINE_ID)")
         return True
 
+    async def shutdown(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _get_client(self):
+        """Return the shared HTTP client, creating it lazily.
+
+        Reusing one client keeps connections (and TLS sessions) alive
+        across tool calls instead of re-handshaking on every request. The
+        pool limit makes bursts of parallel tool calls queue for a
+        connection rather than all hitting the same host at once.
+        """
+        if self._client is None:
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS),
+            )
+        return self._client
+
     def register_tools(self):
         # ── Browser Control Tools ──
         self.add_tool(
@@ -366,8 +390,6 @@ class BraveBrowserPlugin(NexusPlugin):
         # Try Google Custom Search API first if configured
         if self.google_api_key and self.google_search_engine_id:
             try:
-                import httpx
-
                 url = "https://www.googleapis.com/customsearch/v1"
                 params_dict = {
                     "key": self.google_api_key,
@@ -376,10 +398,9 @@ class BraveBrowserPlugin(NexusPlugin):
                     "num": min(num_results, 10),
                 }
 
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.get(url, params=params_dict)
-                    response.raise_for_status()
-                    data = response.json()
+                response = await self._get_client().get(url, params=params_dict)
+                response.raise_for_status()
+                data = response.json()
 
                 items = data.get("items", [])
                 if items:
@@ -401,20 +422,19 @@ class BraveBrowserPlugin(NexusPlugin):
     async def _duckduckgo_search(self, query: str, num_results: int = 5) -> str:
         """Search DuckDuckGo HTML (no API key required)."""
         try:
-            import httpx
-
+            client = self._get_client()
             headers = {
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
             }
 
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(
-                    "https://html.duckduckgo.com/html/",
-                    params={"q": query},
-                    headers=headers,
-                )
-                response.raise_for_status()
-                html = response.text
+            response = await client.get(
+                "https://html.duckduckgo.com/html/",
+                params={"q": query},
+                headers=headers,
+                follow_redirects=True,
+            )
+            response.raise_for_status()
+            html = response.text
 
             # Parse results with regex (no BeautifulSoup dependency needed)
             results = []
@@ -469,58 +489,55 @@ class BraveBrowserPlugin(NexusPlugin):
             url = "https://" + url
 
         try:
-            import httpx
+            response = await self._get_client().get(url, follow_redirects=True)
+            response.raise_for_status()
 
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-                response = await client.get(url)
-                response.raise_for_status()
+            content_type = response.headers.get("content-type", "")
+
+            # Only process HTML/text content
+            if "html" in content_type or "text" in content_type:
+                html = response.text
 
-                content_type = response.headers.get("content-type", "")
-
-                # Only process HTML/text content
-                if "html" in content_type or "text" in content_type:
-                    html = response.text
-
-                    # Smart extraction via BeautifulSoup + html2text → Markdown
-                    try:
-                        from core.web_extract import extract_content, is_sparse_content
-
-                        text = extract_content(html, url=url, max_chars=8000)
-
-                        # Auto-detect JS-heavy SPAs (sparse content)
-                        if is_sparse_content(text):
-                            # Try headless browser if available
-                            headless = getattr(self, "_headless_renderer", None)
-                            if headless:
-                                try:
-                                    rendered = await headless.render(url, max_chars=8000)
-                                    if rendered and not is_sparse_content(rendered):
-                                        logger.info(f"Headless render succeeded for {url}")
-                                        return rendered
-                                except Exception as he:
-                                    logger.warning(f"Headless render failed for {url}: {he}")
-
-                            # Append sparse content warning
-                            text += (
-                                "\n\n⚠️ **Note:** This appears to be a JavaScript-heavy site. "
-                                "The raw HTML has minimal text content. "
-                                "Use `web_fetch_rendered` for full JS-rendered content."
-                            )
-
-                        return text
-                    except Exception as extract_err:
-                        logger.warning(f"Smart extraction failed, falling back to regex: {extract_err}")
-                        # Fallback to regex stripping
-                        text = re.sub(r"<script[^>]*>.*?</script>", "", html, flags=re.DOTALL | re.IGNORECASE)
-                        text = re.sub(r"<style[^>]*>.*?</style>", "", text, flags=re.DOTALL | re.IGNORECASE)
-                        text = re.sub(r"<[^>]+>", "", text)
-                        text = re.sub(r"\n\s*\n", "\n\n", text)
-                        text = text.strip()
-                        if len(text) > 10000:
-                            text = text[:10000] + "\n\n... (truncated to 10000 chars)"
-                        return f"📄 **{url}**\n\n{text}"
-                else:
-                    return f"⚠️ Unsupported content type: {content_type}"
+                # Smart extraction via BeautifulSoup + html2text → Markdown
+                try:
+                    from core.web_extract import extract_content, is_sparse_content
+
+                    text = extract_content(html, url=url, max_chars=8000)
+
+                    # Auto-detect JS-heavy SPAs (sparse content)
+                    if is_sparse_content(text):
+                        # Try headless browser if available
+                        headless = getattr(self, "_headless_renderer", None)
+                        if headless:
+                            try:
+                                rendered = await headless.render(url, max_chars=8000)
+                                if rendered and not is_sparse_content(rendered):
+                                    logger.info(f"Headless render succeeded for {url}")
+                                    return rendered
+                            except Exception as he:
+                                logger.warning(f"Headless render failed for {url}: {he}")
+
+                        # Append sparse content warning
+                        text += (
+                            "\n\n⚠️ **Note:** This appears to be a JavaScript-heavy site. "
+                            "The raw HTML has minimal text content. "
+                            "Use `web_fetch_rendered` for full JS-rendered content."
+                        )
+
+                    return text
+                except Exception as extract_err:
+                    logger.warning(f"Smart extraction failed, falling back to regex: {extract_err}")
+                    # Fallback to regex stripping
+                    text = re.sub(r"<script[^>]*>.*?</script>", "", html, flags=re.DOTALL | re.IGNORECASE)
+                    text = re.sub(r"<style[^>]*>.*?</style>", "", text, flags=re.DOTALL | re.IGNORECASE)
+                    text = re.sub(r"<[^>]+>", "", text)
+                    text = re.sub(r"\n\s*\n", "\n\n", text)
+                    text = text.strip()
+                    if len(text) > 10000:
+                        text = text[:10000] + "\n\n... (truncated to 10000 chars)"
+                    return f"📄 **{url}**\n\n{text}"
+            else:
+                return f"⚠️ Unsupported content type: {content_type}"
 
         except ImportError:
             return "Error: httpx not installed. Run: pip install httpx"
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import importlib
 import importlib.util
 import logging
@@ -15,6 +16,8 @@ from .permissions import PermissionLevel
 
 logger = logging.getLogger("nexus.plugins")
 
+HEALTH_CACHE_TTL = 5.0  # seconds a plugin health result is reused
+
 
 class PluginManager:
     """Discover, load, and manage Nexus plugins."""
@@ -25,12 +28,15 @@ class PluginManager:
         self.router = router
         self.plugins: dict[str, NexusPlugin] = {}
         self._audit_tracker: dict[str, dict[str, int]] = {}  # {plugin_name: {tool_name: count}}
+        self._health_cache: dict[str, tuple[float, dict]] = {}  # {plugin_name: (checked_at, result)}
+        self._health_inflight: dict[str, asyncio.Future] = {}
 
     # ── Discovery & Loading ──
 
     async def discover_and_load(self) -> None:
         """Scan plugins/ directory for *_plugin.py files, import and register."""
         self.plugins = {}
+        self._health_cache.clear()
         plugins_dir = os.path.dirname(os.path.abspath(__file__))
 
         for filename in sorted(os.listdir(plugins_dir)):
@@ -93,6 +99,7 @@ class PluginManager:
 
     async def reload_plugin(self, name: str, config: Any, db: Any, router: Any) -> NexusPlugin:
         """Reload a single plugin by name."""
+        self._health_cache.pop(name, None)
         if name in self.plugins:
             await self.plugins[name].shutdown()
             del self.plugins[name]
@@ -184,6 +191,40 @@ class PluginManager:
                 )
         return cmds
 
+    async def check_health(self, name: str) -> dict:
+        """Return a plugin's health_check() result, coalescing bursts.
+
+        Results are reused for HEALTH_CACHE_TTL seconds, and concurrent
+        callers for the same plugin share one in-flight check. Errors are
+        reported as ``{"status": "error", "message": ...}``.
+        """
+        cached = self._health_cache.get(name)
+        if cached and time.monotonic() - cached[0] < HEALTH_CACHE_TTL:
+            return cached[1]
+
+        inflight = self._health_inflight.get(name)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._health_inflight[name] = future
+        try:
+            plugin = self.plugins.get(name)
+            if plugin is None:
+                health = {"status": "error", "message": f"Plugin {name} not loaded"}
+            else:
+                try:
+                    health = await plugin.health_check()
+                except Exception as e:
+                    health = {"status": "error", "message": str(e)}
+            self._health_cache[name] = (time.monotonic(), health)
+            future.set_result(health)
+            return health
+        finally:
+            if not future.done():
+                future.cancel()
+            self._health_inflight.pop(name, None)
+
     # ── Command Dispatch ──
 
     async def handle_command(self, name: str, args: str) -> str | None:
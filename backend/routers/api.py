@@ -98,14 +98,10 @@ async def api_health(request: Request):
 
     # Plugins
     plugin_errors = 0
-    for _name, plugin in s.plugin_manager.plugins.items():
-        if hasattr(plugin, "health_check"):
-            try:
-                plugin_health = await plugin.health_check()
-                if plugin_health.get("status") != "ok":
-                    plugin_errors += 1
-            except Exception:
-                plugin_errors += 1
+    for name in list(s.plugin_manager.plugins):
+        plugin_health = await s.plugin_manager.check_health(name)
+        if plugin_health.get("status") != "ok":
+            plugin_errors += 1
 
     health_status["checks"]["plugins"] = {
         "status": "healthy" if plugin_errors == 0 else "degraded",
@@ -76,6 +76,7 @@ def _build_help_text() -> str:
 | Command | Action |
 |---------|--------|
 | `/multi research <q1> \\| <q2>` | Parallel research across topics |
+| `/multi batch research <q1> \\| <q2>` | Same via Claude Message Batches (slower, half price) |
 | `/multi review <task>` | Build + Review (builder → reviewer) |
 | `/multi code-review <task>` | Claude Code build + review (full MCP) |
 | `/multi verify <claim>` | Independent verification (2 verifiers) |
@@ -269,6 +270,7 @@ async def _handle_multi_command(ws_id: str, text: str, s: Any) -> None:
 
     Usage:
         /multi research <query1> | <query2> | ...
+        /multi batch research <query1> | <query2> | ...
         /multi review <task>
         /multi code-review <task>
         /multi verify <claim>
@@ -286,6 +288,7 @@ async def _handle_multi_command(ws_id: str, text: str, s: Any) -> None:
                     "| Command | Description |\n"
                     "|---------|-------------|\n"
                     "| `/multi research <q1> \\| <q2> \\| ...` | Parallel research across topics |\n"
+                    "| `/multi batch research <q1> \\| <q2> \\| ...` | Same via Claude Message Batches (slower, half price) |\n"
                     "| `/multi review <task>` | Build + Review (builder→reviewer) |\n"
                     "| `/multi code-review <task>` | Claude Code build + review (full MCP) |\n"
                     "| `/multi verify <claim>` | Independent verification (2 verifiers) |\n"
@@ -309,6 +312,15 @@ async def _handle_multi_command(ws_id: str, text: str, s: Any) -> None:
     sub_cmd = parts[0].lower()
     payload = parts[1] if len(parts) > 1 else ""
 
+    # "/multi batch research ..." sends the researchers as one Message Batch
+    batch = False
+    if sub_cmd == "batch":
+        parts = payload.split(None, 1)
+        if parts and parts[0].lower() == "research":
+            batch = True
+            sub_cmd = "research"
+            payload = parts[1] if len(parts) > 1 else ""
+
     if not payload:
         await websocket_manager.send_to_client(
             ws_id,
@@ -350,7 +362,7 @@ async def _handle_multi_command(ws_id: str, text: str, s: Any) -> None:
             queries = [q.strip() for q in payload.split(" and ") if q.strip() and len(q.strip()) > 10]
         if len(queries) < 2:
             queries = [payload]
-        orchestration = OrchestrationStrategy.parallel_research(queries, cfg)
+        orchestration = OrchestrationStrategy.parallel_research(queries, cfg, batch=batch)
     elif sub_cmd == "review":
         orchestration = OrchestrationStrategy.build_review(payload, cfg=cfg)
     elif sub_cmd in ("code-review", "codereview"):
@@ -360,7 +372,7 @@ async def _handle_multi_command(ws_id: str, text: str, s: Any) -> None:
     else:
         await websocket_manager.send_to_client(
             ws_id,
-            {"type": "system", "content": f"Unknown sub-command: `{sub_cmd}`. Use: `research`, `review`, `code-review`, `verify`"},
+            {"type": "system", "content": f"Unknown sub-command: `{sub_cmd}`. Use: `research`, `batch research`, `review`, `code-review`, `verify`"},
         )
         return
 
@@ -523,9 +535,7 @@ async def _handle_user_message(
     # Passive memory extraction — runs in background, never blocks response
     passive_mem = getattr(s, "passive_memory", None)
     if passive_mem:
-        asyncio.create_task(
-            _extract_passive_memory(passive_mem, conv_id, text, final_response)
-        )
+        passive_mem.schedule(conv_id, text, final_response)
 
     # RAG ingest — store conversation turn for future retrieval
     rag_pipeline = getattr(s, "rag_pipeline", None)
@@ -545,17 +555,6 @@ async def _handle_user_message(
     return runner
 
 
-async def _extract_passive_memory(extractor, conv_id: str, user_msg: str, assistant_msg: str):
-    """Background task: extract learnings from the conversation exchange."""
-    try:
-        learned = await extractor.extract_and_store(conv_id, user_msg, assistant_msg)
-        total = sum(len(v) for v in learned.values())
-        if total > 0:
-            logger.debug(f"Passive memory: learned {total} items from {conv_id}")
-    except Exception as e:
-        logger.debug(f"Passive memory extraction failed: {e}")
-
-
 async def _rag_ingest(rag_pipeline, conv_id: str, user_msg: str, assistant_msg: str):
     """Background task: ingest conversation turn into RAG memory index."""
     try:
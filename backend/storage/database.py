@@ -8,7 +8,7 @@ return plain dicts with ISO-formatted datetime strings.
 import json
 import logging
 from datetime import datetime, timezone
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 from sqlalchemy import delete, func, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
@@ -110,6 +110,31 @@ class Database:
             rows = result.scalars().all()
             return [_row_to_dict(r, _MSG_COLS) for r in rows]
 
+    async def iter_messages_since(
+        self, since: datetime
+    ) -> AsyncIterator[tuple[str, str, str]]:
+        """Stream ``(conversation_id, role, content)`` for messages created after ``since``.
+
+        Newest first; rows are fetched from a server-side cursor rather than
+        loaded into a list. Uses ``idx_messages_created``.
+        """
+        async with self._session_factory() as session:
+            result = await session.stream(
+                select(Message.conversation_id, Message.role, Message.content)
+                .where(Message.created_at > since)
+                .order_by(Message.created_at.desc())
+            )
+            async for row in result:
+                yield row.conversation_id, row.role, row.content
+
+    async def ensure_message_indexes(self) -> None:
+        """Create indexes on messages added after the table was first created."""
+        async with self._session_factory() as session:
+            await session.execute(text(
+                "CREATE INDEX IF NOT EXISTS idx_messages_created ON messages (created_at)"
+            ))
+            await session.commit()
+
     async def add_message(
         self,
         conv_id: str,
@@ -389,7 +414,30 @@ class Database:
         Pre-computes started_at/completed_at in Python to avoid asyncpg type
         ambiguity from mixing timestamptz and varchar in CASE expressions.
         """
+        sql, params = self._work_item_status_update(
+            item_id, status, metadata_patch, datetime.now(timezone.utc),
+        )
+        async with self._session_factory() as session:
+            await session.execute(text(sql), params)
+            await session.commit()
+
+    async def update_work_item_statuses(
+        self, updates: list[tuple[str, str, Optional[dict]]]
+    ) -> None:
+        """Apply several ``(item_id, status, metadata_patch)`` updates in one transaction."""
+        if not updates:
+            return
         now = datetime.now(timezone.utc)
+        async with self._session_factory() as session:
+            for item_id, status, metadata_patch in updates:
+                sql, params = self._work_item_status_update(item_id, status, metadata_patch, now)
+                await session.execute(text(sql), params)
+            await session.commit()
+
+    @staticmethod
+    def _work_item_status_update(
+        item_id: str, status: str, metadata_patch: Optional[dict], now: datetime,
+    ) -> tuple[str, dict]:
         started_ts = now if status == "running" else None
         completed_ts = now if status in ("completed", "failed", "cancelled") else None
 
@@ -413,9 +461,7 @@ class Database:
                 WHERE id = :id
             """
             params = {"id": item_id, "status": status, "started_ts": started_ts, "completed_ts": completed_ts}
-        async with self._session_factory() as session:
-            await session.execute(text(sql), params)
-            await session.commit()
+        return sql, params
 
     async def list_work_items(
         self, status: str = None, kind: str = None, parent_id: str = None, limit: int = 100
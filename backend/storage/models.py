@@ -64,6 +64,7 @@ class Message(Base):
     __table_args__ = (
         CheckConstraint("role IN ('user', 'assistant', 'system')", name="ck_messages_role"),
         Index("idx_messages_conversation", "conversation_id", "created_at"),
+        Index("idx_messages_created", "created_at"),
     )
 
 
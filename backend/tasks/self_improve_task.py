@@ -42,12 +42,11 @@ async def run_self_improvement_analysis(
         # Initialize engine
         engine = SelfImprovementEngine(db, skills_engine, config)
 
-        # Generate analyses
-        skill_analysis = await engine.analyze_skill_performance(days)
-        failure_analysis = await engine.analyze_tool_failures(days)
+        # Generate analyses (one pass over the conversation history)
+        skill_analysis, failure_analysis = await engine.analyze_all(days)
 
         # Generate full report
-        report_content = await engine.generate_improvement_report(days)
+        report_content = engine.build_improvement_report(days, skill_analysis, failure_analysis)
 
         # Save report if requested
         report_path = None
@@ -92,6 +92,13 @@ class MockDatabase:
             self._conversations[conv_id]["updated_at"] = now
         return msg
 
+    async def iter_messages_since(self, since: datetime):
+        msgs = [m for msgs in self._messages.values() for m in msgs]
+        msgs.sort(key=lambda m: m["created_at"], reverse=True)
+        for m in msgs:
+            if datetime.fromisoformat(m["created_at"]) > since:
+                yield m["conversation_id"], m["role"], m["content"]
+
     async def get_message_count(self, conv_id: str) -> int:
         return len(self._messages.get(conv_id, []))
 
@@ -445,3 +445,63 @@ class TestIntegration:
             assistant_response="Switched to Claude.",
         )
         assert result is None  # Skipped (command)
+
+    @pytest.mark.asyncio
+    async def test_rag_ingest_skips_duplicate_turns(self):
+        """Test that a repeated exchange is not embedded twice."""
+        from core.rag import RAGPipeline
+
+        class FakeEmbeddings:
+            calls = 0
+
+            async def embed(self, text):
+                FakeEmbeddings.calls += 1
+                return [0.1, 0.2, 0.3]
+
+        class FakeCluster:
+            is_active = True
+            memory_index = object()
+
+            async def store_memory(self, **kwargs):
+                return "mem-1"
+
+        pipeline = RAGPipeline(FakeEmbeddings(), FakeCluster())
+        user = "How do I configure the Redis vector index for semantic search?"
+        answer = "Create an HNSW index with FT.CREATE on the embedding field. " * 3
+
+        first = await pipeline.ingest_conversation("c1", user, answer)
+        second = await pipeline.ingest_conversation("c1", user, answer)
+
+        assert first == "mem-1"
+        assert second == "mem-1"  # ID of the turn stored the first time
+        assert FakeEmbeddings.calls == 1
+        assert pipeline._duplicate_ingests == 1
+
+    @pytest.mark.asyncio
+    async def test_rag_ingest_stores_turns_differing_in_one_fact(self):
+        """Test that a near-identical exchange with a new value is still stored."""
+        from core.rag import RAGPipeline
+
+        stored = []
+
+        class FakeEmbeddings:
+            async def embed(self, text):
+                return [0.1, 0.2, 0.3]
+
+        class FakeCluster:
+            is_active = True
+            memory_index = object()
+
+            async def store_memory(self, **kwargs):
+                stored.append(kwargs["text"])
+                return f"mem-{len(stored)}"
+
+        pipeline = RAGPipeline(FakeEmbeddings(), FakeCluster())
+        user = "Which port does the staging Postgres instance listen on these days?"
+        filler = "It runs in the shared cluster behind the usual pgbouncer pool. " * 3
+
+        first = await pipeline.ingest_conversation("c1", user, f"The port is 5432. {filler}")
+        second = await pipeline.ingest_conversation("c1", user, f"The port is 6543. {filler}")
+
+        assert (first, second) == ("mem-1", "mem-2")
+        assert pipeline._duplicate_ingests == 0
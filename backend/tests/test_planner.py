@@ -0,0 +1,161 @@
+"""Tests for dependency-ordered plan execution."""
+
+import asyncio
+
+import pytest
+from core import planner
+from core.exceptions import CycleDetectedError
+from core.planner import Plan, PlanExecutor, PlanStatus, PlanStep, StepStatus, _store_plan
+
+
+def _plan(*steps: tuple[str, list[str]]) -> Plan:
+    plan = Plan(
+        id=f"plan-test-{id(steps):x}",
+        title="Test",
+        original_request="test",
+        steps=[PlanStep(id=sid, title=sid, description="", depends_on=deps) for sid, deps in steps],
+    )
+    _store_plan(plan)
+    return plan
+
+
+class TestStorePlan:
+    """Bounded in-memory plan store."""
+
+    def test_cap_evicts_oldest_plan_not_executing(self, monkeypatch):
+        monkeypatch.setattr(planner, "_plans", {})
+        monkeypatch.setattr(planner, "_plans_by_conv", {})
+        monkeypatch.setattr(planner, "MAX_PLANS", 3)
+        plans = [Plan(id=f"p{i}", title="", original_request="", conv_id="c") for i in range(5)]
+        plans[0].status = PlanStatus.EXECUTING
+
+        for plan in plans:
+            _store_plan(plan)
+
+        assert list(planner._plans) == ["p0", "p3", "p4"]
+        assert planner._plans_by_conv["c"] == ["p0", "p3", "p4"]
+
+
+class TestCompleteStep:
+    """Step completion bookkeeping."""
+
+    @pytest.mark.asyncio
+    async def test_double_completion_releases_dependents_once(self):
+        plan = _plan(("a", []), ("b", []), ("c", ["a", "b"]))
+        executor = PlanExecutor()
+
+        await executor.complete_step(plan.id, "a")
+        await executor.complete_step(plan.id, "a")
+
+        assert [s.id for s in executor.ready_steps(plan.id)] == ["b"]
+        assert plan.status != PlanStatus.COMPLETED
+
+
+class TestRunPlan:
+    """run_plan scheduling."""
+
+    @pytest.mark.asyncio
+    async def test_dependencies_run_in_order(self):
+        plan = _plan(("a", []), ("b", ["a"]), ("c", ["b"]), ("d", []))
+        finished: list[str] = []
+
+        async def execute(step):
+            await asyncio.sleep(0.01)
+            finished.append(step.id)
+            return step.id
+
+        await PlanExecutor().run_plan(plan.id, execute)
+
+        assert plan.status == PlanStatus.COMPLETED
+        assert finished.index("a") < finished.index("b") < finished.index("c")
+
+    @pytest.mark.asyncio
+    async def test_dependent_does_not_wait_for_unrelated_step(self):
+        plan = _plan(("fast", []), ("slow", []), ("after_fast", ["fast"]))
+        finished: list[str] = []
+
+        async def execute(step):
+            await asyncio.sleep(0.2 if step.id == "slow" else 0.01)
+            finished.append(step.id)
+            return ""
+
+        await PlanExecutor().run_plan(plan.id, execute)
+
+        assert finished.index("after_fast") < finished.index("slow")
+
+    @pytest.mark.asyncio
+    async def test_max_concurrent(self):
+        plan = _plan(*[(f"s{i}", []) for i in range(6)])
+        running = 0
+        peak = 0
+
+        async def execute(step):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return ""
+
+        await PlanExecutor().run_plan(plan.id, execute, max_concurrent=2)
+
+        assert peak == 2
+        assert all(s.status == StepStatus.COMPLETED for s in plan.steps)
+
+    @pytest.mark.asyncio
+    async def test_failure_stops_dispatch(self):
+        plan = _plan(("a", []), ("b", ["a"]))
+        executed: list[str] = []
+
+        async def execute(step):
+            executed.append(step.id)
+            raise RuntimeError("boom")
+
+        await PlanExecutor().run_plan(plan.id, execute)
+
+        assert executed == ["a"]
+        assert plan.status == PlanStatus.FAILED
+        assert plan._step_index["a"].error == "boom"
+        assert plan._step_index["b"].status == StepStatus.PENDING
+
+    @pytest.mark.asyncio
+    async def test_cycle_detected(self):
+        plan = _plan(("a", []), ("b", ["c"]), ("c", ["b"]))
+
+        async def execute(step):
+            return ""
+
+        with pytest.raises(CycleDetectedError):
+            await PlanExecutor().run_plan(plan.id, execute)
+        assert plan._step_index["a"].status == StepStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_running_steps(self):
+        plan = _plan(("a", []), ("b", ["a"]))
+        finished: list[str] = []
+
+        async def execute(step):
+            await asyncio.sleep(0.3)
+            finished.append(step.id)
+            return ""
+
+        task = asyncio.create_task(PlanExecutor().run_plan(plan.id, execute))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.35)
+
+        assert finished == []
+        assert plan.status != PlanStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_step_bookkeeping_error_propagates(self):
+        plan = _plan(("a", []))
+
+        async def execute(step):
+            planner._plans.pop(plan.id)
+            return ""
+
+        with pytest.raises(ValueError, match="not found"):
+            await PlanExecutor().run_plan(plan.id, execute)
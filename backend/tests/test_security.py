@@ -0,0 +1,44 @@
+"""Tests for path sandboxing."""
+
+import os
+
+import pytest
+from core.exceptions import PathAccessDeniedError
+from core.security import validate_path
+
+
+class TestValidatePath:
+    """Unit tests for validate_path."""
+
+    def test_inside_allowed_dir(self, tmp_path):
+        data = tmp_path / "data"
+        data.mkdir()
+        (data / "f.txt").write_text("ok")
+        assert validate_path(str(data / "f.txt"), [str(data)]) == os.path.realpath(data / "f.txt")
+
+    def test_outside_allowed_dir(self, tmp_path):
+        data = tmp_path / "data"
+        data.mkdir()
+        with pytest.raises(PathAccessDeniedError):
+            validate_path(str(tmp_path / "secret.txt"), [str(data)])
+
+    def test_dotdot_escape(self, tmp_path):
+        data = tmp_path / "data"
+        data.mkdir()
+        with pytest.raises(PathAccessDeniedError):
+            validate_path(str(data / ".." / "secret.txt"), [str(data)])
+
+    def test_symlink_swapped_after_validation(self, tmp_path):
+        data = tmp_path / "data"
+        data.mkdir()
+        secret = tmp_path / "secret.txt"
+        secret.write_text("secret")
+        target = data / "f.txt"
+        target.write_text("ok")
+        validate_path(str(target), [str(data)])
+
+        # Replace the validated file with a link out of the sandbox
+        target.unlink()
+        target.symlink_to(secret)
+        with pytest.raises(PathAccessDeniedError):
+            validate_path(str(target), [str(data)])
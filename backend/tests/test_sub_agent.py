@@ -0,0 +1,266 @@
+"""Tests for in-process sub-agent orchestration."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from core.errors import AgentAbortError
+from core.sub_agent import (
+    Orchestration,
+    OrchestrationStrategy,
+    SubAgentOrchestrator,
+    SubAgentResult,
+    SubAgentRole,
+    SubAgentSpec,
+    SubAgentStatus,
+    _compute_schedule,
+)
+from core.sub_agent_cache import SubAgentCache
+
+
+class _Cfg:
+    """Config stub with every boolean feature switched on."""
+
+    def get(self, key, default=None):
+        return default
+
+    def get_bool(self, key, default=False):
+        return True
+
+    def get_int(self, key, default=0):
+        return default
+
+
+def _state(claude=None):
+    async def chat(messages, system=None, force_model=None):
+        return {"content": "synthesised"}
+
+    return SimpleNamespace(
+        model_router=SimpleNamespace(
+            select_model=lambda prompt: "ollama",
+            chat=chat,
+            claude=claude,
+            _claude_available=claude is not None,
+        ),
+        sub_agent_cache=None,
+        tool_executor=None,
+        plugin_manager=None,
+    )
+
+
+def _orchestrator(state=None, abort=None):
+    return SubAgentOrchestrator(state or _state(), None, "conv-test", abort or asyncio.Event(), [])
+
+
+def _dag(*specs: tuple[str, list[str]]) -> Orchestration:
+    spec_list = [
+        SubAgentSpec(id=sid, role=SubAgentRole.RESEARCHER, prompt=sid, depends_on=deps)
+        for sid, deps in specs
+    ]
+    return Orchestration(
+        id="orch-test", strategy="custom", specs=spec_list, schedule=_compute_schedule(spec_list),
+    )
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    """Replace the model call; records (spec id, prompt) and finish order."""
+    log = SimpleNamespace(calls=[], finished=[], delays={}, cancelled=[], streams={})
+
+    async def fake_attempt(self, spec, prompt, system_addendum, orchestration):
+        log.calls.append((spec.id, prompt))
+        try:
+            chunks = log.streams.get(spec.role)
+            if chunks is not None:
+                output = ""
+                for chunk in chunks:
+                    await asyncio.sleep(0.01)
+                    output += chunk
+                    self._on_stream_chunk(spec, chunk, orchestration)
+            else:
+                await asyncio.sleep(log.delays.get(spec.id, 0.01))
+                output = f"out-{spec.id}"
+        except asyncio.CancelledError:
+            log.cancelled.append(spec.id)
+            raise
+        log.finished.append(spec.id)
+        return SubAgentResult(
+            id=spec.id, role=spec.role, model_used="fake", output=output,
+            status=SubAgentStatus.COMPLETED,
+        )
+
+    monkeypatch.setattr(SubAgentOrchestrator, "_run_attempt_sub_agent", fake_attempt)
+    return log
+
+
+class TestExecuteDag:
+    """Dependency-driven local execution."""
+
+    @pytest.mark.asyncio
+    async def test_dependent_does_not_wait_for_unrelated_slow_root(self, runs):
+        runs.delays["slow"] = 0.3
+        orchestration = _dag(("slow", []), ("fast", []), ("after_fast", ["fast"]))
+
+        await _orchestrator()._execute_dag(orchestration)
+
+        assert runs.finished.index("after_fast") < runs.finished.index("slow")
+        assert all(r.status == SubAgentStatus.COMPLETED for r in orchestration.results.values())
+
+    @pytest.mark.asyncio
+    async def test_cycle_is_forced(self, runs):
+        orchestration = _dag(("x", ["y"]), ("y", ["x"]), ("z", ["x"]))
+
+        await asyncio.wait_for(_orchestrator()._execute_dag(orchestration), timeout=2)
+
+        assert set(orchestration.results) == {"x", "y", "z"}
+        assert runs.finished.index("x") < runs.finished.index("z")
+
+    @pytest.mark.asyncio
+    async def test_sub_agent_error_fails_only_that_spec(self, runs, monkeypatch):
+        async def broken(self, spec, orchestration, prompt=None):
+            raise RuntimeError("model down")
+
+        monkeypatch.setattr(SubAgentOrchestrator, "_run_sub_agent", broken)
+        orchestration = _dag(("a", []), ("b", ["a"]))
+
+        await _orchestrator()._execute_dag(orchestration)
+
+        assert orchestration.results["a"].status == SubAgentStatus.FAILED
+        assert orchestration.results["a"].error == "model down"
+        assert "b" in orchestration.results
+
+    @pytest.mark.asyncio
+    async def test_worker_exception_propagates_and_stops_workers(self, runs, monkeypatch):
+        runs.delays["slow"] = 5
+        original = SubAgentOrchestrator._record_result
+
+        async def record(self, spec, result, orchestration):
+            if spec.id == "bad":
+                raise RuntimeError("record failed")
+            await original(self, spec, result, orchestration)
+
+        monkeypatch.setattr(SubAgentOrchestrator, "_record_result", record)
+        orchestrator = _orchestrator()
+
+        with pytest.raises(RuntimeError, match="record failed"):
+            await asyncio.wait_for(
+                orchestrator._execute_dag(_dag(("slow", []), ("bad", []))), timeout=2,
+            )
+
+        await asyncio.sleep(0)
+        assert runs.cancelled == ["slow"]
+        assert not orchestrator._running_tasks
+
+    @pytest.mark.asyncio
+    async def test_abort_cancels_tracked_tasks(self, runs):
+        runs.delays.update(a=5, b=5)
+        abort = asyncio.Event()
+        orchestrator = _orchestrator(abort=abort)
+        asyncio.get_running_loop().call_later(0.05, abort.set)
+
+        with pytest.raises(AgentAbortError):
+            await asyncio.wait_for(
+                orchestrator.execute(_dag(("a", []), ("b", []), ("c", ["a"]))), timeout=2,
+            )
+
+        assert sorted(runs.cancelled) == ["a", "b"]
+        assert not orchestrator._running_tasks
+        assert [spec_id for spec_id, _ in runs.calls] == ["a", "b"]
+
+
+class TestSpeculativeReview:
+    """Reviewer started on the builder's partial stream."""
+
+    @pytest.mark.asyncio
+    async def test_speculative_run_accepted_when_output_barely_changes(self, runs):
+        runs.streams[SubAgentRole.BUILDER] = ["x" * 250] * 8 + ["y" * 100]
+        orchestration = OrchestrationStrategy.build_review("task", cfg=_Cfg())
+        reviewer = orchestration.specs[1]
+
+        await _orchestrator()._execute_dag(orchestration)
+
+        reviewer_calls = [p for sid, p in runs.calls if sid == reviewer.id]
+        assert len(reviewer_calls) == 1
+        assert "y" not in reviewer_calls[0]
+        assert orchestration.results[reviewer.id].status == SubAgentStatus.COMPLETED
+
+    @pytest.mark.asyncio
+    async def test_speculative_run_discarded_when_output_grows(self, runs):
+        runs.streams[SubAgentRole.BUILDER] = ["x" * 250] * 8 + ["y" * 2000]
+        orchestration = OrchestrationStrategy.build_review("task", cfg=_Cfg())
+        reviewer = orchestration.specs[1]
+        orchestrator = _orchestrator()
+
+        await orchestrator._execute_dag(orchestration)
+
+        reviewer_calls = [p for sid, p in runs.calls if sid == reviewer.id]
+        assert len(reviewer_calls) == 2
+        assert "y" * 2000 in reviewer_calls[1]
+        assert not orchestrator._speculative
+
+
+class TestBatchResearch:
+    """Researchers submitted as one Message Batch."""
+
+    @pytest.mark.asyncio
+    async def test_batch_results_are_used(self, runs):
+        async def batch_chat(requests):
+            return {r["custom_id"]: {"content": f"batched-{r['custom_id']}"} for r in requests}
+
+        state = _state(claude=SimpleNamespace(batch_chat=batch_chat))
+        orchestration = OrchestrationStrategy.parallel_research(["qa", "qb"], batch=True)
+        researchers = orchestration.specs[:2]
+
+        await _orchestrator(state)._execute_dag(orchestration)
+
+        for spec in researchers:
+            assert orchestration.results[spec.id].model_used == "claude+batch"
+            assert orchestration.results[spec.id].output == f"batched-{spec.id}"
+        assert [sid for sid, _ in runs.calls] == [orchestration.specs[2].id]
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_falls_back_to_live_runs(self, runs):
+        async def batch_chat(requests):
+            raise RuntimeError("batches unavailable")
+
+        state = _state(claude=SimpleNamespace(batch_chat=batch_chat))
+        orchestration = OrchestrationStrategy.parallel_research(["qa", "qb"], batch=True)
+        researchers = {s.id for s in orchestration.specs[:2]}
+
+        await _orchestrator(state)._execute_dag(orchestration)
+
+        assert researchers <= {sid for sid, _ in runs.calls}
+        assert all(r.status == SubAgentStatus.COMPLETED for r in orchestration.results.values())
+        assert all(orchestration.results[sid].model_used == "fake" for sid in researchers)
+
+
+class TestSynthesize:
+    """Merging sub-agent outputs."""
+
+    @pytest.mark.asyncio
+    async def test_near_identical_merge_is_not_served_from_cache(self):
+        async def embed(text):
+            return [1.0, 0.0]  # Every prompt looks identical to the semantic tier
+
+        prompts: list[str] = []
+
+        async def chat(messages, system=None, force_model=None):
+            prompts.append(messages[0]["content"])
+            return {"content": f"merged-{len(prompts)}"}
+
+        state = _state()
+        state.model_router.chat = chat
+        state.sub_agent_cache = SubAgentCache(embed=embed)
+
+        outputs = []
+        for height in ("330m", "300m"):
+            orchestration = _dag(("a", []), ("b", []))
+            for spec in orchestration.specs:
+                orchestration.results[spec.id] = SubAgentResult(
+                    id=spec.id, role=spec.role, model_used="fake",
+                    output=f"{spec.id}: the tower is {height}", status=SubAgentStatus.COMPLETED,
+                )
+            outputs.append(await _orchestrator(state)._synthesize(orchestration))
+
+        assert outputs == ["merged-1", "merged-2"]
+        assert len(prompts) == 2
@@ -0,0 +1,52 @@
+"""Tests for the sub-agent response cache."""
+
+import sqlite3
+
+import pytest
+from core.sub_agent_cache import SqliteBackend, SubAgentCache
+
+
+class TestSqliteBackend:
+    """Disk tier pruning."""
+
+    def test_prune_drops_expired_and_caps_rows(self, tmp_path):
+        backend = SqliteBackend(str(tmp_path / "c.db"), max_rows=3)
+        for i in range(6):
+            backend.put(f"k{i}", "out")
+        with sqlite3.connect(str(tmp_path / "c.db")) as conn:
+            conn.execute("UPDATE sub_agent_cache SET created_at = 0 WHERE key = 'k5'")
+
+        backend.prune(ttl=3600)
+        assert sorted(backend.keys(ttl=3600)) == ["k2", "k3", "k4"]
+
+
+class TestSubAgentCache:
+    """Exact, disk and semantic tiers."""
+
+    @pytest.mark.asyncio
+    async def test_disk_hit_after_restart(self, tmp_path):
+        path = str(tmp_path / "c.db")
+        first = SubAgentCache(backend=SqliteBackend(path))
+        await first.start()
+        await first.update("key", "cached output")
+
+        second = SubAgentCache(backend=SqliteBackend(path))
+        await second.start()
+        assert await second.lookup("key") == "cached output"
+        assert await second.lookup("other") is None
+
+    @pytest.mark.asyncio
+    async def test_semantic_tier_off_without_embedder(self):
+        cache = SubAgentCache()
+        await cache.update("k1", "out", scope="s", prompt="Verify: X is 330m")
+        assert await cache.lookup("k2", scope="s", prompt="Verify: X is 300m") is None
+
+    @pytest.mark.asyncio
+    async def test_semantic_tier_skipped_for_empty_prompt(self):
+        async def embed(text):
+            return [1.0, 0.0]
+
+        cache = SubAgentCache(embed=embed)
+        await cache.update("k1", "out", scope="s", prompt="a")
+        assert await cache.lookup("k2", scope="s", prompt="") is None
+        assert await cache.lookup("k3", scope="s", prompt="b") == "out"
@@ -10,8 +10,29 @@ from typing import Optional
 
 from fastapi import WebSocket
 
+try:
+    import orjson
+
+    _ORJSON_OPTS = orjson.OPT_NON_STR_KEYS
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger("nexus.websocket")
 
+# Messages with more content than this are encoded in a worker thread so
+# large payloads (long final answers, big tool results) don't stall the loop
+_OFFLOAD_CONTENT_CHARS = 32 * 1024
+
+
+def _dumps(message: dict) -> str:
+    """Encode *message* as JSON text, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(message, option=_ORJSON_OPTS).decode()
+        except TypeError:
+            pass  # Something orjson can't encode — let json raise or handle it
+    return json.dumps(message)
+
 
 class WebSocketManager:
     """Manages WebSocket connections with reconnection and message queuing."""
@@ -146,7 +167,12 @@ class WebSocketManager:
 
         try:
             websocket = self.connections[ws_id]
-            await websocket.send_text(json.dumps(message))
+            content = message.get("content")
+            if isinstance(content, str) and len(content) > _OFFLOAD_CONTENT_CHARS:
+                text = await asyncio.to_thread(_dumps, message)
+            else:
+                text = _dumps(message)
+            await websocket.send_text(text)
         except Exception as e:
             logger.error(f"Failed to send message to {ws_id}: {e}")
             # Connection is probably dead, clean it up
@@ -187,5 +213,67 @@ class WebSocketManager:
             logger.error(f"Heartbeat error for {ws_id}: {e}")
 
 
+class WebsocketBatcher:
+    """Coalesce bursts of small messages to one client into batched sends.
+
+    Messages passed to ``enqueue`` are buffered and delivered together as
+    ``{"type": batch_type, "items": [...]}`` once ``max_wait_ms`` has passed
+    since the first buffered message or ``max_bytes`` of content has piled
+    up, whichever comes first.  A lone message is sent as-is.  Call
+    ``flush`` before any message that must not overtake buffered ones.
+    """
+
+    def __init__(
+        self,
+        ws_id: str,
+        batch_type: str,
+        max_wait_ms: int = 20,
+        max_bytes: int = 8192,
+        manager: Optional["WebSocketManager"] = None,
+    ):
+        self.ws_id = ws_id
+        self.batch_type = batch_type
+        self._max_wait = max_wait_ms / 1000
+        self._max_bytes = max_bytes
+        self._manager = manager
+        self._pending: list[dict] = []
+        self._pending_bytes = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._send_lock = asyncio.Lock()
+
+    def enqueue(self, message: dict):
+        """Buffer *message* for the next batched send."""
+        self._pending.append(message)
+        self._pending_bytes += len(message.get("content") or "")
+        loop = asyncio.get_running_loop()
+        if self._pending_bytes >= self._max_bytes:
+            self._cancel_timer()
+            loop.create_task(self.flush())
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_wait, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        asyncio.get_running_loop().create_task(self.flush())
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def flush(self):
+        """Send everything buffered so far."""
+        self._cancel_timer()
+        async with self._send_lock:
+            if not self._pending:
+                return
+            batch, self._pending, self._pending_bytes = self._pending, [], 0
+            manager = self._manager or websocket_manager
+            if len(batch) == 1:
+                await manager.send_to_client(self.ws_id, batch[0])
+            else:
+                await manager.send_to_client(self.ws_id, {"type": self.batch_type, "items": batch})
+
+
 # Global instance
 websocket_manager = WebSocketManager()
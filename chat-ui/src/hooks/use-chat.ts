@@ -173,23 +173,30 @@ export function useChat() {
         break
 
       case 'sub_agent_progress':
+      case 'sub_agent_progress_batch': {
+        const updates = msg.type === 'sub_agent_progress' ? [msg] : (msg.items ?? [])
         setOrchestration(prev => {
           if (!prev) return prev
           return {
             ...prev,
             agents: prev.agents.map(a =>
-              a.id === msg.sub_agent_id
-                ? {
-                    ...a,
-                    status: 'running' as const,
-                    role: msg.sub_agent_role ?? a.role,
-                    content: msg.content ?? a.content,
-                  }
-                : a
+              updates.reduce(
+                (agent, u) =>
+                  u.sub_agent_id === agent.id
+                    ? {
+                        ...agent,
+                        status: 'running' as const,
+                        role: u.sub_agent_role ?? agent.role,
+                        content: u.content ?? agent.content,
+                      }
+                    : agent,
+                a
+              )
             ),
           }
         })
         break
+      }
 
       case 'sub_agent_complete':
         setOrchestration(prev => {
@@ -51,6 +51,7 @@ export type WSMessageType =
   | 'ping'
   | 'sub_agent_start'
   | 'sub_agent_progress'
+  | 'sub_agent_progress_batch'
   | 'sub_agent_complete'
   | 'work_item_update'
 
@@ -69,6 +70,7 @@ export interface WSMessage {
   sub_agent_role?: string
   sub_agent_model?: string
   sub_agent_status?: string
+  items?: WSMessage[]
   duration_ms?: number
   // Work item fields
   event?: 'registered' | 'updated'